@@ -1,6 +1,7 @@
 import ToonamiTools
 from .utils.FlagManager import FlagManager
 from .utils.DatabaseManager import get_db_manager
+from .utils.DatabaseSchema import migrate_schema
 import config
 import threading
 import time
@@ -389,6 +390,8 @@ class LogicController():
             "app_data",
             "key TEXT PRIMARY KEY, value TEXT"
         )
+        # Add declared types and indexes to lineup/bump tables from older databases
+        migrate_schema(self.db_manager)
 
     def _set_data(self, key, value):
         self.db_manager.insert_or_replace("app_data", {"key": key, "value": value})
@@ -396,12 +399,13 @@ class LogicController():
     def _get_data(self, key):
         result = self.db_manager.fetchone(
             "SELECT value FROM app_data WHERE key = ?", 
-            (key,)
+            (key,),
+            read_only=True
         )
         return result["value"] if result else None
 
     def _check_table_exists(self, table_name):
-        return self.db_manager.table_exists(table_name)
+        return self.db_manager.table_exists(table_name, read_only=True)
 
     def _publish_status_update(self, channel, message):
         """
@@ -1,8 +1,9 @@
+import queue
 import sqlite3
 import threading
 import time
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import logging
 import config
 
@@ -15,7 +16,9 @@ class DatabaseManager:
     
     This class provides:
     - Thread-local connections (one connection per thread)
-    - Automatic retry logic for database locks
+    - WAL journaling and tuned pragmas (synchronous, mmap, cache, busy_timeout)
+    - A pool of read-only connections for query-heavy UI paths
+    - Automatic retry logic for database locks, with lock-wait metrics
     - Transaction support with context managers
     - Common query methods for simplified database operations
     """
@@ -39,9 +42,74 @@ class DatabaseManager:
             
         self.db_path = config.DATABASE_PATH
         self._local = threading.local()
-        self._retry_attempts = 3
-        self._retry_delay = 0.1  # seconds
+        # SQLite waits up to busy_timeout for a lock itself, so a retry is only a last resort
+        self._busy_timeout_ms = int(getattr(config, 'DB_BUSY_TIMEOUT_MS', 5000))
+        self._retry_attempts = 1 + max(0, int(getattr(config, 'DB_LOCK_RETRIES', 1)))
+        self._journal_mode = getattr(config, 'DB_JOURNAL_MODE', 'WAL')
+        self._synchronous = getattr(config, 'DB_SYNCHRONOUS', 'NORMAL')
+        self._mmap_size = int(getattr(config, 'DB_MMAP_SIZE', 256 * 1024 * 1024))
+        self._cache_size_kb = int(getattr(config, 'DB_CACHE_SIZE_KB', 64 * 1024))
+        self._statement_cache = int(getattr(config, 'DB_STATEMENT_CACHE', 256))
+        self._slow_ms = float(getattr(config, 'DB_SLOW_QUERY_MS', 250))
+        self._read_pool_size = max(0, int(getattr(config, 'DB_READ_POOL_SIZE', 4)))
+        self._read_pool = queue.LifoQueue()
+        self._read_pool_lock = threading.Lock()
+        self._read_pool_created = 0
+        self._metrics_lock = threading.Lock()
+        self._metrics = self._empty_metrics()
         self._initialized = True
+
+    @staticmethod
+    def _empty_metrics() -> Dict[str, float]:
+        return {
+            "operations": 0,
+            "slow_operations": 0,      # took longer than DB_SLOW_QUERY_MS, usually waiting on a lock
+            "lock_errors": 0,          # "database is locked" after busy_timeout ran out
+            "retries": 0,
+            "lock_wait_seconds": 0.0,  # time spent in operations that hit a lock error
+            "read_pool_waits": 0,      # callers that had to wait for a free read-only connection
+            "read_pool_wait_seconds": 0.0,
+        }
+
+    def _record(self, **increments):
+        with self._metrics_lock:
+            for key, value in increments.items():
+                self._metrics[key] += value
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Return a snapshot of the lock-wait and retry counters."""
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def reset_metrics(self):
+        with self._metrics_lock:
+            self._metrics = self._empty_metrics()
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the configured pragmas applied."""
+        if read_only:
+            connection = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, timeout=self._busy_timeout_ms / 1000,
+                cached_statements=self._statement_cache, check_same_thread=False
+            )
+        else:
+            connection = sqlite3.connect(
+                self.db_path, timeout=self._busy_timeout_ms / 1000, cached_statements=self._statement_cache
+            )
+        connection.row_factory = sqlite3.Row  # Enable column access by name
+        connection.execute(f"PRAGMA busy_timeout = {self._busy_timeout_ms}")
+        connection.execute(f"PRAGMA cache_size = {-self._cache_size_kb}")
+        connection.execute(f"PRAGMA mmap_size = {self._mmap_size}")
+        if read_only:
+            connection.execute("PRAGMA query_only = ON")
+        else:
+            if self._journal_mode:
+                # Persistent in the database file; readers no longer block the writer and vice versa
+                connection.execute(f"PRAGMA journal_mode = {self._journal_mode}")
+            connection.execute(f"PRAGMA synchronous = {self._synchronous}")
+            # Enable foreign keys
+            connection.execute("PRAGMA foreign_keys = ON")
+        return connection
     
     def _get_connection(self) -> sqlite3.Connection:
         """
@@ -51,11 +119,50 @@ class DatabaseManager:
             sqlite3.Connection: Thread-local database connection
         """
         if not hasattr(self._local, 'connection') or self._local.connection is None:
-            self._local.connection = sqlite3.connect(self.db_path)
-            self._local.connection.row_factory = sqlite3.Row  # Enable column access by name
-            # Enable foreign keys
-            self._local.connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = self._connect()
         return self._local.connection
+
+    @contextmanager
+    def read_connection(self):
+        """
+        Borrow a read-only connection from the pool.
+
+        Use for query-heavy paths (UI polling, reports) so they never queue behind the
+        writer's thread-local connection. Falls back to the thread's own connection when
+        the pool is disabled or the database file doesn't exist yet.
+
+        Usage:
+            with db_manager.read_connection() as conn:
+                df = pd.read_sql("SELECT ...", conn)
+        """
+        if not self._read_pool_size:
+            yield self._get_connection()
+            return
+
+        connection = None
+        try:
+            connection = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._read_pool_lock:
+                can_create = self._read_pool_created < self._read_pool_size
+                if can_create:
+                    self._read_pool_created += 1
+            if can_create:
+                try:
+                    connection = self._connect(read_only=True)
+                except sqlite3.OperationalError:
+                    with self._read_pool_lock:
+                        self._read_pool_created -= 1
+                    yield self._get_connection()
+                    return
+            else:
+                start = time.perf_counter()
+                connection = self._read_pool.get()
+                self._record(read_pool_waits=1, read_pool_wait_seconds=time.perf_counter() - start)
+        try:
+            yield connection
+        finally:
+            self._read_pool.put(connection)
     
     def _execute_with_retry(self, func, *args, **kwargs):
         """
@@ -74,13 +181,21 @@ class DatabaseManager:
         """
         last_error = sqlite3.Error("Database operation failed after retries")
         for attempt in range(self._retry_attempts):
+            start = time.perf_counter()
             try:
-                return func(*args, **kwargs)
+                result = func(*args, **kwargs)
+                elapsed = time.perf_counter() - start
+                self._record(operations=1, slow_operations=int(elapsed * 1000 >= self._slow_ms))
+                return result
             except sqlite3.OperationalError as e:
                 last_error = e
-                if "database is locked" in str(e) and attempt < self._retry_attempts - 1:
-                    time.sleep(self._retry_delay * (attempt + 1))  # Exponential backoff
-                    continue
+                if "database is locked" in str(e) or "database is busy" in str(e):
+                    # busy_timeout already waited for the lock, so retry straight away
+                    self._record(lock_errors=1, lock_wait_seconds=time.perf_counter() - start)
+                    if attempt < self._retry_attempts - 1:
+                        self._record(retries=1)
+                        logger.warning("Database locked after %d ms, retrying", self._busy_timeout_ms)
+                        continue
                 raise
             except Exception as e:
                 last_error = e
@@ -149,18 +264,26 @@ class DatabaseManager:
         
         return self._execute_with_retry(_executemany)
     
-    def fetchone(self, query: str, params: Optional[Tuple] = None) -> Optional[sqlite3.Row]:
+    def fetchone(self, query: str, params: Optional[Tuple] = None, read_only: bool = False) -> Optional[sqlite3.Row]:
         """
         Execute a query and fetch one result.
         
         Args:
             query: SQL query to execute
             params: Optional parameters for the query
+            read_only: Run on a pooled read-only connection
             
         Returns:
             sqlite3.Row or None: Single result row
         """
         def _fetchone():
+            if read_only:
+                with self.read_connection() as conn:
+                    cursor = conn.execute(query, params or ())
+                    row = cursor.fetchone()
+                    # Finish the statement so the pooled connection doesn't keep an old snapshot
+                    cursor.close()
+                    return row
             conn = self._get_connection()
             cursor = conn.cursor()
             if params:
@@ -171,18 +294,22 @@ class DatabaseManager:
         
         return self._execute_with_retry(_fetchone)
     
-    def fetchall(self, query: str, params: Optional[Tuple] = None) -> List[sqlite3.Row]:
+    def fetchall(self, query: str, params: Optional[Tuple] = None, read_only: bool = False) -> List[sqlite3.Row]:
         """
         Execute a query and fetch all results.
         
         Args:
             query: SQL query to execute
             params: Optional parameters for the query
+            read_only: Run on a pooled read-only connection
             
         Returns:
             List[sqlite3.Row]: All result rows
         """
         def _fetchall():
+            if read_only:
+                with self.read_connection() as conn:
+                    return conn.execute(query, params or ()).fetchall()
             conn = self._get_connection()
             cursor = conn.cursor()
             if params:
@@ -193,18 +320,19 @@ class DatabaseManager:
         
         return self._execute_with_retry(_fetchall)
     
-    def table_exists(self, table_name: str) -> bool:
+    def table_exists(self, table_name: str, read_only: bool = False) -> bool:
         """
         Check if a table exists in the database.
         
         Args:
             table_name: Name of the table to check
+            read_only: Run on a pooled read-only connection
             
         Returns:
             bool: True if table exists, False otherwise
         """
         query = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
-        result = self.fetchone(query, (table_name,))
+        result = self.fetchone(query, (table_name,), read_only=read_only)
         return result is not None
     
     def create_table(self, table_name: str, schema: str):
@@ -252,6 +380,96 @@ class DatabaseManager:
         cursor = self.execute(query, tuple(data.values()))
         return cursor.lastrowid
     
+    def upsert_many(self, table_name: str, columns: List[str], rows: Iterable[Tuple],
+                    key_columns: List[str], column_types: Optional[Dict[str, str]] = None) -> int:
+        """
+        Insert rows, updating the existing row whenever the key columns already match.
+
+        Everything runs in one transaction with a single executemany of
+        INSERT ... ON CONFLICT DO UPDATE, so the cost depends on the new rows only.
+        The table is created if needed, missing columns are added, and a unique index
+        on key_columns is created the first time. Building that index drops older
+        duplicate rows and keeps the most recent one, as the old read/concat/replace
+        writers did; the number of rows removed is logged as a warning.
+
+        Args:
+            table_name: Name of the table
+            columns: Column names, in the order of the values in each row
+            rows: Iterable of value tuples
+            key_columns: Columns that identify a row
+            column_types: Optional SQL type per column, used when creating the table or adding columns
+
+        Returns:
+            int: Number of rows written
+        """
+        column_types = column_types or {}
+        rows = list(rows)
+        quote = lambda name: '"' + name.replace('"', '""') + '"'
+        index_name = f"uq_{table_name}_" + "_".join(
+            "".join(ch if ch.isalnum() else "_" for ch in key) for key in key_columns
+        )
+        keys_sql = ", ".join(quote(key) for key in key_columns)
+        updates = [column for column in columns if column not in key_columns]
+        conflict_action = (
+            "DO UPDATE SET " + ", ".join(f"{quote(column)} = excluded.{quote(column)}" for column in updates)
+            if updates else "DO NOTHING"
+        )
+        query = (
+            f"INSERT INTO {quote(table_name)} ({', '.join(quote(column) for column in columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({keys_sql}) {conflict_action}"
+        )
+
+        def _upsert_many():
+            with self.transaction() as conn:
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({quote(table_name)})")}
+                if not existing:
+                    column_defs = ", ".join(f"{quote(column)} {column_types.get(column, '')}".rstrip() for column in columns)
+                    conn.execute(f"CREATE TABLE {quote(table_name)} ({column_defs})")
+                else:
+                    for column in columns:
+                        if column not in existing:
+                            conn.execute(
+                                f"ALTER TABLE {quote(table_name)} ADD COLUMN {quote(column)} {column_types.get(column, '')}".rstrip()
+                            )
+                has_index = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (index_name,)
+                ).fetchone()
+                if not has_index:
+                    # The unique index can't be built over duplicate keys, so keep only the newest copy of each
+                    removed = conn.execute(
+                        f"DELETE FROM {quote(table_name)} WHERE rowid NOT IN "
+                        f"(SELECT MAX(rowid) FROM {quote(table_name)} GROUP BY {keys_sql})"
+                    ).rowcount
+                    if removed > 0:
+                        logger.warning(
+                            "Removed %d duplicate row(s) from %s before adding a unique index on (%s); "
+                            "the most recent row for each key was kept",
+                            removed, table_name, ", ".join(key_columns)
+                        )
+                    conn.execute(f"CREATE UNIQUE INDEX {quote(index_name)} ON {quote(table_name)} ({keys_sql})")
+                conn.executemany(query, rows)
+            return len(rows)
+
+        return self._execute_with_retry(_upsert_many)
+
+    def upsert_dataframe(self, table_name: str, df, key_columns: List[str]) -> int:
+        """
+        upsert_many for a pandas DataFrame.
+
+        NaN values are written as NULL and column types follow the DataFrame dtypes,
+        the same way DataFrame.to_sql would create them.
+
+        Returns:
+            int: Number of rows written
+        """
+        sql_types = {'i': 'INTEGER', 'u': 'INTEGER', 'b': 'INTEGER', 'f': 'REAL'}
+        column_types = {column: sql_types.get(dtype.kind, 'TEXT') for column, dtype in df.dtypes.items()}
+        values = df.astype(object).where(df.notna(), None)
+        return self.upsert_many(
+            table_name, list(df.columns), values.itertuples(index=False, name=None), key_columns, column_types
+        )
+
     def update(self, table_name: str, data: Dict[str, Any], where: str, where_params: Tuple) -> int:
         """
         Update rows in a table.
@@ -295,9 +513,16 @@ class DatabaseManager:
     
     def close_all_connections(self):
         """Close all connections (call only when shutting down)."""
-        # Note: This only closes the current thread's connection
+        # Note: This only closes the current thread's connection and the read-only pool
         # In a multi-threaded environment, each thread should call close_thread_connection
         self.close_thread_connection()
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._read_pool_lock:
+                self._read_pool_created -= 1
 
 
 # Global instance getter
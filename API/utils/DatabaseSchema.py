@@ -0,0 +1,184 @@
+"""
+Declared column types and indexes for the lineup and bump tables.
+
+These tables are still produced from DataFrames, so their column lists vary between
+runs. Each table pattern therefore declares types for the columns it knows about and
+the indexes to build; columns it doesn't know about keep the type pandas would give
+them. write_table() replaces DataFrame.to_sql(if_exists='replace') for these tables,
+and migrate_schema() brings tables in an existing Toonami.db up to date.
+"""
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+from .DatabaseManager import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Bump PRAGMA user_version-based migration when the declarations below change
+SCHEMA_VERSION = 1
+
+# Column types shared by every declared table
+COMMON_COLUMN_TYPES = {
+    "BLOCK_ID": "TEXT",
+    "FULL_FILE_PATH": "TEXT",
+    "SHOW_NAME_1": "TEXT",
+    "SHOW_NAME_2": "TEXT",
+    "SHOW_NAME_3": "TEXT",
+    "Season and Episode": "TEXT",
+    "Code": "TEXT",
+    "Name": "TEXT",
+}
+
+
+class TableSchema:
+    """Types and indexes for every table whose name matches pattern."""
+
+    def __init__(self, pattern: str, indexes: List[Tuple[str, ...]], column_types: Optional[Dict[str, str]] = None):
+        self.pattern = re.compile(pattern)
+        # Each index is a tuple of columns; "COLUMN COLLATE NOCASE" entries back LIKE 'prefix%' filters
+        self.indexes = indexes
+        self.column_types = {**COMMON_COLUMN_TYPES, **(column_types or {})}
+
+    def matches(self, table_name: str) -> bool:
+        return bool(self.pattern.match(table_name))
+
+
+TABLE_SCHEMAS = [
+    TableSchema(r"^commercial_injector$", [
+        ("SHOW_NAME_1", "Season and Episode"),
+        ("FULL_FILE_PATH",),
+    ]),
+    # ShowScheduler.set_paths filters this table with BLOCK_ID LIKE 'prefix_S%'
+    TableSchema(r"^commercial_injector_final$", [
+        ("BLOCK_ID",),
+        ("BLOCK_ID COLLATE NOCASE",),
+        ("FULL_FILE_PATH",),
+    ]),
+    TableSchema(r"^lineup_v\d+(_\w+)?$", [
+        ("BLOCK_ID",),
+        ("FULL_FILE_PATH",),
+    ]),
+    TableSchema(r"^singles_data$", [
+        ("Code",),
+        ("SHOW_NAME_1",),
+    ]),
+    TableSchema(r"^multibumps_v\d+_data(_reordered)?$", [
+        ("Code",),
+        ("SHOW_NAME_1",),
+    ]),
+    TableSchema(r"^codes$", [
+        ("Code",),
+        ("Name",),
+    ]),
+]
+
+
+def schema_for(table_name: str) -> Optional[TableSchema]:
+    """Return the declared schema for a table, or None if it has none."""
+    return next((schema for schema in TABLE_SCHEMAS if schema.matches(table_name)), None)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _index_name(table_name: str, columns: Tuple[str, ...]) -> str:
+    parts = [re.sub(r"\W+", "_", column.replace(" COLLATE ", " ")).strip("_").lower() for column in columns]
+    return f"idx_{table_name}_" + "_".join(parts)
+
+
+def _index_column_sql(column: str) -> str:
+    """Quote the column name while keeping a trailing COLLATE clause."""
+    name, sep, collation = column.partition(" COLLATE ")
+    return _quote(name) + (f" COLLATE {collation}" if sep else "")
+
+
+def _table_columns(conn, table_name: str) -> Dict[str, str]:
+    return {row[1]: (row[2] or "").upper() for row in conn.execute(f"PRAGMA table_info({_quote(table_name)})")}
+
+
+def ensure_indexes(conn, table_name: str) -> List[str]:
+    """
+    Create the declared indexes of a table, skipping those whose columns it lacks.
+
+    Returns:
+        List[str]: Names of the indexes that apply to the table
+    """
+    schema = schema_for(table_name)
+    if schema is None:
+        return []
+    existing_columns = _table_columns(conn, table_name)
+    created = []
+    for columns in schema.indexes:
+        if not all(column.partition(" COLLATE ")[0] in existing_columns for column in columns):
+            continue
+        index_name = _index_name(table_name, columns)
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(table_name)} "
+            f"({', '.join(_index_column_sql(column) for column in columns)})"
+        )
+        created.append(index_name)
+    return created
+
+
+def write_table(df, table_name: str, conn) -> None:
+    """
+    Replace a table with the contents of a DataFrame, using the declared column types and indexes.
+
+    Drop-in for df.to_sql(table_name, conn, index=False, if_exists='replace').
+    """
+    schema = schema_for(table_name)
+    dtype = None
+    if schema is not None:
+        dtype = {column: schema.column_types[column] for column in df.columns if column in schema.column_types}
+    df.to_sql(table_name, conn, index=False, if_exists="replace", dtype=dtype or None)
+    if schema is not None:
+        ensure_indexes(conn, table_name)
+
+
+def _rebuild_with_types(conn, table_name: str, schema: TableSchema, columns: Dict[str, str]) -> None:
+    """Copy a table into a new one whose known columns carry the declared types."""
+    temp_name = f"{table_name}__migrating"
+    column_defs = ", ".join(
+        f"{_quote(column)} {schema.column_types.get(column, declared)}".rstrip()
+        for column, declared in columns.items()
+    )
+    column_list = ", ".join(_quote(column) for column in columns)
+    conn.execute(f"DROP TABLE IF EXISTS {_quote(temp_name)}")
+    conn.execute(f"CREATE TABLE {_quote(temp_name)} ({column_defs})")
+    conn.execute(f"INSERT INTO {_quote(temp_name)} ({column_list}) SELECT {column_list} FROM {_quote(table_name)}")
+    conn.execute(f"DROP TABLE {_quote(table_name)}")
+    conn.execute(f"ALTER TABLE {_quote(temp_name)} RENAME TO {_quote(table_name)}")
+
+
+def migrate_schema(db_manager=None) -> Dict[str, List[str]]:
+    """
+    Bring the declared tables of an existing database up to SCHEMA_VERSION.
+
+    Tables whose known columns have other types are rebuilt with the declared types,
+    then the declared indexes are created. Runs once per database; the version is kept
+    in PRAGMA user_version.
+
+    Returns:
+        Dict[str, List[str]]: Table name -> indexes ensured, for the tables that were migrated
+    """
+    db_manager = db_manager or get_db_manager()
+    version = db_manager.fetchone("PRAGMA user_version")[0]
+    if version >= SCHEMA_VERSION:
+        return {}
+
+    migrated = {}
+    with db_manager.transaction() as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        for table_name in tables:
+            schema = schema_for(table_name)
+            if schema is None:
+                continue
+            columns = _table_columns(conn, table_name)
+            if any(column in schema.column_types and declared != schema.column_types[column]
+                   for column, declared in columns.items()):
+                logger.info("Rebuilding %s with declared column types", table_name)
+                _rebuild_with_types(conn, table_name, schema, columns)
+            migrated[table_name] = ensure_indexes(conn, table_name)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return migrated
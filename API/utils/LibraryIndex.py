@@ -0,0 +1,253 @@
+import os
+import re
+import threading
+import time
+from collections import defaultdict, namedtuple
+from typing import List
+import config
+from .DatabaseManager import get_db_manager
+
+IndexedFile = namedtuple(
+    'IndexedFile',
+    ['path', 'dir_path', 'filename', 'size', 'mtime', 'show_name', 'season', 'episode']
+)
+
+# "Show Name - S01E02 - Title.mkv"
+EPISODE_PATTERN = re.compile(r'^(.*?) - S(\d{1,2})E(\d{1,2})', re.IGNORECASE)
+
+
+def parse_episode(filename):
+    """Return (show_name, season, episode) parsed from a file name, or Nones when it doesn't match."""
+    if match := EPISODE_PATTERN.match(filename):
+        return match[1].strip(), int(match[2]), int(match[3])
+    return None, None, None
+
+
+class LibraryIndex:
+    """
+    Persistent snapshot of media folders, shared by every component that lists files.
+
+    Each directory is stored with its mtime and each file with its size, mtime and the
+    show/season/episode parsed from its name. A refresh stats every known directory but
+    only lists the ones whose mtime changed (a file was added, removed or renamed there),
+    so repeated scans of a large, mostly unchanged library only cost one stat per folder.
+
+    Files modified in place don't change their directory's mtime, so their size and mtime
+    can be stale until refresh(root, full=True) is called.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+    DIRS_TABLE = "library_dirs"
+    FILES_TABLE = "library_files"
+
+    def __new__(cls):
+        """Singleton pattern so every component shares one index."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(LibraryIndex, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self.enabled = bool(getattr(config, 'LIBRARY_INDEX', True))
+        self._refresh_lock = threading.Lock()
+        self._table_ready = False
+        self._initialized = True
+
+    def _ensure_tables(self, db_manager):
+        if self._table_ready:
+            return
+        db_manager.create_table(
+            self.DIRS_TABLE,
+            "dir_path TEXT PRIMARY KEY, parent_path TEXT, dir_mtime REAL, scanned_at REAL"
+        )
+        db_manager.create_table(
+            self.FILES_TABLE,
+            "file_path TEXT PRIMARY KEY, dir_path TEXT, filename TEXT, file_size INTEGER, file_mtime REAL, "
+            "show_name TEXT, season INTEGER, episode INTEGER"
+        )
+        db_manager.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.DIRS_TABLE}_parent ON {self.DIRS_TABLE} (parent_path)"
+        )
+        db_manager.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.FILES_TABLE}_dir ON {self.FILES_TABLE} (dir_path, filename)"
+        )
+        self._table_ready = True
+
+    @staticmethod
+    def _subtree_clause(column):
+        """WHERE clause matching a directory and everything below it (range scan, no LIKE escaping)."""
+        return f"({column} = ? OR ({column} > ? AND {column} < ?))"
+
+    @staticmethod
+    def _subtree_params(abs_root):
+        prefix = abs_root.rstrip(os.sep) + os.sep
+        return (abs_root, prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+
+    @staticmethod
+    def _scan_dir(dir_path):
+        """List one directory with os.scandir, returning (file rows, subdirectories)."""
+        files, subdirs = [], []
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk, symlinked directories are not followed
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
+                try:
+                    stat = entry.stat()
+                    size, mtime = stat.st_size, stat.st_mtime
+                except OSError:
+                    size, mtime = 0, 0.0
+                files.append((entry.path, dir_path, entry.name, size, mtime, *parse_episode(entry.name)))
+        return files, subdirs
+
+    def _walk(self, abs_root, known_dirs=None, children=None, full=True):
+        """
+        Walk abs_root, listing only directories that are new or whose mtime changed.
+
+        Returns:
+            tuple: (seen directories, {dir_path: (mtime, file rows)} for directories that were listed)
+        """
+        known_dirs = known_dirs or {}
+        children = children or {}
+        seen, changed = set(), {}
+        stack = [abs_root]
+        while stack:
+            dir_path = stack.pop()
+            try:
+                mtime = os.stat(dir_path).st_mtime
+            except OSError:
+                continue
+            if not full and known_dirs.get(dir_path) == mtime:
+                seen.add(dir_path)
+                stack.extend(children.get(dir_path, ()))
+                continue
+            try:
+                files, subdirs = self._scan_dir(dir_path)
+            except OSError:
+                # Unreadable directories are skipped, as os.walk does
+                continue
+            seen.add(dir_path)
+            changed[dir_path] = (mtime, files)
+            stack.extend(subdirs)
+        return seen, changed
+
+    def refresh(self, root, full=False):
+        """
+        Bring the stored snapshot of root up to date.
+
+        Args:
+            root: Folder to index
+            full: Re-list every directory, not just the ones whose mtime changed
+
+        Returns:
+            int: Number of directories that were listed
+        """
+        abs_root = os.path.abspath(root)
+        db_manager = get_db_manager()
+        self._ensure_tables(db_manager)
+        with self._refresh_lock:
+            subtree = self._subtree_clause("dir_path")
+            params = self._subtree_params(abs_root)
+            known_dirs, children = {}, defaultdict(list)
+            for row in db_manager.fetchall(
+                f"SELECT dir_path, parent_path, dir_mtime FROM {self.DIRS_TABLE} WHERE {subtree}", params
+            ):
+                known_dirs[row["dir_path"]] = row["dir_mtime"]
+                if row["dir_path"] != abs_root:
+                    children[row["parent_path"]].append(row["dir_path"])
+
+            seen, changed = self._walk(abs_root, known_dirs, children, full)
+            removed = [(dir_path,) for dir_path in known_dirs.keys() - seen]
+            now = time.time()
+
+            with db_manager.transaction() as conn:
+                conn.executemany(f"DELETE FROM {self.FILES_TABLE} WHERE dir_path = ?", removed)
+                conn.executemany(f"DELETE FROM {self.DIRS_TABLE} WHERE dir_path = ?", removed)
+                for dir_path, (mtime, files) in changed.items():
+                    conn.execute(f"DELETE FROM {self.FILES_TABLE} WHERE dir_path = ?", (dir_path,))
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {self.FILES_TABLE} "
+                        f"(file_path, dir_path, filename, file_size, file_mtime, show_name, season, episode) "
+                        f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        files
+                    )
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {self.DIRS_TABLE} (dir_path, parent_path, dir_mtime, scanned_at) "
+                        f"VALUES (?, ?, ?, ?)",
+                        (dir_path, os.path.dirname(dir_path), mtime, now)
+                    )
+            return len(changed)
+
+    @staticmethod
+    def _rebase(rows, abs_root, root):
+        """Express stored absolute paths relative to the root the caller passed in, as os.walk would."""
+        root = os.fspath(root)
+        if root == abs_root:
+            return [IndexedFile(*row) for row in rows]
+        rebased = []
+        for path, dir_path, filename, *rest in rows:
+            rel_dir = os.path.relpath(dir_path, abs_root)
+            dir_path = root if rel_dir == os.curdir else os.path.join(root, rel_dir)
+            rebased.append(IndexedFile(os.path.join(dir_path, filename), dir_path, filename, *rest))
+        return rebased
+
+    def files(self, root, refresh=True) -> List[IndexedFile]:
+        """
+        Return every file under root, sorted by directory and name.
+
+        Paths are built from root exactly as os.walk(root) would build them. When the
+        index is disabled (config.LIBRARY_INDEX = False) the tree is scanned directly.
+
+        Args:
+            root: Folder to list
+            refresh: Bring the snapshot up to date first
+        """
+        abs_root = os.path.abspath(root)
+        if not self.enabled:
+            _, changed = self._walk(abs_root)
+            rows = sorted(
+                (row for _, files in changed.values() for row in files),
+                key=lambda row: (row[1], row[2])
+            )
+            return self._rebase(rows, abs_root, root)
+
+        if refresh:
+            self.refresh(abs_root)
+        db_manager = get_db_manager()
+        self._ensure_tables(db_manager)
+        rows = db_manager.fetchall(
+            f"SELECT file_path, dir_path, filename, file_size, file_mtime, show_name, season, episode "
+            f"FROM {self.FILES_TABLE} WHERE {self._subtree_clause('dir_path')} ORDER BY dir_path, filename",
+            self._subtree_params(abs_root)
+        )
+        return self._rebase([tuple(row) for row in rows], abs_root, root)
+
+    def clear(self, root=None):
+        """Forget the snapshot of root, or of every folder when root is None."""
+        db_manager = get_db_manager()
+        self._ensure_tables(db_manager)
+        with self._refresh_lock, db_manager.transaction() as conn:
+            if root is None:
+                conn.execute(f"DELETE FROM {self.FILES_TABLE}")
+                conn.execute(f"DELETE FROM {self.DIRS_TABLE}")
+            else:
+                params = self._subtree_params(os.path.abspath(root))
+                conn.execute(f"DELETE FROM {self.FILES_TABLE} WHERE {self._subtree_clause('dir_path')}", params)
+                conn.execute(f"DELETE FROM {self.DIRS_TABLE} WHERE {self._subtree_clause('dir_path')}", params)
+
+
+# Global instance getter
+def get_library_index() -> LibraryIndex:
+    """Get the singleton LibraryIndex instance."""
+    return LibraryIndex()
@@ -1,5 +1,8 @@
 from .FlagManager import FlagManager
 from .MessageBroker import get_message_broker, MessageBroker
 from .DatabaseManager import DatabaseManager, get_db_manager
+from .LibraryIndex import LibraryIndex, get_library_index
+from .DatabaseSchema import write_table, ensure_indexes, migrate_schema
 
-__all__ = ['FlagManager', 'MessageBroker', 'get_message_broker', 'DatabaseManager', 'get_db_manager']
\ No newline at end of file
+__all__ = ['FlagManager', 'MessageBroker', 'get_message_broker', 'DatabaseManager', 'get_db_manager', 'LibraryIndex', 'get_library_index',
+           'write_table', 'ensure_indexes', 'migrate_schema']
\ No newline at end of file
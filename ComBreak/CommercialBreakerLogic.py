@@ -66,7 +66,7 @@ class CommercialBreakerLogic:
                         unprocessed_files_manager.add_file(str(original_file), dirpath, filename)
 
         # Get an initial count of files
-        initial_files = len(unprocessed_files_manager.get_files())
+        initial_files = len(unprocessed_files_manager)
         if status_callback:
             status_callback(f"Starting with {initial_files} video files to check")
 
@@ -75,7 +75,7 @@ class CommercialBreakerLogic:
         self.chapter_extractor.extract_chapters(input_path, output_path, unprocessed_files_manager, status_callback, progress_callback, reset_callback)
         
         # Check how many files are left after chapter extraction
-        remaining_files = len(unprocessed_files_manager.get_files())
+        remaining_files = len(unprocessed_files_manager)
         if status_callback:
             status_callback(f"After chapter extraction: {remaining_files} videos remaining for processing")
         
@@ -83,8 +83,7 @@ class CommercialBreakerLogic:
             reset_callback()
 
         # Get the final list of files to be processed
-        files_to_process = unprocessed_files_manager.get_files()
-        total_videos = len(files_to_process)
+        total_videos = len(unprocessed_files_manager)
         if status_callback:
             status_callback(f"Total files to be processed: {total_videos}")
 
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+import config
+from API.utils import get_db_manager
+
+
+class DetectionCacheEntry:
+    """Cached silence periods and per-frame brightness scores for one video file."""
+
+    def __init__(self, silence_periods, frame_scores, thresholds):
+        self.silence_periods = silence_periods
+        # List of [time, mean brightness] for every analyzed frame inside the silence periods
+        self.frame_scores = frame_scores
+        # BLACK_FRAME_THRESHOLD / TIMESTAMP_THRESHOLD / START_BUFFER used when the entry was stored
+        self.thresholds = thresholds
+
+    def black_frames(self, black_frame_threshold=None):
+        """Return the raw black frame timestamps for a (possibly new) brightness threshold."""
+        if black_frame_threshold is None:
+            black_frame_threshold = config.BLACK_FRAME_THRESHOLD
+        return sorted(t for t, score in self.frame_scores if score < black_frame_threshold)
+
+
+class DetectionCache:
+    """
+    Persistent cache of black frame detection results, stored in the SQLite database.
+
+    Entries are keyed by the original file path and validated against the file size
+    and modification time. With config.DETECTION_CACHE_HASH enabled a partial content
+    hash is stored too, so a file that was moved or renamed is still recognised.
+
+    Only parameters that change what gets decoded (silence detection, frame sampling,
+    downscale height, decode mode) invalidate an entry. The brightness and reduction
+    thresholds are re-applied to the cached frame scores, so changing them never
+    requires decoding the video again.
+    """
+
+    TABLE = "detection_cache"
+    # Bytes read from the start and end of a file for the partial hash
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, enabled=None, use_hash=None):
+        self.enabled = bool(enabled if enabled is not None else getattr(config, 'DETECTION_CACHE', True))
+        self.use_hash = bool(use_hash if use_hash is not None else getattr(config, 'DETECTION_CACHE_HASH', False))
+        self._table_ready = False
+
+    @staticmethod
+    def detection_params():
+        """Settings that affect the decoded frames; a change here invalidates cached entries."""
+        return json.dumps({
+            'DECIBEL_THRESHOLD': config.DECIBEL_THRESHOLD,
+            'SILENCE_DURATION': config.SILENCE_DURATION,
+            'FRAME_RATE': config.FRAME_RATE,
+            'DOWNSCALE_HEIGHT': config.DOWNSCALE_HEIGHT,
+            'DECODE_MODE': getattr(config, 'DECODE_MODE', 'segments'),
+            'DETECTION_BACKEND': getattr(config, 'DETECTION_BACKEND', 'opencv'),
+        }, sort_keys=True)
+
+    @staticmethod
+    def current_thresholds():
+        return {
+            'BLACK_FRAME_THRESHOLD': config.BLACK_FRAME_THRESHOLD,
+            'TIMESTAMP_THRESHOLD': config.TIMESTAMP_THRESHOLD,
+            'START_BUFFER': config.START_BUFFER,
+        }
+
+    def _ensure_table(self, db_manager):
+        if self._table_ready:
+            return
+        db_manager.create_table(
+            self.TABLE,
+            "file_path TEXT PRIMARY KEY, "
+            "file_size INTEGER, "
+            "file_mtime REAL, "
+            "partial_hash TEXT, "
+            "detection_params TEXT, "
+            "silence_periods TEXT, "
+            "frame_scores TEXT, "
+            "thresholds TEXT, "
+            "updated_at REAL"
+        )
+        db_manager.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_content ON {self.TABLE} (file_size, partial_hash)"
+        )
+        self._table_ready = True
+
+    def _partial_hash(self, file_path, size):
+        """Hash the file size plus its first and last HASH_CHUNK_SIZE bytes."""
+        digest = hashlib.sha1(str(size).encode())
+        with open(file_path, "rb") as f:
+            digest.update(f.read(self.HASH_CHUNK_SIZE))
+            if size > self.HASH_CHUNK_SIZE:
+                f.seek(max(self.HASH_CHUNK_SIZE, size - self.HASH_CHUNK_SIZE))
+                digest.update(f.read(self.HASH_CHUNK_SIZE))
+        return digest.hexdigest()
+
+    def lookup(self, file_path, status_callback=None):
+        """
+        Return the cached DetectionCacheEntry for a file, or None on a miss.
+
+        Args:
+            file_path: Path to the original video file
+            status_callback: Function to report status messages
+        """
+        if not self.enabled:
+            return None
+        try:
+            stat = os.stat(file_path)
+            db_manager = get_db_manager()
+            self._ensure_table(db_manager)
+            params = self.detection_params()
+
+            row = db_manager.fetchone(
+                f"SELECT * FROM {self.TABLE} WHERE file_path = ? AND file_size = ? AND file_mtime = ? AND detection_params = ?",
+                (str(file_path), stat.st_size, stat.st_mtime, params)
+            )
+            if row is None and self.use_hash:
+                # Same content under a different path (moved or renamed library)
+                row = db_manager.fetchone(
+                    f"SELECT * FROM {self.TABLE} WHERE file_size = ? AND partial_hash = ? AND detection_params = ?",
+                    (stat.st_size, self._partial_hash(file_path, stat.st_size), params)
+                )
+            if row is None:
+                return None
+            return DetectionCacheEntry(
+                json.loads(row["silence_periods"]),
+                json.loads(row["frame_scores"]),
+                json.loads(row["thresholds"])
+            )
+        except Exception as e:
+            if status_callback:
+                status_callback(f"Detection cache lookup failed for {Path(file_path).name}: {e}")
+            return None
+
+    def store(self, file_path, silence_periods, frame_scores, status_callback=None):
+        """
+        Save the detection results for a file.
+
+        Args:
+            file_path: Path to the original video file
+            silence_periods: List of {'start', 'end'} dicts found by the silence detector
+            frame_scores: Iterable of (time, mean brightness) pairs for every analyzed frame
+            status_callback: Function to report status messages
+        """
+        if not self.enabled:
+            return
+        try:
+            stat = os.stat(file_path)
+            db_manager = get_db_manager()
+            self._ensure_table(db_manager)
+            db_manager.insert_or_replace(self.TABLE, {
+                "file_path": str(file_path),
+                "file_size": stat.st_size,
+                "file_mtime": stat.st_mtime,
+                "partial_hash": self._partial_hash(file_path, stat.st_size) if self.use_hash else None,
+                "detection_params": self.detection_params(),
+                "silence_periods": json.dumps(silence_periods),
+                "frame_scores": json.dumps([[float(t), float(score)] for t, score in frame_scores]),
+                "thresholds": json.dumps(self.current_thresholds()),
+                "updated_at": time.time(),
+            })
+        except Exception as e:
+            if status_callback:
+                status_callback(f"Could not cache detection results for {Path(file_path).name}: {e}")
+
+    def clear(self):
+        """Drop every cached detection result."""
+        db_manager = get_db_manager()
+        self._ensure_table(db_manager)
+        db_manager.execute(f"DELETE FROM {self.TABLE}")
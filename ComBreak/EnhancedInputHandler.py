@@ -1,9 +1,9 @@
 """
 EnhancedInputHandler module provides flexible input methods for the Commercial Breaker application.
 """
-import os
 from pathlib import Path
 import config
+from API.utils import get_library_index
 
 class EnhancedInputHandler:
     """
@@ -96,13 +96,12 @@ class EnhancedInputHandler:
         for file_path in self.files:
             consolidated.add(str(file_path))
         
-        # Add files from folders
+        # Add files from folders, listed through the shared library index
+        library_index = get_library_index()
         for folder in self.folders:
-            for root, _, files in os.walk(folder):
-                for file in files:
-                    if file.lower().endswith(self.video_file_extensions):
-                        file_path = Path(root) / file
-                        consolidated.add(str(file_path))
+            for entry in library_index.files(str(folder)):
+                if entry.filename.lower().endswith(self.video_file_extensions):
+                    consolidated.add(entry.path)
         
         # Add filtered paths
         for path in self.filtered_paths:
@@ -0,0 +1,136 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+import config
+from API.utils import get_db_manager
+from ComBreak.utils import get_executable_path
+
+
+class KeyframeIndex:
+    """
+    Video keyframe times per file, read once from ffprobe packet flags and cached in the database.
+
+    With -c:v copy the segment muxer can only split on a keyframe, so every cut lands on
+    the first keyframe at or after the requested time. snap() moves timestamps to exactly
+    those positions, so physical cuts and the startTime/endTime written in cutless mode
+    describe the same boundaries.
+
+    Entries are keyed by path and validated by file size and mtime.
+    """
+
+    TABLE = "keyframe_index"
+
+    def __init__(self, enabled=None):
+        self.enabled = bool(enabled if enabled is not None else getattr(config, 'KEYFRAME_SNAP', True))
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._table_ready = False
+
+    def _ensure_table(self, db_manager):
+        if self._table_ready:
+            return
+        db_manager.create_table(
+            self.TABLE,
+            "file_path TEXT PRIMARY KEY, file_size INTEGER, file_mtime REAL, keyframes TEXT, updated_at REAL"
+        )
+        self._table_ready = True
+
+    @staticmethod
+    def read_keyframes(video_file):
+        """Return the sorted keyframe times of the first video stream, without decoding."""
+        command = [
+            get_executable_path("ffprobe", config.ffprobe_path),
+            '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,flags',
+            '-of', 'csv=p=0',
+            str(video_file)
+        ]
+        output = subprocess.check_output(command).decode()
+        keyframes = []
+        for line in output.splitlines():
+            pts_time, _, flags = line.partition(',')
+            if 'K' in flags:
+                try:
+                    keyframes.append(float(pts_time))
+                except ValueError:
+                    continue  # pts_time is N/A for some packets
+        return sorted(keyframes)
+
+    def keyframes(self, video_file):
+        """
+        Return the keyframe times for a file, probing it only if no cached list is valid.
+
+        Raises:
+            OSError: If the file does not exist
+            subprocess.CalledProcessError: If ffprobe fails
+        """
+        path = str(video_file)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime)
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+
+        db_manager = get_db_manager()
+        self._ensure_table(db_manager)
+        row = db_manager.fetchone(
+            f"SELECT keyframes FROM {self.TABLE} WHERE file_path = ? AND file_size = ? AND file_mtime = ?",
+            key
+        )
+        if row is not None:
+            keyframes = json.loads(row["keyframes"])
+        else:
+            keyframes = self.read_keyframes(path)
+            db_manager.insert_or_replace(self.TABLE, {
+                "file_path": path,
+                "file_size": stat.st_size,
+                "file_mtime": stat.st_mtime,
+                "keyframes": json.dumps(keyframes),
+                "updated_at": time.time(),
+            })
+
+        with self._lock:
+            self._memory[key] = keyframes
+        return keyframes
+
+    def snap(self, video_file, timestamps, status_callback=None):
+        """
+        Move each timestamp to the first keyframe at or after it.
+
+        Timestamps past the last keyframe are dropped (a stream copy can't split there) and
+        timestamps that land on the same keyframe are merged. If snapping is disabled or the
+        keyframes can't be read, the timestamps are returned unchanged.
+        """
+        if not self.enabled or not timestamps:
+            return list(timestamps)
+        try:
+            keyframes = self.keyframes(video_file)
+        except Exception as e:
+            if status_callback:
+                status_callback(f"Could not read keyframes for {Path(video_file).name}, using timestamps as-is: {e}")
+            return list(timestamps)
+        if not keyframes:
+            return list(timestamps)
+
+        snapped = []
+        for t in sorted(timestamps):
+            i = bisect_left(keyframes, t)
+            if i == len(keyframes):
+                break
+            # A split on the very first frame would only produce an empty part
+            if keyframes[i] > 0 and (not snapped or keyframes[i] > snapped[-1]):
+                snapped.append(keyframes[i])
+        return snapped
+
+    def clear(self):
+        """Drop every cached keyframe list."""
+        with self._lock:
+            self._memory.clear()
+        db_manager = get_db_manager()
+        self._ensure_table(db_manager)
+        db_manager.execute(f"DELETE FROM {self.TABLE}")
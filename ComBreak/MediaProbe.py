@@ -0,0 +1,229 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import config
+from API.utils import get_db_manager
+from ComBreak.utils import get_executable_path
+
+
+def _parse_rate(rate):
+    """Turn an ffprobe rate such as '24000/1001' into a float (0.0 if unknown)."""
+    try:
+        num, _, den = str(rate).partition('/')
+        num, den = float(num), float(den or 1)
+        return num / den if den else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class MediaInfo:
+    """Parsed result of one ffprobe -show_format -show_streams -show_chapters call."""
+
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self.format = data.get('format', {})
+        self.streams = data.get('streams', [])
+
+    @property
+    def video_stream(self):
+        for stream in self.streams:
+            if stream.get('codec_type') == 'video' and not stream.get('disposition', {}).get('attached_pic'):
+                return stream
+        return None
+
+    @property
+    def audio_streams(self):
+        return [stream for stream in self.streams if stream.get('codec_type') == 'audio']
+
+    @property
+    def duration(self):
+        """Container duration in seconds, falling back to the longest stream."""
+        try:
+            return float(self.format['duration'])
+        except (KeyError, TypeError, ValueError):
+            durations = [float(s['duration']) for s in self.streams if s.get('duration') not in (None, 'N/A')]
+            return max(durations) if durations else 0.0
+
+    @property
+    def fps(self):
+        stream = self.video_stream
+        if not stream:
+            return 0.0
+        return _parse_rate(stream.get('avg_frame_rate')) or _parse_rate(stream.get('r_frame_rate'))
+
+    @property
+    def frame_count(self):
+        """Frame count from the stream header, estimated from duration and fps when absent."""
+        stream = self.video_stream
+        if stream and str(stream.get('nb_frames', '')).isdigit():
+            return int(stream['nb_frames'])
+        return int(self.duration * self.fps)
+
+    @property
+    def chapters(self):
+        return [
+            {'start': float(chapter['start_time']), 'end': float(chapter['end_time'])}
+            for chapter in self.data.get('chapters', [])
+        ]
+
+
+class MediaProbe:
+    """
+    Shared media metadata service.
+
+    Runs a single ffprobe per file for format, streams and chapters. Results are kept
+    in a process-wide LRU and persisted in the media_probe table, keyed by path and
+    validated by size and mtime, so a file is only probed again after it changes.
+    probe_many probes a batch of files on a thread pool.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+    TABLE = "media_probe"
+
+    def __new__(cls):
+        """Singleton pattern so every component shares one cache."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(MediaProbe, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self.max_entries = int(getattr(config, 'PROBE_CACHE_SIZE', 4096))
+        self.workers = max(1, int(getattr(config, 'PROBE_WORKERS', 8)))
+        self.persist = bool(getattr(config, 'PROBE_CACHE_PERSIST', True))
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._table_ready = False
+        self._initialized = True
+
+    # ------------------- Cache layers -------------------
+    def _cache_get(self, key):
+        with self._cache_lock:
+            info = self._cache.get(key)
+            if info is not None:
+                self._cache.move_to_end(key)
+            return info
+
+    def _cache_put(self, key, info):
+        with self._cache_lock:
+            self._cache[key] = info
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _ensure_table(self, db_manager):
+        if self._table_ready:
+            return
+        db_manager.create_table(
+            self.TABLE,
+            "file_path TEXT PRIMARY KEY, file_size INTEGER, file_mtime REAL, probe_json TEXT, updated_at REAL"
+        )
+        self._table_ready = True
+
+    def _db_get(self, path, size, mtime):
+        try:
+            db_manager = get_db_manager()
+            self._ensure_table(db_manager)
+            row = db_manager.fetchone(
+                f"SELECT probe_json FROM {self.TABLE} WHERE file_path = ? AND file_size = ? AND file_mtime = ?",
+                (path, size, mtime)
+            )
+            return json.loads(row["probe_json"]) if row else None
+        except Exception as e:
+            print(f"Failed to read cached probe for {path}. Error: {e}")
+            return None
+
+    def _db_put(self, path, size, mtime, data):
+        try:
+            db_manager = get_db_manager()
+            self._ensure_table(db_manager)
+            db_manager.insert_or_replace(self.TABLE, {
+                "file_path": path,
+                "file_size": size,
+                "file_mtime": mtime,
+                "probe_json": json.dumps(data),
+                "updated_at": time.time(),
+            })
+        except Exception as e:
+            print(f"Failed to cache probe for {path}. Error: {e}")
+
+    # ------------------- Probing -------------------
+    @staticmethod
+    def run_ffprobe(path):
+        """Run ffprobe once and return its parsed JSON output."""
+        command = [
+            get_executable_path("ffprobe", config.ffprobe_path),
+            '-v', 'quiet',
+            '-print_format', 'json',
+            '-show_format',
+            '-show_streams',
+            '-show_chapters',
+            path
+        ]
+        return json.loads(subprocess.check_output(command).decode())
+
+    def probe(self, path):
+        """
+        Return MediaInfo for a file, probing it only if no cached result is valid.
+
+        Raises:
+            OSError: If the file does not exist
+            subprocess.CalledProcessError: If ffprobe fails
+        """
+        path = str(path)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime)
+
+        info = self._cache_get(key)
+        if info is not None:
+            return info
+
+        data = self._db_get(*key) if self.persist else None
+        if data is None:
+            data = self.run_ffprobe(path)
+            if self.persist:
+                self._db_put(*key, data)
+
+        info = MediaInfo(path, data)
+        self._cache_put(key, info)
+        return info
+
+    def probe_many(self, paths, workers=None):
+        """
+        Probe many files concurrently.
+
+        Returns:
+            dict: path -> MediaInfo, or the exception raised while probing that path
+        """
+        paths = [str(p) for p in paths]
+        workers = max(1, min(workers or self.workers, len(paths) or 1))
+
+        def safe_probe(path):
+            try:
+                return self.probe(path)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffprobe") as pool:
+            return dict(zip(paths, pool.map(safe_probe, paths)))
+
+    def clear(self):
+        """Forget everything in the in-memory cache."""
+        with self._cache_lock:
+            self._cache.clear()
+
+
+# Global instance getter
+def get_media_probe() -> MediaProbe:
+    """Get the singleton MediaProbe instance."""
+    return MediaProbe()
@@ -1,13 +1,25 @@
 import os
 from pathlib import Path
+import queue
+import re
+import shutil
 import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from bisect import bisect_left
+from collections import namedtuple
 import config
 import cv2
 import numpy as np
 from ComBreak.VideoLoader import VideoLoader
+from ComBreak.DetectionCache import DetectionCache
+from ComBreak.MediaProbe import get_media_probe
 from ComBreak.utils import get_executable_path
 
+# Grayscale frames decoded straight from ffmpeg's stdout plus their source-timeline timestamps
+DecodedFrames = namedtuple('DecodedFrames', ['frames', 'times'])
+
 
 class SilentBlackFrameDetector:
     def __init__(self, input_handler):
@@ -44,6 +56,8 @@ class ProgressManager:
         self.done = 0
         
         self.cb = progress_cb
+        # Parallel detection workers share one manager, so steps are serialized
+        self._lock = threading.Lock()
         # Initial call to set progress to 0
         if self.cb:
             self.cb(self.done, self.total)
@@ -57,38 +71,51 @@ class ProgressManager:
 
     def step_downscale(self):
         # Only step if we haven't reached the total for this category
-        if self.downscale_done < self.downscale_total:
-            self.downscale_done += 1
-            self._update_progress()
+        with self._lock:
+            if self.downscale_done < self.downscale_total:
+                self.downscale_done += 1
+                self._update_progress()
         # Optional: Log or warn if trying to step beyond total
         # elif self.downscale_done == self.downscale_total:
         #     print("Warning: Tried to step downscale beyond total")
 
     def step_silence(self):
-        if self.silence_done < self.silence_total:
-            self.silence_done += 1
-            self._update_progress()
+        with self._lock:
+            if self.silence_done < self.silence_total:
+                self.silence_done += 1
+                self._update_progress()
         # elif self.silence_done == self.silence_total:
         #     print("Warning: Tried to step silence beyond total")
 
-    def step_frame(self):
+    def step_frame(self, count=1):
         # Frame count is an estimate, so allow stepping slightly beyond
         # but the total progress is capped in _update_progress
-        self.frame_done += 1 
-        self._update_progress()
+        # Batched analysis reports a whole batch in one call
+        with self._lock:
+            self.frame_done += count
+            self._update_progress()
         
+    def add_work(self, downscale_count=0, frame_count=0):
+        """Grow the totals as the pipelined silence scan discovers more work."""
+        with self._lock:
+            self.downscale_total += downscale_count
+            self.frame_total += frame_count
+            self.total = max(1, self.downscale_total + self.silence_total + self.frame_total)
+            self._update_progress()
+
     def force_complete(self):
         """Forces the progress bar to 100%."""
-        self.done = self.total
-        self.downscale_done = self.downscale_total
-        self.silence_done = self.silence_total
-        self.frame_done = self.frame_total # Set frame done to total estimated
-        if self.cb:
-            self.cb(self.done, self.total)
+        with self._lock:
+            self.done = self.total
+            self.downscale_done = self.downscale_total
+            self.silence_done = self.silence_total
+            self.frame_done = self.frame_total # Set frame done to total estimated
+            if self.cb:
+                self.cb(self.done, self.total)
 
 
 class SilentBlackFrameOrchestrator:
-    def __init__(self, input_handler):
+    def __init__(self, input_handler, workers=None, pipeline=None):
         self.input_handler = input_handler
         self.gatherer = VideoFileGatherer(input_handler)
         self.preprocessor = VideoPreprocessor()
@@ -96,6 +123,17 @@ class SilentBlackFrameOrchestrator:
         self.blackframe_analyzer = BlackFrameAnalyzer()
         self.reducer = TimestampReducer()
         self.cleaner = ResourceCleaner()
+        self.cache = DetectionCache()
+        # Number of files processed concurrently; 1 keeps the original sequential behaviour
+        self.workers = max(1, int(workers if workers is not None else getattr(config, 'DETECTION_WORKERS', 1)))
+        # Stream files through silence -> extraction -> analysis instead of pre-scanning everything first
+        self.pipeline = bool(pipeline if pipeline is not None else getattr(config, 'DETECTION_PIPELINE', False))
+        self.queue_size = max(1, int(getattr(config, 'PIPELINE_QUEUE_SIZE', 2)))
+        # "segments" re-encodes each silent window to a temp mp4, "stream" decodes them in memory
+        self.decode_mode = getattr(config, 'DECODE_MODE', 'segments')
+        # "opencv" analyzes downscaled frames in Python, "ffmpeg" measures luma inside ffmpeg's filtergraph
+        self.backend = getattr(config, 'DETECTION_BACKEND', 'opencv')
+        self.filter_detector = FFMpegFilterDetector()
 
     def run(
         self, input_path, output_path, total_frames, video_files_data,
@@ -114,6 +152,60 @@ class SilentBlackFrameOrchestrator:
                 status_callback("No files to process. Skipping silent black frame detection.")
             return 0
 
+        # Files with cached detection results only need their thresholds re-applied
+        gathered = self._apply_cached_results(gathered, status_callback)
+        if not gathered:
+            if progress_callback:
+                progress_callback(1, 1)
+            if status_callback:
+                status_callback("All files were answered from the detection cache.")
+                status_callback("Silent black frame detection complete!")
+            return 0
+
+        if self.backend == 'ffmpeg':
+            # One decode per file and no per-frame Python work: only one step per file
+            prog = ProgressManager(0, len(gathered), 0, progress_callback)
+            processed_frames_total_counter = self._run_filter_backend(gathered, prog, status_callback)
+        elif self.pipeline:
+            # Only the silence steps are known up front; the rest is added as files are scanned
+            prog = ProgressManager(0, len(gathered), 0, progress_callback)
+            processed_frames_total_counter = self._run_pipelined(gathered, prog, status_callback)
+        else:
+            processed_frames_total_counter = self._run_prescanned(gathered, progress_callback, status_callback)
+
+        if status_callback:
+            status_callback("Silent black frame detection complete!")
+            
+        return processed_frames_total_counter # Return actual frames processed
+
+    def _apply_cached_results(self, gathered, status_callback):
+        """
+        Write timestamps for files whose detection results are cached.
+
+        The cached frame scores are re-filtered with the current BLACK_FRAME_THRESHOLD
+        and reduced with the current TIMESTAMP_THRESHOLD/START_BUFFER, so no decoding
+        happens. Returns the files that still need a full scan.
+        """
+        if not self.cache.enabled:
+            return gathered
+
+        remaining = []
+        for filename, original_file, out_dir in gathered:
+            entry = self.cache.lookup(original_file, status_callback)
+            if entry is None:
+                remaining.append((filename, original_file, out_dir))
+                continue
+            if status_callback:
+                status_callback(f"Using cached detection results for {filename}")
+            final_ts = self.reducer.reduce(entry.black_frames(config.BLACK_FRAME_THRESHOLD))
+            self._write_timestamps(filename, out_dir, final_ts, status_callback)
+
+        if status_callback and len(remaining) != len(gathered):
+            status_callback(f"Detection cache hits: {len(gathered) - len(remaining)}/{len(gathered)} files")
+        return remaining
+
+    def _run_prescanned(self, gathered, progress_callback, status_callback):
+        """Scan every file for silence first, then process them with exact progress totals."""
         # --- Accurate Progress Pre-calculation ---
         
         # 1. Silence Steps (1 per video)
@@ -122,50 +214,13 @@ class SilentBlackFrameOrchestrator:
         # 2. Pre-scan all videos for silence periods
         if status_callback:
             status_callback(f"Pre-scanning {len(gathered)} videos to identify silence periods and optimize processing...")
-        all_silence_periods_data = []
-        downscale_steps_total = 0
-        frame_steps_total = 0
-        
-        for idx, (filename, original_file, out_dir) in enumerate(gathered):
-            silence_periods = []
-            try:
-                # Use a minimal status callback during pre-scan if desired
-                # silence_periods = self.silence_detector.detect(original_file, lambda msg: None) 
-                silence_periods = self.silence_detector.detect(original_file, status_callback) 
-                
-                # Count downscale steps (1 per segment)
-                downscale_steps_total += len(silence_periods)
-                
-                # Estimate frame steps (using original video frame rate)
-                if silence_periods:
-                    try:
-                        # Use VideoLoader's get_frame_count to estimate frames in periods
-                        temp_loader = VideoLoader(str(original_file))
-                        # Calculate how many frames per second after FRAME_RATE sampling
-                        fps = temp_loader.cap.get(cv2.CAP_PROP_FPS) / config.FRAME_RATE
-                        temp_loader.release()
-                        
-                        for period in silence_periods:
-                            duration = period['end'] - period['start']
-                            if duration > 0:
-                                # Calculate frames in this period using FPS after sampling
-                                estimated_frames = int(duration * fps)
-                                frame_steps_total += estimated_frames
-                    except Exception as e:
-                        if status_callback:
-                            status_callback(f"Error estimating frames for {filename}, progress might be less accurate: {str(e)}")
-                            
-            except Exception as e:
-                if status_callback:
-                    status_callback(f"Error pre-scanning silence in {filename}: {str(e)}")
-            
-            all_silence_periods_data.append({
-                'file_idx': idx,
-                'filename': filename,
-                'original_file': original_file,
-                'out_dir': out_dir,
-                'silence_periods': silence_periods
-            })
+        all_silence_periods_data = [
+            self._scan_file(idx, filename, original_file, out_dir, status_callback)
+            for idx, (filename, original_file, out_dir) in enumerate(gathered)
+        ]
+        # Count downscale steps (1 per segment) and estimated frame steps
+        downscale_steps_total = sum(len(d['silence_periods']) for d in all_silence_periods_data)
+        frame_steps_total = sum(d['estimated_frames'] for d in all_silence_periods_data)
 
         if status_callback:
             status_callback(f"Processing plan: {silence_steps_total} silence detections + " +
@@ -174,126 +229,374 @@ class SilentBlackFrameOrchestrator:
 
         # Initialize ProgressManager with accurate counts
         prog = ProgressManager(downscale_steps_total, silence_steps_total, frame_steps_total, progress_callback)
-        processed_frames_total_counter = 0 # Keep track of actual frames processed across all files
 
         # --- Phase 2: Process each file ---
-        for file_data in all_silence_periods_data:
-            idx = file_data['file_idx']
-            filename = file_data['filename']
-            original_file = file_data['original_file']
-            out_dir = file_data['out_dir']
-            silence_periods = file_data['silence_periods']
-            segment_files = []
-            # Estimate frames for *this file* to handle errors in analysis phase
-            estimated_frames_for_this_file = 0
-            if silence_periods:
-                try:
-                    # Use the same FPS calculation as above for consistency
-                    temp_loader = VideoLoader(str(original_file))
-                    fps = temp_loader.cap.get(cv2.CAP_PROP_FPS) / config.FRAME_RATE
-                    temp_loader.release()
-                    
-                    for period in silence_periods:
-                        duration = period['end'] - period['start']
-                        if duration > 0: 
-                            estimated_frames_for_this_file += int(duration * fps)
-                except Exception as e:
-                    if status_callback:
-                        status_callback(f"Error estimating frames for {filename}, using approximation: {str(e)}")
-            
-            try:
-                if status_callback:
-                    status_callback(f"Processing video {idx+1}/{len(gathered)}: {filename}")
+        if self.workers > 1 and len(all_silence_periods_data) > 1:
+            processed_frames_total_counter = self._process_files_parallel(
+                all_silence_periods_data, len(gathered), prog, status_callback
+            )
+        else:
+            processed_frames_total_counter = 0 # Keep track of actual frames processed across all files
+            for file_data in all_silence_periods_data:
+                # Silence detection step (already done, just update progress)
+                prog.step_silence()
+                processed_frames_total_counter += self._process_file(
+                    file_data, len(gathered), prog, status_callback,
+                    self.preprocessor, self.blackframe_analyzer
+                )
+
+        # Final progress update to ensure it reaches 100%
+        prog.force_complete() # Use the new method to guarantee 100%
+        return processed_frames_total_counter
 
-                # 2.1 Silence detection step (already done, just update progress)
-                prog.step_silence() 
+    def _run_pipelined(self, gathered, prog, status_callback):
+        """
+        Stream files through silence detection -> segment extraction -> frame analysis.
 
-                # 2.2 Targeted downscaling
-                if silence_periods:
+        Each stage runs on its own thread(s) connected by bounded queues, so file N+1's
+        silence scan overlaps with file N's analysis and memory stays bounded by the
+        queue size. Progress totals grow as each file's silence scan completes.
+        """
+        total = len(gathered)
+        stage_workers = self.workers
+        scanned = queue.Queue(maxsize=self.queue_size)
+        extracted = queue.Queue(maxsize=self.queue_size)
+        processed = {}
+
+        if status_callback:
+            status_callback(f"Streaming {total} videos through the detection pipeline " +
+                            f"({stage_workers} worker(s) per stage)")
+
+        def silence_stage():
+            try:
+                for idx, (filename, original_file, out_dir) in enumerate(gathered):
+                    file_data = self._scan_file(idx, filename, original_file, out_dir, status_callback)
+                    prog.add_work(len(file_data['silence_periods']), file_data['estimated_frames'])
+                    prog.step_silence()
+                    scanned.put(file_data)
+            finally:
+                # One sentinel per extraction worker
+                for _ in range(stage_workers):
+                    scanned.put(None)
+
+        def extraction_stage():
+            got_sentinel = False
+            try:
+                preprocessor = VideoPreprocessor()
+                while (file_data := scanned.get()) is not None:
+                    work_dir = None
                     try:
-                        segment_files = self.preprocessor.preprocess_segments(
-                            original_file, out_dir, silence_periods, idx, len(gathered),
-                            status_callback, 
-                            prog.step_downscale # Pass the specific downscale step function
-                        )
+                        # Private temp dir: file N+1 is being extracted while file N is analyzed
+                        work_dir = tempfile.mkdtemp(prefix=f".combreak_{file_data['file_idx']}_", dir=file_data['out_dir'])
+                        segment_files = self._extract_segments(file_data, total, prog, status_callback, preprocessor, work_dir)
                     except Exception as e:
                         if status_callback:
-                            status_callback(f"Error during segmented downscaling for {filename}: {str(e)}")
-                        # Ensure progress steps for downscaling are accounted for even on error
-                        # Calculate how many downscale steps were expected for this file
-                        expected_downscales_for_file = len(silence_periods)
-                        # Calculate how many were done *before* this file started
-                        downscales_before_this_file = sum(len(p_data['silence_periods']) for p_data in all_silence_periods_data[:idx])
-                        # Calculate how many were done *for* this file so far (might be 0 if error was immediate)
-                        downscales_done_for_this_file = prog.downscale_done - downscales_before_this_file
-                        # Step the remaining ones
-                        remaining_downscale_steps = max(0, expected_downscales_for_file - downscales_done_for_this_file)
-                        for _ in range(remaining_downscale_steps):
-                             prog.step_downscale()
-                        raise # Re-raise to skip analysis for this file
-                else:
-                    # No downscale steps expected or taken
-                    if status_callback:
-                        status_callback(f"No silence periods found for {filename}, skipping downscale/analysis.")
-                    
+                            status_callback(f"An error occurred processing {file_data['filename']}, skipping remaining steps for this file: {str(e)}")
+                        segment_files = None
+                    extracted.put((file_data, segment_files, work_dir))
+                got_sentinel = True
+            finally:
+                if not got_sentinel:
+                    # This worker failed outright; keep taking files until its sentinel so the
+                    # silence stage never blocks on a full queue
+                    while scanned.get() is not None:
+                        pass
+                # Each extraction worker releases exactly one analysis worker
+                extracted.put(None)
 
-                # 2.3 Black frame analysis
-                raw_ts = []
-                processed_frames_in_file = 0
-                if segment_files: # Only analyze if segments were successfully created
-                    try:
-                        # Pass 0 as offset, function returns count for this call
-                        raw_ts, processed_frames_in_file = self.blackframe_analyzer.analyze_segments(
-                            segment_files,
-                            status_callback, 
-                            prog.step_frame, # Pass the specific frame step function
-                            0, 
-                            estimated_frames_for_this_file # Pass estimate for context
+        def analysis_stage():
+            analyzer = BlackFrameAnalyzer()
+            while (item := extracted.get()) is not None:
+                file_data, segment_files, work_dir = item
+                try:
+                    if segment_files is not None:
+                        processed[file_data['file_idx']] = self._analyze_and_write(
+                            file_data, segment_files, prog, status_callback, analyzer
                         )
-                        processed_frames_total_counter += processed_frames_in_file
-                    except Exception as e:
-                        if status_callback:
-                            status_callback(f"Error during frame analysis for {filename}: {str(e)}")
-                        # Ensure progress steps for frames are accounted for
-                        remaining_frame_steps = max(0, estimated_frames_for_this_file - processed_frames_in_file)
-                        if status_callback:
-                            status_callback(f"Accounting for {remaining_frame_steps} estimated remaining frames in progress.")
-                        for _ in range(remaining_frame_steps):
-                            prog.step_frame()
-                        processed_frames_total_counter += remaining_frame_steps # Add to total count
-                        
-                else:
-                    # No frame analysis steps expected or taken if no segments
-                    pass 
+                except Exception as e:
+                    if status_callback:
+                        status_callback(f"An error occurred processing {file_data['filename']}, skipping remaining steps for this file: {str(e)}")
+                finally:
+                    self._cleanup(segment_files, status_callback)
+                    if work_dir is not None:
+                        shutil.rmtree(work_dir, ignore_errors=True)
+
+        threads = [threading.Thread(target=silence_stage, name="blackframe-silence", daemon=True)]
+        threads += [threading.Thread(target=extraction_stage, name=f"blackframe-extract-{i}", daemon=True)
+                    for i in range(stage_workers)]
+        threads += [threading.Thread(target=analysis_stage, name=f"blackframe-analyze-{i}", daemon=True)
+                    for i in range(stage_workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
 
-                # 2.4 Reduction & write
-                final_ts = self.reducer.reduce(raw_ts)
-                self._write_timestamps(filename, out_dir, final_ts, status_callback)
+        prog.force_complete()
+        return sum(processed.values())
 
+    def _run_filter_backend(self, gathered, prog, status_callback):
+        """Detect every file with FFMpegFilterDetector, optionally on a worker pool."""
+        total = len(gathered)
+
+        def detect_file(idx, filename, original_file, out_dir):
+            try:
+                if status_callback:
+                    status_callback(f"Processing video {idx+1}/{total}: {filename}")
+                _, raw_ts, sampled_frames = self.filter_detector.detect(original_file, status_callback)
+                self._write_timestamps(filename, out_dir, self.reducer.reduce(raw_ts), status_callback)
+                return sampled_frames
             except Exception as e:
-                # General error handling for the file
                 if status_callback:
                     status_callback(f"An error occurred processing {filename}, skipping remaining steps for this file: {str(e)}")
-                # Ensure progress steps are advanced if not already done
-                # Silence step was done at the start of the loop
-                # Downscale steps should have been handled in the downscale try/except
-                # Frame steps should have been handled in the analysis try/except
-                # If error happened before analysis, need to account for frame steps here? Let's assume analysis handles it.
-                pass
-
+                return 0
             finally:
-                # 2.5 Cleanup
-                if segment_files:
-                    self.cleaner.clean_segments(segment_files, status_callback)
+                prog.step_silence()
 
-        # Final progress update to ensure it reaches 100%
-        prog.force_complete() # Use the new method to guarantee 100%
+        if self.workers > 1 and total > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, total), thread_name_prefix="blackframe") as pool:
+                futures = [pool.submit(detect_file, idx, *item) for idx, item in enumerate(gathered)]
+                processed_frames = sum(future.result() for future in futures)
+        else:
+            processed_frames = sum(detect_file(idx, *item) for idx, item in enumerate(gathered))
+
+        prog.force_complete()
+        return processed_frames
+
+    def _scan_file(self, idx, filename, original_file, out_dir, status_callback):
+        """Detect silence periods for one file and estimate the frames they contain."""
+        silence_periods = []
+        estimated_frames = 0
+        try:
+            silence_periods = self.silence_detector.detect(original_file, status_callback)
+
+            # Estimate frame steps (using original video frame rate)
+            if silence_periods:
+                try:
+                    estimated_frames = self._estimate_frames(original_file, silence_periods)
+                except Exception as e:
+                    if status_callback:
+                        status_callback(f"Error estimating frames for {filename}, progress might be less accurate: {str(e)}")
 
+        except Exception as e:
+            if status_callback:
+                status_callback(f"Error pre-scanning silence in {filename}: {str(e)}")
+
+        return {
+            'file_idx': idx,
+            'filename': filename,
+            'original_file': original_file,
+            'out_dir': out_dir,
+            'silence_periods': silence_periods,
+            'estimated_frames': estimated_frames
+        }
+
+    @staticmethod
+    def _estimate_frames(original_file, silence_periods):
+        """Estimate how many sampled frames the silence periods of a file contain."""
+        # Calculate how many frames per second after FRAME_RATE sampling
+        fps = get_media_probe().probe(original_file).fps / config.FRAME_RATE
+
+        estimated_frames = 0
+        for period in silence_periods:
+            duration = period['end'] - period['start']
+            if duration > 0:
+                # Calculate frames in this period using FPS after sampling
+                estimated_frames += int(duration * fps)
+        return estimated_frames
+
+    def _process_files_parallel(self, files_data, total, prog, status_callback):
+        """
+        Run whole files concurrently on a thread pool.
+
+        The heavy lifting happens in ffmpeg subprocesses and OpenCV/NumPy calls,
+        which release the GIL, so threads are enough to keep all cores busy while
+        sharing the same ProgressManager. Each file gets its own preprocessor,
+        analyzer and temporary directory so workers never touch each other's segments.
+        """
+        workers = min(self.workers, len(files_data))
         if status_callback:
-            status_callback("Silent black frame detection complete!")
-            
-        return processed_frames_total_counter # Return actual frames processed
-        
+            status_callback(f"Processing {len(files_data)} videos with {workers} parallel workers")
+
+        processed_frames = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blackframe") as pool:
+            futures = [
+                pool.submit(self._process_file_isolated, file_data, total, prog, status_callback)
+                for file_data in files_data
+            ]
+            # Collect in submission order so the returned total does not depend on scheduling
+            for file_data, future in zip(files_data, futures):
+                try:
+                    processed_frames += future.result()
+                except Exception as e:
+                    if status_callback:
+                        status_callback(f"An error occurred processing {file_data['filename']}: {str(e)}")
+        return processed_frames
+
+    def _process_file_isolated(self, file_data, total, prog, status_callback):
+        """Process one file with private components and a private temp directory."""
+        # Silence detection step (already done, just update progress)
+        prog.step_silence()
+        work_dir = tempfile.mkdtemp(prefix=f".combreak_{file_data['file_idx']}_", dir=file_data['out_dir'])
+        try:
+            return self._process_file(
+                file_data, total, prog, status_callback,
+                VideoPreprocessor(), BlackFrameAnalyzer(), work_dir
+            )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _process_file(
+        self, file_data, total, prog, status_callback,
+        preprocessor, blackframe_analyzer, work_dir=None
+    ):
+        """
+        Downscale, analyze, reduce and write the timestamps for a single file.
+
+        Errors are contained to the file so one bad video never stops the batch.
+
+        Returns:
+            int: Number of frames processed (or accounted for) in this file
+        """
+        segment_files = []
+        processed_frames_in_file = 0
+        try:
+            segment_files = self._extract_segments(
+                file_data, total, prog, status_callback, preprocessor, work_dir
+            )
+            processed_frames_in_file = self._analyze_and_write(
+                file_data, segment_files, prog, status_callback, blackframe_analyzer
+            )
+        except Exception as e:
+            # General error handling for the file
+            if status_callback:
+                status_callback(f"An error occurred processing {file_data['filename']}, skipping remaining steps for this file: {str(e)}")
+            # Downscale steps are settled in _extract_segments
+            # Frame steps are settled in _analyze_and_write
+
+        finally:
+            # Cleanup
+            self._cleanup(segment_files, status_callback)
+
+        return processed_frames_in_file
+
+    def _cleanup(self, segment_files, status_callback):
+        """Delete temporary segment files; in-memory decodes leave nothing on disk."""
+        if segment_files and not isinstance(segment_files, DecodedFrames):
+            self.cleaner.clean_segments(segment_files, status_callback)
+
+    def _extract_segments(self, file_data, total, prog, status_callback, preprocessor, work_dir=None):
+        """
+        Downscale the silent segments of one file.
+
+        Returns a list of segment files, or DecodedFrames when decode_mode is "stream".
+        Raises after settling the remaining downscale steps if extraction fails,
+        so the caller skips analysis for this file.
+        """
+        idx = file_data['file_idx']
+        filename = file_data['filename']
+        silence_periods = file_data['silence_periods']
+
+        if status_callback:
+            status_callback(f"Processing video {idx+1}/{total}: {filename}")
+
+        if not silence_periods:
+            # No downscale steps expected or taken
+            if status_callback:
+                status_callback(f"No silence periods found for {filename}, skipping downscale/analysis.")
+            return []
+
+        # Count downscale steps taken for this file so an error can settle the rest
+        downscales_done_for_this_file = 0
+
+        def step_downscale():
+            nonlocal downscales_done_for_this_file
+            downscales_done_for_this_file += 1
+            prog.step_downscale()
+
+        try:
+            if self.decode_mode == 'stream':
+                return preprocessor.decode_segments(
+                    file_data['original_file'], silence_periods, idx, total,
+                    status_callback, step_downscale
+                )
+            return preprocessor.preprocess_segments(
+                file_data['original_file'], work_dir or file_data['out_dir'], silence_periods, idx, total,
+                status_callback, 
+                step_downscale # Pass the specific downscale step function
+            )
+        except Exception as e:
+            if status_callback:
+                status_callback(f"Error during segmented downscaling for {filename}: {str(e)}")
+            # Ensure progress steps for downscaling are accounted for even on error
+            remaining_downscale_steps = max(0, len(silence_periods) - downscales_done_for_this_file)
+            for _ in range(remaining_downscale_steps):
+                 prog.step_downscale()
+            raise # Re-raise to skip analysis for this file
+
+    def _analyze_and_write(self, file_data, segment_files, prog, status_callback, blackframe_analyzer):
+        """
+        Analyze extracted segments, reduce the timestamps and write them out.
+
+        Returns:
+            int: Number of frames processed (or accounted for) in this file
+        """
+        filename = file_data['filename']
+        estimated_frames_for_this_file = file_data['estimated_frames']
+        raw_ts = []
+        processed_frames_in_file = 0
+        # Per-frame brightness for the detection cache; None once the result is known to be partial
+        frame_scores = [] if self._is_complete(file_data, segment_files) else None
+        if segment_files: # Only analyze if segments were successfully created
+            try:
+                # Pass 0 as offset, function returns count for this call
+                if isinstance(segment_files, DecodedFrames):
+                    raw_ts, processed_frames_in_file = blackframe_analyzer.analyze_frames(
+                        segment_files,
+                        status_callback,
+                        prog.step_frame,
+                        0,
+                        estimated_frames_for_this_file,
+                        frame_scores
+                    )
+                else:
+                    raw_ts, processed_frames_in_file = blackframe_analyzer.analyze_segments(
+                        segment_files,
+                        status_callback, 
+                        prog.step_frame, # Pass the specific frame step function
+                        0, 
+                        estimated_frames_for_this_file, # Pass estimate for context
+                        frame_scores
+                    )
+            except Exception as e:
+                frame_scores = None
+                if status_callback:
+                    status_callback(f"Error during frame analysis for {filename}: {str(e)}")
+                # Ensure progress steps for frames are accounted for
+                remaining_frame_steps = max(0, estimated_frames_for_this_file - processed_frames_in_file)
+                if status_callback:
+                    status_callback(f"Accounting for {remaining_frame_steps} estimated remaining frames in progress.")
+                for _ in range(remaining_frame_steps):
+                    prog.step_frame()
+                processed_frames_in_file += remaining_frame_steps # Add to total count
+
+        # Reduction & write
+        final_ts = self.reducer.reduce(raw_ts)
+        self._write_timestamps(filename, file_data['out_dir'], final_ts, status_callback)
+
+        # A file without silence periods is not cached: the silence scan reports
+        # failures as "no silence", and caching that would hide the file for good
+        if frame_scores is not None and file_data['silence_periods']:
+            self.cache.store(file_data['original_file'], file_data['silence_periods'], frame_scores, status_callback)
+        return processed_frames_in_file
+
+    @staticmethod
+    def _is_complete(file_data, segment_files):
+        """True when every non-empty silence period made it through extraction."""
+        if isinstance(segment_files, DecodedFrames):
+            return True
+        expected = sum(1 for p in file_data['silence_periods'] if p['end'] - p['start'] > 0)
+        return len(segment_files or []) == expected
+
     def _write_timestamps(self, filename, output_dir, timestamps, status_callback):
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         ts_file = Path(output_dir) / f"{filename}.txt"
@@ -325,13 +628,12 @@ class VideoFileGatherer:
         file_counter, unprocessed_files_manager,
         status_callback, progress_callback
     ):
-        files = unprocessed_files_manager.get_files()
+        files = list(unprocessed_files_manager.iter_files())
         total_videos = len(files)
         if status_callback:
             status_callback(f"Processing {total_videos} files for black frame detection")
         gathered = []
-        for video_file in files:
-            original, dirpath, filename = video_file.values()
+        for original, dirpath, filename in files:
             if filename.endswith('.txt'):
                 continue
             if self.input_handler.has_input():
@@ -461,6 +763,77 @@ class VideoPreprocessor:
         return segment_files
 
 
+    # Matches ffmpeg showinfo lines, e.g. "n:   3 pts:  90090 pts_time:3.7537 ... s:142x80 ..."
+    _SHOWINFO_RE = re.compile(r"\bn:\s*\d+\s+pts:\s*-?\d+\s+pts_time:(-?[\d.]+).*?\bs:(\d+)x(\d+)")
+
+    def decode_segments(
+        self, original_file, silence_periods, index, total,
+        status_callback, progress_step_downscale=None
+    ):
+        """
+        Decode every silent period of a file in a single ffmpeg call, in memory.
+
+        Each period becomes its own fast-seeking input (-ss/-t) on the same file. The
+        sampled frames are scaled to config.DOWNSCALE_HEIGHT, converted to 8-bit gray
+        and interleaved by timestamp into one rawvideo stream on stdout, which is read
+        directly into a NumPy array. No intermediate files and no x264 encode.
+        -copyts/-start_at_zero keep frame timestamps on the original video timeline,
+        and showinfo reports them (and the frame size) on stderr.
+
+        Returns:
+            DecodedFrames: (uint8 array of shape (N, H, W), float array of N timestamps)
+        """
+        periods = [p for p in silence_periods if p['end'] - p['start'] > 0]
+        if status_callback:
+            status_callback(f"Decoding {len(periods)} silent segments of video {index+1} of {total} in a single pass")
+
+        try:
+            if not periods:
+                return DecodedFrames(np.empty((0, 0, 0), dtype=np.uint8), np.empty(0))
+
+            cmd = [get_executable_path("ffmpeg", config.ffmpeg_path), "-hide_banner", "-nostats",
+                   "-loglevel", "info", "-copyts", "-start_at_zero"]
+            for period in periods:
+                cmd += ["-ss", str(period['start']), "-t", str(period['end'] - period['start']),
+                        "-i", str(original_file)]
+
+            # Keep every FRAME_RATE-th frame of each window, like VideoLoader does
+            chains = [
+                f"[{i}:v:0]select='not(mod(n+1,{config.FRAME_RATE}))',"
+                f"scale=-2:{config.DOWNSCALE_HEIGHT}:flags=neighbor,format=gray[v{i}]"
+                for i in range(len(periods))
+            ]
+            inputs = "".join(f"[v{i}]" for i in range(len(periods)))
+            filtergraph = ";".join(chains) + f";{inputs}interleave=nb_inputs={len(periods)},showinfo[out]"
+            cmd += ["-filter_complex", filtergraph, "-map", "[out]",
+                    "-vsync", "0", "-f", "rawvideo", "-pix_fmt", "gray", "pipe:1"]
+
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stdout, stderr = process.communicate()
+            stderr_str = stderr.decode('utf-8', errors='ignore')
+            if process.returncode != 0:
+                raise RuntimeError(f"ffmpeg exited with code {process.returncode}: {stderr_str[-2000:]}")
+
+            frame_info = self._SHOWINFO_RE.findall(stderr_str)
+            if not frame_info:
+                return DecodedFrames(np.empty((0, 0, 0), dtype=np.uint8), np.empty(0))
+
+            width, height = int(frame_info[0][1]), int(frame_info[0][2])
+            raw = np.frombuffer(stdout, dtype=np.uint8)
+            frame_count = min(len(frame_info), raw.size // (width * height))
+            frames = raw[:frame_count * width * height].reshape(frame_count, height, width)
+            times = np.array([float(info[0]) for info in frame_info[:frame_count]])
+
+            if status_callback:
+                status_callback(f"Decoded {frame_count} frames from {len(periods)} silent segments")
+            return DecodedFrames(frames, times)
+        finally:
+            # One ffmpeg call covers every segment, so settle all segment steps together
+            if progress_step_downscale:
+                for _ in silence_periods:
+                    progress_step_downscale()
+
+
 class SilenceDetector:
     def detect(self, input_file, status_callback):
         sections = FFMpegSilence.detect(input_file, status_callback)
@@ -479,6 +852,97 @@ class SilenceDetector:
         return merged
 
 
+class FFMpegFilterDetector:
+    """
+    Detector backend that does the black frame test inside ffmpeg.
+
+    A single ffmpeg call decodes the file once: the audio goes through silencedetect
+    while every FRAME_RATE-th video frame goes through signalstats at native resolution.
+    A metadata filter keeps only frames whose average luma (YAVG) is below
+    config.BLACK_FRAME_THRESHOLD and prints them, so Python only parses the few black
+    frames instead of touching every frame.
+
+    Frames are converted to full-range YUV before signalstats. Most video is limited
+    range, where black is 16 rather than 0, so YAVG would otherwise never fall below a
+    threshold meant for the 0-255 pixel values BlackFrameAnalyzer averages.
+
+    Results are not stored in the detection cache since only black frames are reported.
+    """
+
+    _SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+    _SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+    _BLACK_FRAME_RE = re.compile(r"\bframe:\s*(\d+)\s+pts:\s*\S+\s+pts_time:(-?[\d.]+)")
+
+    @staticmethod
+    def _probe(input_file):
+        """The cached probe of a file, or None if it can't be probed (ffmpeg then decides)."""
+        try:
+            return get_media_probe().probe(input_file)
+        except Exception:
+            return None
+
+    def build_command(self, input_file):
+        video_chain = (
+            f"[0:v:0]select='not(mod(n+1,{config.FRAME_RATE}))',scale=out_range=full,format=yuvj420p,signalstats,"
+            f"metadata=mode=select:key=lavfi.signalstats.YAVG:value={config.BLACK_FRAME_THRESHOLD}:function=less,"
+            f"metadata=mode=print[v]"
+        )
+        audio_chain = (
+            f"[0:a:0]aresample=8000,"
+            f"silencedetect=n={config.DECIBEL_THRESHOLD}dB:d={config.SILENCE_DURATION}[a]"
+        )
+        return [
+            get_executable_path("ffmpeg", config.ffmpeg_path),
+            "-hide_banner", "-nostats", "-loglevel", "info",
+            "-threads", "0",
+            "-i", str(input_file),
+            "-filter_complex", f"{video_chain};{audio_chain}",
+            "-map", "[v]", "-map", "[a]",
+            "-f", "null", "-"
+        ]
+
+    def detect(self, input_file, status_callback=None):
+        """
+        Detect silence periods and black frames in one pass.
+
+        Returns:
+            tuple: (merged silence periods, black frame timestamps inside silence, frames sampled)
+        """
+        if not Path(input_file).is_file():
+            return [], [], 0
+        info = self._probe(input_file)
+        if info is not None and not info.audio_streams:
+            # The graph needs [0:a:0]; without audio there is no silence, so no silent black frames either
+            if status_callback:
+                status_callback(f"No audio stream in {Path(input_file).name}, no silence to detect")
+            return [], [], 0
+
+        process = subprocess.Popen(self.build_command(input_file), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        _, stderr = process.communicate()
+        stderr_str = stderr.decode('utf-8', errors='ignore')
+        if process.returncode != 0:
+            raise RuntimeError(f"FFmpeg filter detection failed: {stderr_str[-2000:]}")
+
+        starts = [float(m) for m in self._SILENCE_START_RE.findall(stderr_str)]
+        ends = [float(m) for m in self._SILENCE_END_RE.findall(stderr_str)]
+        if len(starts) > len(ends) and status_callback:
+            status_callback(f"Warning: Missing silence end time for start time {starts[-1]} in file {input_file}")
+        silence_periods = SilenceDetector()._merge(
+            [{'start': start, 'end': end} for start, end in zip(starts, ends)]
+        )
+
+        black_times = sorted(float(t) for _, t in self._BLACK_FRAME_RE.findall(stderr_str))
+        # Keep black frames that fall inside a silence period, as BlackFrameAnalyzer.analyze does
+        flat_ts = [t for p in silence_periods for t in (p['start'], p['end'])]
+        timestamps = [t for t in black_times if bisect_left(flat_ts, t) % 2 == 1]
+
+        if status_callback:
+            status_callback(f"Found {len(silence_periods)} silence periods and {len(timestamps)} silent black frames in {Path(input_file).name}")
+        # select keeps frames FRAME_RATE-1, 2*FRAME_RATE-1, ...; only black ones reach the output, so count from the probe
+        sampled_frames = info.frame_count // config.FRAME_RATE if info is not None else 0
+        return silence_periods, timestamps, sampled_frames
+
+
 class FFMpegSilence:
     @staticmethod
     def detect(input_file, status_callback=None):
@@ -521,6 +985,32 @@ class FFMpegSilence:
 
 
 class BlackFrameAnalyzer:
+    def __init__(self, batch_size=None):
+        # Frames scored per vectorized call; 1 keeps the original frame-by-frame loop
+        self.batch_size = max(1, int(batch_size if batch_size is not None else getattr(config, 'ANALYSIS_BATCH_SIZE', 256)))
+
+    @staticmethod
+    def score_frames(frames):
+        """Mean brightness of each frame in an (N, H, W) or (N, H, W, C) stack, in one call."""
+        frames = np.asarray(frames)
+        return frames.reshape(len(frames), -1).mean(axis=1)
+
+    def _score_batch(self, batch, indices, fps, start_time, end_time, progress_step, scores=None):
+        """
+        Score a batch of sampled segment frames and return the black frame timestamps.
+
+        Timestamps are derived from each frame's decode index and the segment fps
+        rather than queried from the capture for every frame.
+        """
+        means = self.score_frames(np.stack(batch))
+        times = start_time + (np.asarray(indices) - 1) / fps
+        # Clamp to the segment so rounding never moves a frame outside its silence period
+        times = np.clip(times, start_time, end_time)
+        if scores is not None:
+            scores.extend(zip(times.tolist(), means.tolist()))
+        progress_step(len(batch))
+        return times[means < config.BLACK_FRAME_THRESHOLD].tolist()
+
     def analyze(
         self, video_loader, silence_periods,
         status_callback, progress_step,
@@ -547,7 +1037,7 @@ class BlackFrameAnalyzer:
     def analyze_segments(
         self, segment_files, 
         status_callback, progress_step,
-        processed_frames, total_frames
+        processed_frames, total_frames, scores=None
     ):
         """
         Analyze multiple downscaled video segments for black frames.
@@ -558,6 +1048,7 @@ class BlackFrameAnalyzer:
             progress_step: Function to increment progress bar
             processed_frames: Counter of frames processed so far
             total_frames: Total frames to process (for progress calculation)
+            scores: Optional list that receives (time, mean brightness) for every analyzed frame
             
         Returns:
             tuple: (list of detected black frame timestamps, count of processed frames)
@@ -618,7 +1109,26 @@ class BlackFrameAnalyzer:
             loader = None
             try:
                 loader = VideoLoader(segment_path)
-                
+                fps = loader.cap.get(cv2.CAP_PROP_FPS)
+
+                if self.batch_size > 1 and fps > 0:
+                    batch, indices = [], []
+                    for frame in loader:
+                        batch.append(frame)
+                        indices.append(loader.frame_count)
+                        if len(batch) == self.batch_size:
+                            timestamps.extend(self._score_batch(
+                                batch, indices, fps, segment_start_time, segment_end_time, progress_step, scores
+                            ))
+                            processed_frames += len(batch)
+                            batch, indices = [], []
+                    if batch:
+                        timestamps.extend(self._score_batch(
+                            batch, indices, fps, segment_start_time, segment_end_time, progress_step, scores
+                        ))
+                        processed_frames += len(batch)
+                    continue
+
                 for frame in loader:
                     # Get time within the segment
                     frame_time_in_segment = loader.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
@@ -635,7 +1145,10 @@ class BlackFrameAnalyzer:
                         actual_frame_time = max(segment_start_time, min(actual_frame_time, segment_end_time))
                     
                     # Check if this is a black frame
-                    if np.mean(np.asarray(frame)) < config.BLACK_FRAME_THRESHOLD:
+                    frame_mean = np.mean(np.asarray(frame))
+                    if scores is not None:
+                        scores.append((actual_frame_time, float(frame_mean)))
+                    if frame_mean < config.BLACK_FRAME_THRESHOLD:
                         timestamps.append(actual_frame_time)
                     
                     # Update progress
@@ -663,6 +1176,48 @@ class BlackFrameAnalyzer:
         
         return timestamps, processed_frames
 
+    def analyze_frames(
+        self, decoded,
+        status_callback, progress_step,
+        processed_frames, total_frames, scores=None
+    ):
+        """
+        Analyze frames decoded in memory by VideoPreprocessor.decode_segments.
+
+        Args:
+            decoded: DecodedFrames holding grayscale frames and their original-video timestamps
+            status_callback: Function to report status messages
+            progress_step: Function to increment progress bar
+            processed_frames: Counter of frames processed so far
+            total_frames: Total frames to process (for progress calculation)
+            scores: Optional list that receives (time, mean brightness) for every analyzed frame
+
+        Returns:
+            tuple: (list of detected black frame timestamps, count of processed frames)
+        """
+        timestamps = []
+        if len(decoded.frames) == 0:
+            if status_callback:
+                status_callback("No frames to analyze.")
+            return timestamps, processed_frames
+
+        if status_callback:
+            status_callback(f"Analyzing {len(decoded.frames)} decoded frames")
+
+        # Score whole batches at once and report progress once per batch
+        for begin in range(0, len(decoded.frames), self.batch_size):
+            frames = decoded.frames[begin:begin + self.batch_size]
+            times = decoded.times[begin:begin + self.batch_size]
+            means = self.score_frames(frames)
+            if scores is not None:
+                scores.extend(zip(times.tolist(), means.tolist()))
+            timestamps.extend(times[means < config.BLACK_FRAME_THRESHOLD].tolist())
+            processed_frames += len(frames)
+            progress_step(len(frames))
+
+        timestamps.sort()
+        return timestamps, processed_frames
+
 
 class TimestampReducer:
     @staticmethod
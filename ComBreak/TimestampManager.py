@@ -126,15 +126,9 @@ class TimestampManager:
                         status_callback(f"Error reading {plex_file_path}: {e}")
                     continue # Skip this plex file if error reading
 
-                # Check each file currently in the unprocessed manager against the plex data
-                # Iterate over a copy of the list as we might modify it
-                for video_file in list(unprocessed_files_manager.get_files()):
-                    original_file, dirpath, filename = video_file.values()
-
-                    # Only process files that belong to the current directory being checked
-                    if str(Path(original_file).parent) != base_path_str:
-                        continue
-
+                # Check the unprocessed files in this directory against the plex data
+                # Iterate over a copy of the directory's files as we might modify them
+                for original_file, dirpath, filename in list(unprocessed_files_manager.iter_files(dirpath=base_path_str)):
                     if filename in plex_data:
                         try:
                             output_dir = self.input_handler.get_output_path_for_file(original_file, output_path)
@@ -177,10 +171,8 @@ class TimestampManager:
                     status_callback(f"Error reading {plex_file_path}: {e}")
                 return # Stop if error reading the main plex file
 
-            # Iterate over a copy of the list as we might modify it
-            for video_file in list(unprocessed_files_manager.get_files()):
-                original_file, dirpath, filename = video_file.values()
-
+            # Iterate over a copy of the files as we might modify them
+            for original_file, dirpath, filename in list(unprocessed_files_manager.iter_files()):
                 if filename in plex_data:
                     try:
                         output_dir = Path(output_path) / Path(dirpath).relative_to(input_path)
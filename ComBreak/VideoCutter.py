@@ -1,14 +1,23 @@
 import os
-from pathlib import Path
+import shutil
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 import config
 from ComBreak.utils import get_executable_path
+from ComBreak.KeyframeIndex import KeyframeIndex
+from ComBreak.MediaProbe import get_media_probe
 
 class VideoCutter:
+    # Audio codecs that can be stream-copied into the .mp4 parts
+    MP4_AUDIO_CODECS = {"aac", "mp3", "ac3", "eac3", "alac"}
+
     def __init__(self, input_handler, virtual_cut):
         self.input_handler = input_handler
         self.virtual_cut = virtual_cut
-        self.video_durations = {}
+        self.keyframe_index = KeyframeIndex()
 
     # ------------------ Cutting Videos Methods ------------------
     @staticmethod
@@ -70,40 +79,81 @@ class VideoCutter:
             # No renaming needed in cutless mode as files aren't created
             return # Exit early as no physical cutting or renaming is done
 
-        failed_videos = []
-
-        for i, (input_file, output_file_prefix) in enumerate(video_files_data):
-            try:
-                if status_callback:
-                    status_callback(f"Cutting video {i+1} of {total_videos}")
-
-                if not Path(input_file).exists():
-                    failed_videos.append(input_file)
-                    continue
-
-                with open(f"{output_file_prefix}.txt", "r") as f:
-                    timestamps = [float(line.strip()) for line in f]
-                # Timestamps are already reduced during detection, no need to reduce again
-
-                end_time = self.get_video_duration(input_file)
-                self.cut_single_video(input_file, output_file_prefix, end_time, timestamps, destructive_mode)
+        jobs = max(1, int(getattr(config, 'CUT_JOBS', 1)))
+        failed_videos = {}
+        audio_modes = {}
+        completed = 0
 
+        # Jobs finish out of order, so progress counts completions and failures keep their input position
+        with ThreadPoolExecutor(max_workers=min(jobs, total_videos or 1), thread_name_prefix="cutter") as pool:
+            futures = {
+                pool.submit(self._cut_job, i, total_videos, input_file, output_file_prefix, destructive_mode, status_callback): (i, input_file)
+                for i, (input_file, output_file_prefix) in enumerate(video_files_data)
+            }
+            for future in as_completed(futures):
+                i, input_file = futures[future]
+                try:
+                    audio_modes[i] = future.result()
+                except Exception as e:
+                    if status_callback:
+                        status_callback(f"Error cutting video: {e}")
+                    failed_videos[i] = input_file
+                completed += 1
                 if progress_callback:
-                    progress_callback(i + 1, total_videos)
-            except Exception as e:
-                if status_callback:
-                    status_callback(f"Error cutting video: {e}")
-                failed_videos.append(input_file)
+                    progress_callback(completed, total_videos)
+
+        if status_callback and audio_modes:
+            copied = sum(1 for mode in audio_modes.values() if mode == "copy")
+            status_callback(f"Audio stream-copied for {copied} of {len(audio_modes)} cut videos, re-encoded for {len(audio_modes) - copied}")
 
         if failed_videos:
             # Write failed videos to a file in the output directory instead of input directory
             with open(Path(output_path, "failedtocut.txt"), "w") as f:
-                for video in failed_videos:
-                    f.write(str(video) + "\n")
+                for i in sorted(failed_videos):
+                    f.write(str(failed_videos[i]) + "\n")
 
         for output_dir in output_dirs:
             self.rename_files(output_dir)
 
+    def _cut_job(self, i, total_videos, input_file, output_file_prefix, destructive_mode, status_callback=None):
+        """Cut one video and return the audio mode used; raises on any failure so the caller can record it."""
+        if status_callback:
+            status_callback(f"Cutting video {i+1} of {total_videos}")
+
+        if not Path(input_file).exists():
+            raise FileNotFoundError(f"Input file not found: {input_file}")
+
+        with open(f"{output_file_prefix}.txt", "r") as f:
+            timestamps = [float(line.strip()) for line in f]
+        # Timestamps are already reduced during detection, no need to reduce again
+        # Split exactly where the video stream copy will, matching the cutless metadata
+        timestamps = self.keyframe_index.snap(input_file, timestamps, status_callback)
+
+        end_time = self.get_video_duration(input_file)
+        start = time.perf_counter()
+        audio_mode = self.cut_single_video(input_file, output_file_prefix, end_time, timestamps, destructive_mode, status_callback)
+        if status_callback:
+            status_callback(f"Cut {Path(input_file).name} in {time.perf_counter() - start:.1f}s (audio: {audio_mode})")
+        return audio_mode
+
+    def choose_audio_codec(self, input_file):
+        """
+        Decide how to write the audio of the cut parts.
+
+        Returns "copy" when config.CUT_AUDIO_MODE allows it and every audio stream in
+        the source can go into an .mp4 as-is, otherwise "aac" (re-encode).
+        """
+        mode = getattr(config, 'CUT_AUDIO_MODE', 'auto')
+        if mode == "aac":
+            return "aac"
+        try:
+            codecs = {stream.get('codec_name') for stream in get_media_probe().probe(input_file).audio_streams}
+        except Exception:
+            return "aac"
+        if codecs and codecs <= self.MP4_AUDIO_CODECS:
+            return "copy"
+        return "aac"
+
     def gather_video_files_to_cut_enhanced(self, output_path):
         """
         Gather video files to cut using the enhanced input handler.
@@ -153,49 +203,63 @@ class VideoCutter:
 
         return video_files_data, output_dirs, total_videos
 
-    def cut_single_video(self, input_file, output_file_prefix, end_time, timestamps, destructive_mode):
-        timestamps.append(end_time)
-        times_str = ','.join(str(t) for t in timestamps)
+    def cut_single_video(self, input_file, output_file_prefix, end_time, timestamps, destructive_mode, status_callback=None):
+        """Cut one video into parts and return the audio mode used ("copy" or "aac")."""
+        times_str = ','.join(str(t) for t in [*timestamps, end_time])
 
         output_file_prefix_path = Path(output_file_prefix)
         output_file_name_without_ext = output_file_prefix_path.stem
         output_dir = output_file_prefix_path.parent
 
-        command = [
-            get_executable_path("ffmpeg", config.ffmpeg_path),
-            "-i", str(input_file),
-            "-f", "segment",
-            "-nostats",
-            "-loglevel", "quiet",  # Suppress FFmpeg output
-            "-segment_times", times_str,
-            "-reset_timestamps", "1",
-            "-c:v", "copy",  # Copy the video codec
-            "-c:a", "aac",   # Explicitly set the audio codec to AAC
-            "-threads", "0",
-            f"{str(output_dir / output_file_name_without_ext)} - Part %03d.mp4"
-        ]
-
-        # Start the FFmpeg process
-        process = subprocess.Popen(command)
-        # Wait for process to complete
-        process.communicate()
-        # Explicitly terminate the FFmpeg process
-        process.terminate()
+        timeout = getattr(config, 'CUT_TIMEOUT', 0) or None
+        attempts = 1 + max(0, int(getattr(config, 'CUT_RETRIES', 0)))
+        audio_codec = self.choose_audio_codec(input_file)
+        if audio_codec == "copy":
+            # A failed stream-copy always gets one more attempt, re-encoding to AAC
+            attempts = max(attempts, 2)
+
+        for attempt in range(1, attempts + 1):
+            # Parts are written to a private temp dir and only moved next to the other outputs once ffmpeg succeeded
+            temp_dir = Path(tempfile.mkdtemp(prefix=".combreak_cut_", dir=output_dir))
+            try:
+                command = [
+                    get_executable_path("ffmpeg", config.ffmpeg_path),
+                    "-nostdin",
+                    "-i", str(input_file),
+                    "-f", "segment",
+                    "-nostats",
+                    "-loglevel", "quiet",  # Suppress FFmpeg output
+                    "-segment_times", times_str,
+                    "-reset_timestamps", "1",
+                    "-c:v", "copy",  # Copy the video codec
+                    "-c:a", audio_codec,  # Stream-copy compatible audio, otherwise re-encode to AAC
+                    "-threads", "0",
+                    f"{str(temp_dir / output_file_name_without_ext)} - Part %03d.mp4"
+                ]
+                # run() kills FFmpeg if it exceeds the timeout
+                subprocess.run(command, check=True, timeout=timeout)
+
+                parts = sorted(temp_dir.glob("*.mp4"))
+                if not parts:
+                    raise RuntimeError(f"FFmpeg produced no parts for {input_file}")
+                for part in parts:
+                    # Same filesystem, so each part appears in the output dir atomically
+                    os.replace(part, output_dir / part.name)
+                break
+            except (subprocess.SubprocessError, RuntimeError, OSError) as e:
+                if attempt == attempts:
+                    raise
+                if audio_codec == "copy":
+                    audio_codec = "aac"
+                if status_callback:
+                    status_callback(f"Cutting {Path(input_file).name} failed ({e}), retrying with audio {audio_codec} ({attempt}/{attempts - 1})")
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
 
         if destructive_mode:
             Path(input_file).unlink()
+        return audio_codec
 
     def get_video_duration(self, input_file):
-        end_time = self.video_durations.get(input_file, None)
-        if end_time is None:
-            command = [
-                get_executable_path("ffprobe", config.ffprobe_path),
-                '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                input_file
-            ]
-            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            end_time = float(result.stdout)
-            self.video_durations[input_file] = end_time
-        return end_time
+        # Cached by the shared media probe, which was usually filled during chapter extraction
+        return get_media_probe().probe(input_file).duration
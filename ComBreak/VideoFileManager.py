@@ -4,35 +4,109 @@ VideoFile = namedtuple('VideoFile', ['original_file', 'dirpath', 'filename'])
 
 
 class VideoFilesManager:
+    """
+    Singleton tracking which files still need processing.
+
+    Files are stored in an insertion-ordered dict keyed by the VideoFile tuple, with
+    secondary indexes by directory and by original file, so add, remove and lookups
+    are O(1) regardless of library size.
+    """
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(VideoFilesManager, cls).__new__(cls)
-            cls._instance.video_files = []
+            cls._instance._files = {}
+            cls._instance._by_dir = {}
+            cls._instance._by_original = {}
         return cls._instance
 
+    @staticmethod
+    def _index_add(index, key, video_file):
+        index.setdefault(key, {})[video_file] = None
+
+    @staticmethod
+    def _index_remove(index, key, video_file):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(video_file, None)
+            if not bucket:
+                del index[key]
+
     def add_file(self, original_file, dirpath, filename):
         """Add a file to the manager, but only if it isn't already present."""
-        if any(f.original_file == original_file and f.dirpath == dirpath and f.filename == filename 
-               for f in self.video_files):
-            return
         video_file = VideoFile(original_file, dirpath, filename)
-        self.video_files.append(video_file)
+        if video_file in self._files:
+            return
+        self._files[video_file] = None
+        self._index_add(self._by_dir, dirpath, video_file)
+        self._index_add(self._by_original, original_file, video_file)
 
     def remove_file(self, original_file, dirpath, filename):
-        file_to_remove = next((file for file in self.video_files if
-                               file.original_file == original_file and
-                               file.dirpath == dirpath and
-                               file.filename == filename), None)
-        if file_to_remove:
-            self.video_files.remove(file_to_remove)
+        video_file = VideoFile(original_file, dirpath, filename)
+        if video_file not in self._files:
+            return
+        del self._files[video_file]
+        self._index_remove(self._by_dir, dirpath, video_file)
+        self._index_remove(self._by_original, original_file, video_file)
+
+    def add_files(self, files):
+        """Add many (original_file, dirpath, filename) entries at once."""
+        for original_file, dirpath, filename in files:
+            self.add_file(original_file, dirpath, filename)
+
+    def remove_files(self, files):
+        """Remove many (original_file, dirpath, filename) entries at once."""
+        for original_file, dirpath, filename in files:
+            self.remove_file(original_file, dirpath, filename)
+
+    def iter_files(self, original_file=None, dirpath=None, filename=None):
+        """
+        Yield matching VideoFile tuples without copying the store.
+
+        Uses the original file or directory index when that filter is given. Do not
+        add or remove files while iterating; wrap the call in list() for that.
+        """
+        if original_file is not None:
+            candidates = self._by_original.get(original_file, ())
+        elif dirpath is not None:
+            candidates = self._by_dir.get(dirpath, ())
+        else:
+            candidates = self._files
+        for video_file in candidates:
+            if ((dirpath is None or video_file.dirpath == dirpath) and
+                    (filename is None or video_file.filename == filename)):
+                yield video_file
+
+    def files_in_dir(self, dirpath):
+        """Read-only view of the VideoFile tuples in one directory."""
+        return self._by_dir.get(dirpath, {}).keys()
+
+    def directories(self):
+        """Read-only view of every directory that still has files."""
+        return self._by_dir.keys()
+
+    @property
+    def video_files(self):
+        """Read-only view of every tracked VideoFile, in insertion order."""
+        return self._files.keys()
 
     def get_files(self, original_file=None, dirpath=None, filename=None):
-        return [file._asdict() for file in self.video_files if
-                (original_file is None or file.original_file == original_file) and
-                (dirpath is None or file.dirpath == dirpath) and
-                (filename is None or file.filename == filename)]
+        return [file._asdict() for file in self.iter_files(original_file, dirpath, filename)]
+
+    def has_file(self, original_file, dirpath, filename):
+        return VideoFile(original_file, dirpath, filename) in self._files
+
+    def __contains__(self, video_file):
+        return tuple(video_file) in self._files
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
 
     def clear_files(self):
-        self.video_files.clear()
+        self._files.clear()
+        self._by_dir.clear()
+        self._by_original.clear()
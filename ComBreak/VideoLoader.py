@@ -3,16 +3,63 @@ import config
 
 
 class VideoLoader:
-    """A class that represents a video loader."""
+    """
+    A class that represents a video loader.
 
-    def __init__(self, video_file):
-        self.cap = cv2.VideoCapture(video_file)
+    Iterating yields every config.FRAME_RATE-th frame. How the frames in between
+    are skipped depends on the sample mode:
+        "read": decode and convert every frame, discarding the unused ones (original behaviour)
+        "grab": grab() the skipped frames and only retrieve() the sampled ones, so the
+                colour conversion and copy happen only for frames that are returned
+        "seek": jump straight to the next sampled frame; cheapest for sparse sampling
+                of long-GOP files, slower than "grab" when samples are close together
+    """
+
+    SAMPLE_MODES = ("read", "grab", "seek")
+
+    def __init__(self, video_file, sample_mode=None, decode_threads=None):
+        self.sample_mode = sample_mode or getattr(config, 'VIDEO_SAMPLE_MODE', 'grab')
+        if self.sample_mode not in self.SAMPLE_MODES:
+            raise ValueError(f"Unknown sample mode '{self.sample_mode}', expected one of {self.SAMPLE_MODES}")
+        self.decode_threads = decode_threads if decode_threads is not None else getattr(config, 'DECODER_THREADS', 0)
+        self.cap = self._open(video_file, self.decode_threads)
         self.frame_count = 0
 
+    @staticmethod
+    def _open(video_file, decode_threads):
+        """Open a capture, passing the decoder thread count when this OpenCV build supports it."""
+        if decode_threads and hasattr(cv2, 'CAP_PROP_N_THREADS'):
+            try:
+                return cv2.VideoCapture(video_file, cv2.CAP_ANY, [cv2.CAP_PROP_N_THREADS, int(decode_threads)])
+            except (TypeError, cv2.error):
+                pass  # Older OpenCV without open parameters, fall back to the default decoder setup
+        return cv2.VideoCapture(video_file)
+
     def __iter__(self):
         return self
 
     def __next__(self):
+        if self.sample_mode == "seek":
+            target = self.frame_count + config.FRAME_RATE
+            # CAP_PROP_POS_FRAMES is the 0-based index of the next frame to decode
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, target - 1)
+            ret, frame = self.cap.read()
+            if not ret:
+                raise StopIteration
+            self.frame_count = target
+            return frame
+
+        if self.sample_mode == "grab":
+            while True:
+                if not self.cap.grab():
+                    raise StopIteration
+                self.frame_count += 1
+                if self.frame_count % config.FRAME_RATE == 0:
+                    ret, frame = self.cap.retrieve()
+                    if not ret:
+                        raise StopIteration
+                    return frame
+
         while True:
             ret, frame = self.cap.read()
             if not ret:
@@ -3,14 +3,15 @@ import re
 from pathlib import Path
 import config
 from API.utils import get_db_manager
+from ComBreak.KeyframeIndex import KeyframeIndex
 
 
 
 class VirtualCut:
     def __init__(self):
         """Initialize VirtualCut without needing a duration getter function."""
-        # No need for duration_getter anymore since we don't access original files
-        pass
+        # No need for duration_getter anymore; the original files are only read for their keyframes
+        self.keyframe_index = KeyframeIndex()
 
     def generate_virtual_prep_data(self, video_files_data, total_videos, progress_callback=None, status_callback=None):
             """Generates data for commercial_injector_prep table without physical cutting."""
@@ -61,7 +62,10 @@ class VirtualCut:
                     # Read the timestamps from the file
                     with open(timestamp_file_path, "r") as f:
                         timestamps = [float(line.strip()) for line in f]
-                    
+
+                    # Snap to the keyframes a physical cut would split on, so both modes agree
+                    timestamps = self.keyframe_index.snap(input_file, timestamps, status_callback)
+
                     # All we need to know is how many segments we'll have:
                     # It's the number of timestamps plus 1
                     # Define a generic duration for each segment - not used for actual cutting
@@ -124,31 +128,10 @@ class VirtualCut:
             # Save to commercial_injector_prep table
             try:
                 table_name = 'commercial_injector_prep'
-                result = db_manager.fetchone(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}'")
-                table_exists = bool(result)
-
-                with db_manager.transaction() as conn:
-                    if table_exists:
-                        existing_df = pd.read_sql(f'SELECT * FROM {table_name}', conn)
-                        # Ensure columns match before concatenating
-                        for col in df.columns:
-                            if col not in existing_df.columns:
-                                existing_df[col] = None
-                        for col in existing_df.columns:
-                            if col not in df.columns:
-                                df[col] = None
-                        
-                        combined_df = pd.concat([existing_df, df], ignore_index=True)
-                        # Use FULL_FILE_PATH for deduplication
-                        duplicates = combined_df.duplicated(subset=['FULL_FILE_PATH'], keep='last')
-                        combined_df = combined_df[~duplicates]
-                        combined_df.to_sql(table_name, conn, index=False, if_exists='replace')
-                        if status_callback:
-                            status_callback(f"Updated {table_name} table with {len(combined_df)} entries.")
-                    else:
-                        df.to_sql(table_name, conn, index=False, if_exists='replace')
-                        if status_callback:
-                            status_callback(f"Created {table_name} table with {len(df)} entries.")
+                # Upsert by FULL_FILE_PATH; startTime/endTime columns are added to older tables automatically
+                written = db_manager.upsert_dataframe(table_name, df, ['FULL_FILE_PATH'])
+                if status_callback:
+                    status_callback(f"Updated {table_name} table with {written} entries.")
                 
                 # Set the cutless mode flag in app_data
                 db_manager.execute("INSERT OR REPLACE INTO app_data (key, value) VALUES (?, ?)", ('cutless_mode_used', 'True'))
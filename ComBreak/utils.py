@@ -1,7 +1,10 @@
 import subprocess
+from functools import lru_cache
 import config
 from pathlib import Path
 
+# Resolved once per process: every ffmpeg/ffprobe call used to spawn an extra "-version" check
+@lru_cache(maxsize=None)
 def get_executable_path(executable_name, config_path):
     """Check if an executable is on PATH, otherwise return the path from config."""
     try:
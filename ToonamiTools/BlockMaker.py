@@ -2,6 +2,7 @@ import pandas as pd
 import os
 import re
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.DatabaseSchema import write_table
 from API.utils.ErrorManager import get_error_manager
 import config
 
@@ -146,7 +147,7 @@ class BlockIDCreator:
         print("Saving data to database...")
         try:
             with self.db_manager.transaction() as conn:
-                self.df.to_sql('commercial_injector_final', conn, index=False, if_exists='replace')
+                write_table(self.df, 'commercial_injector_final', conn)
         except Exception as e:
             self.error_manager.send_error_level(
                 source="BlockMaker",
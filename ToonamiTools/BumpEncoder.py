@@ -1,5 +1,6 @@
 import pandas as pd
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.DatabaseSchema import write_table
 from API.utils.ErrorManager import get_error_manager
 from pandas import DataFrame
 from typing import Dict
@@ -170,7 +171,7 @@ class ToonamiEncoder:
         try:
             codes_df = pd.DataFrame(list(self.codes.items()), columns=['Name', 'Code'])
             with self.db_manager.transaction() as conn:
-                codes_df.to_sql('codes', conn, index=False, if_exists='replace')
+                write_table(codes_df, 'codes', conn)
         except Exception as e:
             self.error_manager.send_error_level(
                 source="BumpEncoder",
@@ -209,7 +210,7 @@ class ToonamiEncoder:
                         suggestion="Single-show bumps are used for episode intros. Consider adding some to improve your lineup experience"
                     )
                 else:
-                    singles_df.drop(['sort_ver', 'sort_ns'], axis=1).to_sql('singles_data', conn, index=False, if_exists='replace')
+                    write_table(singles_df.drop(['sort_ver', 'sort_ns'], axis=1), 'singles_data', conn)
                 
                 # Check if we have any multibumps
                 if multibumps_df.empty:
@@ -221,12 +222,12 @@ class ToonamiEncoder:
                         suggestion="Multi-show bumps create smooth transitions between different anime. Consider adding some for a better viewing experience"
                     )
                 else:
-                    multibumps_df.drop(['sort_ver', 'sort_ns'], axis=1).to_sql('multibumps_v8_data', conn, index=False, if_exists='replace')
+                    write_table(multibumps_df.drop(['sort_ver', 'sort_ns'], axis=1), 'multibumps_v8_data', conn)
 
                     # Save version-specific multibump tables
                     for ver in multibumps_df['sort_ver'].unique():
                         multibumps_ver_df = multibumps_df[multibumps_df['sort_ver'] == ver]
-                        multibumps_ver_df.drop(['sort_ver', 'sort_ns'], axis=1).to_sql(f'multibumps_v{ver}_data', conn, index=False, if_exists='replace')
+                        write_table(multibumps_ver_df.drop(['sort_ver', 'sort_ns'], axis=1), f'multibumps_v{ver}_data', conn)
                         
         except Exception as e:
             self.error_manager.send_error_level(
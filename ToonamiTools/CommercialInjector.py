@@ -2,6 +2,7 @@ import pandas as pd
 from itertools import cycle
 import random
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.DatabaseSchema import write_table
 from API.utils.ErrorManager import get_error_manager
 import config
 from .utils import show_name_mapper
@@ -196,7 +197,7 @@ class LineupLogic:
         try:
             df_lineup = pd.DataFrame(rows, columns=['SHOW_NAME_1', 'Season and Episode', 'FULL_FILE_PATH'])
             with self.db_manager.transaction() as conn:
-                df_lineup.to_sql('commercial_injector', conn, index=False, if_exists='replace')
+                write_table(df_lineup, 'commercial_injector', conn)
         except Exception as e:
             self.error_manager.send_error_level(
                 source="CommercialInjector",
@@ -2,7 +2,7 @@ import os
 import re
 import pandas as pd
 import config
-from API.utils import get_db_manager
+from API.utils import get_db_manager, get_library_index
 from API.utils.ErrorManager import get_error_manager
 
 
@@ -47,15 +47,13 @@ class AnimeFileOrganizer:
 
         # Iterate over the files in the directory and all its subdirectories
         try:
-            for dirpath, dirnames, filenames in os.walk(self.anime_dir):
-                for filename in filenames:
-                    if filename.endswith(".mp4"):
-                        if match := re.search(pattern, filename):
-                            show_name = match[1]
-                            season_episode = match[2]
-                            part_number = match[3]
-                            path = os.path.join(dirpath, filename)
-                            data.append([show_name, season_episode, part_number, path])
+            for entry in get_library_index().files(self.anime_dir):
+                if entry.filename.endswith(".mp4"):
+                    if match := re.search(pattern, entry.filename):
+                        show_name = match[1]
+                        season_episode = match[2]
+                        part_number = match[3]
+                        data.append([show_name, season_episode, part_number, entry.path])
         except Exception as e:
             self.error_manager.send_error_level(
                 source="CommercialInjectorPrep",
@@ -94,22 +92,9 @@ class AnimeFileOrganizer:
             )
 
         try:
-            # Check if table exists
-            result = self.db_manager.fetchone(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='commercial_injector_prep'"
-            )
-            table_exists = bool(result)
+            # Upsert by file path so existing parts are updated and new ones appended
+            self.db_manager.upsert_dataframe('commercial_injector_prep', df, ['FULL_FILE_PATH'])
 
-            with self.db_manager.transaction() as conn:
-                if table_exists:
-                    existing_df = pd.read_sql('SELECT * FROM commercial_injector_prep', conn)
-                    combined_df = pd.concat([existing_df, df], ignore_index=True)
-                    duplicates = combined_df.duplicated(subset=['FULL_FILE_PATH'], keep='last')
-                    combined_df = combined_df[~duplicates]
-                    combined_df.to_sql('commercial_injector_prep', conn, index=False, if_exists='replace')
-                else:
-                    df.to_sql('commercial_injector_prep', conn, index=False, if_exists='replace')
-                    
         except Exception as e:
             self.error_manager.send_error_level(
                 source="CommercialInjectorPrep",
@@ -2,6 +2,7 @@ import pandas as pd
 import os
 import re
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.DatabaseSchema import write_table
 from API.utils.ErrorManager import get_error_manager
 import config
 
@@ -246,7 +247,7 @@ class CutlessFinalizer:
                     # Write the result to a new table with _cutless suffix
                     # Always replace if it exists
                     with self.db_manager.transaction() as conn:
-                        merged_df.to_sql(cutless_table_name, conn, if_exists='replace', index=False)
+                        write_table(merged_df, cutless_table_name, conn)
                     print(f"Successfully created table: {cutless_table_name}")
                     successful_tables += 1
 
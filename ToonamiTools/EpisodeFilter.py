@@ -2,6 +2,7 @@ import pandas as pd
 import os
 import shutil
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.DatabaseSchema import write_table
 from API.utils.ErrorManager import get_error_manager
 import config
 
@@ -57,7 +58,7 @@ class FilterAndMove:
             # Write the filtered data back to an database
             try:
                 with self.db_manager.transaction() as conn:
-                    df_filtered.to_sql('lineup_v8_uncut_filtered', conn, index=False, if_exists='replace')
+                    write_table(df_filtered, 'lineup_v8_uncut_filtered', conn)
                 print("Data filtered and saved.")
             except Exception as e:
                 self.error_manager.send_error_level(
@@ -1,5 +1,7 @@
 import os
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.DatabaseSchema import write_table
+from API.utils.LibraryIndex import get_library_index
 from API.utils.ErrorManager import get_error_manager
 import pandas as pd
 import numpy as np
@@ -63,11 +65,7 @@ class FileProcessor:
 
     def process_files(self):
         # Collect all files first
-        full_paths = []
-        for dirpath, dirnames, filenames in os.walk(self.input_dir):
-            for filename in filenames:
-                full_path = os.path.join(dirpath, filename)
-                full_paths.append(full_path)
+        full_paths = [entry.path for entry in get_library_index().files(self.input_dir)]
                 
         if not full_paths:
             self.error_manager.send_error_level(
@@ -111,7 +109,7 @@ class FileProcessor:
 
                 # Write DataFrame back to the database with the new name
                 with self.db_manager.transaction() as conn:
-                    df_input.to_sql(output_name, conn, if_exists='replace', index=False)
+                    write_table(df_input, output_name, conn)
 
                 print(f"Processed {lineup_name} and saved as {output_name}")
                 
@@ -2,22 +2,68 @@ import os
 import pandas as pd
 import re
 import shutil
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from itertools import repeat
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.LibraryIndex import get_library_index
 from API.utils.ErrorManager import get_error_manager
 
 import config
 from .utils import show_name_mapper
 
+# What one pass over a bump filename found. row holds the values of MediaProcessor.columns
+# (None if no known show matched) and coverage is (shows_in_bump, shows_missing) for
+# multi-bumps that match the naming structure.
+BumpAnalysis = namedtuple(
+    'BumpAnalysis',
+    ['base_name', 'cleaned_bump', 'has_multi_keywords', 'keyword_count', 'matches_structure', 'row', 'coverage']
+)
+
+# Value of columns a bump's pattern doesn't have, as DataFrame construction from dicts filled them in
+_MISSING = float('nan')
+
 
 class MediaProcessor:
     def __init__(self, bump_folder):
-        self.keywords = config.keywords
-        self.generic = config.generic_bumps
+        self._init_parser(config.keywords, config.colors)
         self.bump_folder = bump_folder
-        self.columns = ['ORIGINAL_FILE_PATH', 'FULL_FILE_PATH', 'TOONAMI_VERSION', 'PLACEMENT_1', 'SHOW_NAME_1', 'PLACEMENT_2', 'SHOW_NAME_2', 'PLACEMENT_3', 'SHOW_NAME_3', 'PLACEMENT_4', 'AD_VERSION', 'COLOR', 'Status']
-        self.colors = config.colors
         self.db_manager = get_db_manager()
         self.error_manager = get_error_manager()
+        # Stage name -> seconds, filled in by run()
+        self.stage_timings = {}
+
+    @classmethod
+    def parser(cls, keywords, colors):
+        """A MediaProcessor that only parses bump names, without a bump folder, database or error manager."""
+        processor = cls.__new__(cls)
+        processor._init_parser(keywords, colors)
+        return processor
+
+    def _init_parser(self, keywords, colors):
+        self.keywords = keywords
+        self.generic = config.generic_bumps
+        self.columns = ['ORIGINAL_FILE_PATH', 'FULL_FILE_PATH', 'TOONAMI_VERSION', 'PLACEMENT_1', 'SHOW_NAME_1', 'PLACEMENT_2', 'SHOW_NAME_2', 'PLACEMENT_3', 'SHOW_NAME_3', 'PLACEMENT_4', 'AD_VERSION', 'COLOR', 'Status']
+        self.colors = colors
+        # Compiled patterns by (keyword count, show tuple or None), and lowercased show sets
+        self._pattern_cache = {}
+        self._show_tokens = {}
+        # Show names the structure-only match may have split differently from the full show alternation:
+        # a keyword inside a name, or a last name ending in what AD_VERSION or COLOR could take
+        self._inner_keyword = re.compile(rf"(?i)(?:^|\s)(?:{'|'.join(self.keywords)})(?:\s|$)")
+        self._optional_tail = re.compile(rf"(?i)\s(?:\d{{1,2}}|{'|'.join(self.colors)})$")
+
+    @contextmanager
+    def _timed_stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_timings[name] = time.perf_counter() - start
+            print(f"[LineupPrep] {name}: {self.stage_timings[name]:.2f}s")
 
     def generate_dynamic_regex(self, count, shows=None):
         # Create a dynamic part of the regex pattern that matches the show names
@@ -46,12 +92,11 @@ class MediaProcessor:
     def _retrieve_media_files(self, directory):
         media_files = []
         try:
-            for root, dirs, files in os.walk(directory):
-                media_files.extend(
-                    (os.path.basename(file), os.path.join(root, file))
-                    for file in files
-                    if file.endswith(".mkv") or file.endswith(".mp4")
-                )
+            media_files.extend(
+                (entry.filename, entry.path)
+                for entry in get_library_index().files(directory)
+                if entry.filename.endswith(".mkv") or entry.filename.endswith(".mp4")
+            )
         except Exception as e:
             self.error_manager.send_error_level(
                 source="LineupPrep",
@@ -63,24 +108,12 @@ class MediaProcessor:
             raise
         return media_files
 
-    def _save_to_sql(self, df, table_name):
+    def _save_to_sql(self, df, table_name, key_columns):
         print(f"Saving data to {table_name} table...")
         
         try:
-            if self.db_manager.table_exists(table_name):
-                # Read existing data using pandas with the connection
-                with self.db_manager.transaction() as conn:
-                    existing_df = pd.read_sql(f'SELECT * FROM {table_name}', conn)
-                    # Append new data and drop duplicates
-                    combined_df = pd.concat([existing_df, df], ignore_index=True)
-                    duplicates = combined_df.duplicated(keep='last')
-                    combined_df = combined_df[~duplicates]
-                    # Replace the table with updated data
-                    combined_df.to_sql(table_name, conn, if_exists='replace', index=False)
-            else:
-                # Create a new table and insert the data
-                with self.db_manager.transaction() as conn:
-                    df.to_sql(table_name, conn, if_exists='replace', index=False)
+            # Upsert by the key columns so only the new rows are written
+            self.db_manager.upsert_dataframe(table_name, df, key_columns)
 
             print(f"Data saved to {table_name} table.")
             
@@ -127,6 +160,36 @@ class MediaProcessor:
         mapped_bump = show_name_mapper.apply_via_replacement(bump)
         return mapped_bump
 
+    def _compiled_regex(self, count, shows=None):
+        """
+        Return generate_dynamic_regex(count, shows) compiled, building it only once per
+        keyword count and show list.
+        """
+        key = (count, None if shows is None else tuple(shows))
+        pattern = self._pattern_cache.get(key)
+        if pattern is None:
+            pattern = self._pattern_cache[key] = re.compile(self.generate_dynamic_regex(count, shows))
+        return pattern
+
+    def _known_show_tokens(self, shows):
+        """Lowercased show names, for checking the show groups of a structural match."""
+        key = tuple(shows)
+        tokens = self._show_tokens.get(key)
+        if tokens is None:
+            tokens = self._show_tokens[key] = {show.lower() for show in shows}
+        return tokens
+
+    def _match_structure(self, bump):
+        """
+        Map show names in the bump and match it against the structure-only pattern.
+
+        Returns:
+            tuple: (transformed_bump, keyword_count, match or None)
+        """
+        transformed_bump = self._apply_show_name_mapping(bump)
+        count = self.count_keywords(transformed_bump)
+        return transformed_bump, count, self._compiled_regex(count).match(transformed_bump)
+
     def _validate_bump_structure(self, bump):
         """
         Check if bump matches the Toonami naming structure, regardless of show names.
@@ -134,27 +197,47 @@ class MediaProcessor:
         Returns:
             tuple: (matches_structure: bool, is_multi_bump: bool, keyword_count: int)
         """
-        transformed_bump = self._apply_show_name_mapping(bump)
-        count = self.count_keywords(transformed_bump)
-        
-        # Generate regex without show constraints (structure only)
-        self.generate_dynamic_regex(count, shows=None)
-        
-        if re.match(self.regex, transformed_bump):
+        _, count, match = self._match_structure(bump)
+        if match:
             # Check if it's a multi-bump based on the count
             is_multi = count >= 2  # count 2 = "from" bumps, count 3 = "later" bumps
             return True, is_multi, count
         return False, False, count
 
-    def _extract_data_from_pattern(self, bump, shows):
-        # Step 1: Apply the show_name_mapping to the bump
-        transformed_bump = self._apply_show_name_mapping(bump)
+    def _ambiguous_show_split(self, show_names):
+        """
+        Whether the full show alternation could split a bump differently from the
+        structure-only match that captured show_names.
+
+        The structural show groups are greedy, while the full pattern tries the shows
+        in list order and backtracks into the optional groups. So "Naruto From Bleach 2"
+        gives SHOW_NAME_2 "bleach 2" structurally, but "bleach" with AD_VERSION 2 when
+        "bleach" is listed first. Likewise a keyword inside a show name moves the split
+        between SHOW_NAME_1 and PLACEMENT_2.
+        """
+        return (any(self._inner_keyword.search(name) for name in show_names)
+                or bool(show_names and self._optional_tail.search(show_names[-1])))
 
-        # Step 2: Count the keywords and generate the appropriate regex
-        count = self.count_keywords(transformed_bump)
-        self.regex = self.generate_dynamic_regex(count, shows)
+    def _extract_data_from_pattern(self, bump, shows, structure=None):
+        """
+        Match a bump against the pattern for the given shows and return its groups, or None.
 
-        if match := re.match(self.regex, transformed_bump):
+        The structure-only match is tried first: if every show it captured is one of
+        the given shows and the split is unambiguous, its groups are used as they are.
+        Otherwise the bump is matched against the full show alternation. Pass the
+        result of _match_structure as structure to reuse it.
+        """
+        transformed_bump, count, match = structure or self._match_structure(bump)
+
+        if match and count:
+            known_shows = self._known_show_tokens(shows)
+            groups = match.groupdict()
+            show_names = [value for name, value in groups.items() if name.startswith('SHOW_NAME_') and value is not None]
+            if (all(name.lower() in known_shows for name in show_names)
+                    and not self._ambiguous_show_split(show_names)):
+                return groups
+
+        if match := self._compiled_regex(count, shows).match(transformed_bump):
             return match.groupdict()
         else:
             return None
@@ -254,8 +337,118 @@ class MediaProcessor:
         return deduplicated_result
 
     
-    def _analyze_all_multibumps(self, media_files, shows):
+    def _multibump_coverage(self, matched_dict, shows, shows_set):
+        """
+        Split the show names of a multi-bump's structural match into shows found in
+        the library and shows missing from it.
+
+        Returns:
+            tuple: (shows_in_bump, shows_missing)
+        """
+        shows_in_bump = []
+        shows_missing = []
+
+        # Extract each show name and normalize it
+        for col in ['SHOW_NAME_1', 'SHOW_NAME_2', 'SHOW_NAME_3']:
+            if col in matched_dict and matched_dict[col]:
+                # Get the raw show name
+                raw_show = matched_dict[col].strip()
+
+                # Skip if it looks like an episode number
+                if re.match(r'^\d+$', raw_show):
+                    continue
+
+                # Apply full normalization
+                normalized_show = show_name_mapper.map(raw_show, strategy='all')
+                # Clean the show name for matching
+                normalized_show = show_name_mapper.clean(normalized_show, mode='matching')
+
+                # Check if show exists in library
+                if normalized_show in shows_set:
+                    shows_in_bump.append(normalized_show)
+                else:
+                    # Check if it's a partial match (e.g., "soul eater next" -> "soul eater")
+                    for show in shows:
+                        if show in normalized_show or normalized_show in show:
+                            shows_in_bump.append(show)
+                            break
+                    else:
+                        shows_missing.append(normalized_show)
+
+        return tuple(shows_in_bump), tuple(shows_missing)
+
+    def _analyze_bump(self, base_name, full_path, shows, shows_set):
+        """Parse one bump filename for both the bump tables and the multi-bump coverage report."""
+        cleaned_bump = os.path.splitext(base_name)[0].replace('_', ' ')
+
+        # Quick keyword check to identify potential multi-bumps
+        has_multi_keywords = any(keyword in cleaned_bump.lower() for keyword in ['from', 'later', 'up next'])
+
+        # Phase 1: Check if it matches Toonami structure
+        structure = self._match_structure(cleaned_bump)
+        _, keyword_count, match = structure
+        if match is None:
+            # Doesn't match Toonami naming structure at all
+            return BumpAnalysis(base_name, cleaned_bump, has_multi_keywords, keyword_count, False, None, None)
+
+        coverage = None
+        if keyword_count >= 2:
+            coverage = self._multibump_coverage(match.groupdict(), shows, shows_set)
+
+        # Phase 2: Check if it matches with actual shows
+        row = None
+        if matched_data := self._extract_data_from_pattern(cleaned_bump, shows, structure):
+            matched_data['ORIGINAL_FILE_PATH'] = base_name
+            matched_data['FULL_FILE_PATH'] = full_path
+
+            for col in ['SHOW_NAME_1', 'SHOW_NAME_2', 'SHOW_NAME_3']:
+                if col in matched_data and pd.notna(matched_data[col]):
+                    # Map the show name
+                    mapped_name = show_name_mapper.map(matched_data[col], strategy='all')
+                    # Clean it for consistency with database shows
+                    matched_data[col] = show_name_mapper.clean(mapped_name, mode='matching')
+
+            self._set_status(matched_data, shows_set)
+
+            # Explicitly set SHOW_NAME_1 for generic bumps
+            if matched_data['Status'] == 'nice' and matched_data.get('SHOW_NAME_1') is None:
+                for bump in config.generic_bumps:
+                    if re.search(bump, matched_data['ORIGINAL_FILE_PATH'], re.IGNORECASE):
+                        matched_data['SHOW_NAME_1'] = bump
+                        break
+
+            row = tuple(matched_data.get(col, _MISSING) for col in self.columns)
+
+        return BumpAnalysis(base_name, cleaned_bump, has_multi_keywords, keyword_count, True, row, coverage)
+
+    def _analyze_media_files(self, media_files, shows):
+        """
+        Run _analyze_bump over every file, returning the results in the order of media_files.
+
+        With LINEUP_PREP_WORKERS above 1, chunks of LINEUP_PREP_CHUNK_SIZE files are parsed
+        in that many worker processes and merged back in order, so the result doesn't
+        depend on the number of workers.
+        """
+        workers = max(1, int(getattr(config, 'LINEUP_PREP_WORKERS', 1)))
+        chunk_size = max(1, int(getattr(config, 'LINEUP_PREP_CHUNK_SIZE', 2000)))
+        chunks = [media_files[i:i + chunk_size] for i in range(0, len(media_files), chunk_size)]
+
+        if workers > 1 and len(chunks) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                    results = pool.map(analyze_bump_chunk, chunks, repeat(shows), repeat(self.keywords), repeat(self.colors))
+                    return [analysis for chunk in results for analysis in chunk]
+            except (OSError, BrokenProcessPool) as e:
+                print(f"Worker processes unavailable ({e}), analyzing bump names serially.")
+
+        shows_set = set(shows)
+        return [self._analyze_bump(base_name, full_path, shows, shows_set) for base_name, full_path in media_files]
+
+    def _analyze_all_multibumps(self, media_files, shows, analyses=None):
         """Analyze ALL multi-bumps to determine show coverage."""
+        if analyses is None:
+            analyses = self._analyze_media_files(media_files, shows)
+
         analysis = {
             'shows_with_complete_multibumps': set(),
             'shows_with_incomplete_multibumps': set(),
@@ -264,72 +457,29 @@ class MediaProcessor:
             'multibump_details': []
         }
         
-        # First pass: identify all multi-bumps and what shows they reference
-        for base_name, full_path in media_files:
-            cleaned_bump = os.path.splitext(base_name)[0].replace('_', ' ')
-            
-            # Check if it's a multi-bump
-            matches_structure, is_multi_bump, keyword_count = self._validate_bump_structure(cleaned_bump)
-            
-            if is_multi_bump and matches_structure:
-                # Apply show name mapping to the entire bump name
-                transformed_bump = self._apply_show_name_mapping(cleaned_bump)
-                
-                # Generate regex to extract show names
-                self.generate_dynamic_regex(keyword_count, shows=None)
-                
-                if match := re.match(self.regex, transformed_bump):
-                    matched_dict = match.groupdict()
-                    shows_in_bump = []
-                    shows_missing = []
-                    
-                    # Extract each show name and normalize it
-                    for col in ['SHOW_NAME_1', 'SHOW_NAME_2', 'SHOW_NAME_3']:
-                        if col in matched_dict and matched_dict[col]:
-                            # Get the raw show name
-                            raw_show = matched_dict[col].strip()
-                            
-                            # Skip if it looks like an episode number
-                            if re.match(r'^\d+$', raw_show):
-                                continue
-                                
-                            # Apply full normalization
-                            normalized_show = show_name_mapper.map(raw_show, strategy='all')
-                            # Clean the show name for matching
-                            normalized_show = show_name_mapper.clean(normalized_show, mode='matching')
-                            
-                            # Check if show exists in library
-                            if normalized_show in shows:
-                                shows_in_bump.append(normalized_show)
-                            else:
-                                # Check if it's a partial match (e.g., "soul eater next" -> "soul eater")
-                                found = False
-                                for show in shows:
-                                    if show in normalized_show or normalized_show in show:
-                                        shows_in_bump.append(show)
-                                        found = True
-                                        break
-                                
-                                if not found:
-                                    shows_missing.append(normalized_show)
-                                    analysis['shows_referenced_not_in_library'].add(normalized_show)
-                    
-                    # Store details
-                    if shows_in_bump:
-                        analysis['multibump_details'].append({
-                            'filename': base_name,
-                            'shows_in_bump': shows_in_bump,
-                            'shows_missing': shows_missing,
-                            'is_complete': len(shows_missing) == 0
-                        })
-                        
-                        # Update show categories
-                        for show in shows_in_bump:
-                            analysis['shows_without_multibumps'].discard(show)
-                            if len(shows_missing) == 0:
-                                analysis['shows_with_complete_multibumps'].add(show)
-                            else:
-                                analysis['shows_with_incomplete_multibumps'].add(show)
+        # Multi-bumps that match the naming structure carry the shows they reference
+        for bump in analyses:
+            if bump.coverage is None:
+                continue
+            shows_in_bump, shows_missing = bump.coverage
+            analysis['shows_referenced_not_in_library'].update(shows_missing)
+
+            # Store details
+            if shows_in_bump:
+                analysis['multibump_details'].append({
+                    'filename': bump.base_name,
+                    'shows_in_bump': list(shows_in_bump),
+                    'shows_missing': list(shows_missing),
+                    'is_complete': len(shows_missing) == 0
+                })
+
+                # Update show categories
+                for show in shows_in_bump:
+                    analysis['shows_without_multibumps'].discard(show)
+                    if len(shows_missing) == 0:
+                        analysis['shows_with_complete_multibumps'].add(show)
+                    else:
+                        analysis['shows_with_incomplete_multibumps'].add(show)
         
         # Clean up incomplete shows that also have complete bumps
         analysis['shows_with_incomplete_multibumps'] -= analysis['shows_with_complete_multibumps']
@@ -341,8 +491,11 @@ class MediaProcessor:
 
         return analysis
 
-    def _process_data_patterns(self, media_files, shows):
+    def _process_data_patterns(self, media_files, shows, analyses=None):
         """Process bump files and extract structured data."""
+        if analyses is None:
+            analyses = self._analyze_media_files(media_files, shows)
+
         new_df = []
         no_match_df = []
         structure_match_but_no_show = []
@@ -353,57 +506,28 @@ class MediaProcessor:
         multi_bumps_matched_shows = 0
         multi_bumps_with_keywords = 0
         
-        for base_name, full_path in media_files:
-            cleaned_bump = os.path.splitext(base_name)[0].replace('_', ' ')
-            
-            # Quick keyword check to identify potential multi-bumps
-            has_multi_keywords = any(keyword in cleaned_bump.lower() for keyword in ['from', 'later', 'up next'])
-            if has_multi_keywords:
+        for bump in analyses:
+            if bump.has_multi_keywords:
                 multi_bumps_with_keywords += 1
-            
-            # Phase 1: Check if it matches Toonami structure
-            matches_structure, is_multi_bump, keyword_count = self._validate_bump_structure(cleaned_bump)
-            
-            if is_multi_bump:
-                total_multi_bump_files += 1
-                if matches_structure:
-                    multi_bumps_matched_structure += 1
-            
-            if not matches_structure:
+
+            if not bump.matches_structure:
                 # Doesn't match Toonami naming structure at all
-                no_match_df.append((base_name, cleaned_bump))
+                no_match_df.append((bump.base_name, bump.cleaned_bump))
                 continue
-            
-            # Phase 2: Check if it matches with actual shows
-            if matched_data := self._extract_data_from_pattern(cleaned_bump, shows):
-                matched_data['ORIGINAL_FILE_PATH'] = base_name
-                matched_data['FULL_FILE_PATH'] = full_path
-                
+
+            is_multi_bump = bump.keyword_count >= 2  # count 2 = "from" bumps, count 3 = "later" bumps
+            if is_multi_bump:
+                total_multi_bump_files += 1
+                multi_bumps_matched_structure += 1
+
+            if bump.row is not None:
                 # Count multi-bumps that matched shows
                 if is_multi_bump:
                     multi_bumps_matched_shows += 1
-
-                for col in ['SHOW_NAME_1', 'SHOW_NAME_2', 'SHOW_NAME_3']:
-                    if col in matched_data and pd.notna(matched_data[col]):
-                        # Map the show name
-                        mapped_name = show_name_mapper.map(matched_data[col], strategy='all')
-                        # Clean it for consistency with database shows
-                        matched_data[col] = show_name_mapper.clean(mapped_name, mode='matching')
-
-                self._set_status(matched_data, shows)
-
-                # Explicitly set SHOW_NAME_1 for generic bumps
-                if matched_data['Status'] == 'nice' and matched_data.get('SHOW_NAME_1') is None:
-                    for bump in config.generic_bumps:
-                        if re.search(bump, matched_data['ORIGINAL_FILE_PATH'], re.IGNORECASE):
-                            matched_data['SHOW_NAME_1'] = bump
-                            break
-
-                new_df.append(matched_data)
-            else:
+                new_df.append(bump.row)
+            elif is_multi_bump:
                 # Matches structure but not shows
-                if is_multi_bump:
-                    structure_match_but_no_show.append((base_name, cleaned_bump))
+                structure_match_but_no_show.append((bump.base_name, bump.cleaned_bump))
 
         # Store detection results for error messaging
         self.total_multi_bump_files = total_multi_bump_files
@@ -486,7 +610,7 @@ class MediaProcessor:
         status = 'nice'
         
         # Shows are already lowercase, no need to convert
-        shows_set = set(shows)
+        shows_set = shows if isinstance(shows, (set, frozenset)) else set(shows)
 
         # First, handle the case for generic_bumps using the old straightforward approach
         for col in ['SHOW_NAME_1', 'SHOW_NAME_2', 'SHOW_NAME_3']:
@@ -517,6 +641,7 @@ class MediaProcessor:
         return matched_data  # Explicitly return
 
     def run(self):
+        self.stage_timings = {}
         # Check if bump folder exists
         if not os.path.exists(self.bump_folder):
             self.error_manager.send_error_level(
@@ -603,7 +728,8 @@ class MediaProcessor:
 
         try:
             print("Retrieving and processing media files...")
-            media_files = self._retrieve_media_files(self.bump_folder)
+            with self._timed_stage("retrieve bump files"):
+                media_files = self._retrieve_media_files(self.bump_folder)
             initially_found = len(media_files)
             print(f"Initially found {initially_found} media files.")
 
@@ -618,11 +744,17 @@ class MediaProcessor:
                 )
                 raise Exception("No bump files found to process")
             
-            processed_df, no_match_data = self._process_data_patterns(media_files, shows)
+            # One parse per file feeds both the bump tables and the coverage report
+            with self._timed_stage("analyze bump names"):
+                analyses = self._analyze_media_files(media_files, shows)
+
+            with self._timed_stage("build bump tables"):
+                processed_df, no_match_data = self._process_data_patterns(media_files, shows, analyses)
             print(f"Processed into {len(processed_df)} entries.")
             
             # NEW: Analyze all multi-bumps for coverage report
-            multibump_analysis = self._analyze_all_multibumps(media_files, shows)
+            with self._timed_stage("multi-bump coverage"):
+                multibump_analysis = self._analyze_all_multibumps(media_files, shows, analyses)
             
             # Print the analysis
             print("\n" + "="*60)
@@ -825,15 +957,16 @@ class MediaProcessor:
         print("Checking it twice.")
 
         try:
-            print("Saving processed data to SQLite tables...")
-            self._save_to_sql(nice_df, "nice_list")
-            self._save_to_sql(naughty_df, "naughty_list")
-            self._save_to_sql(pd.DataFrame(no_match_data, columns=['ORIGINAL_FILE_PATH', 'CLEANED_BUMP']), "no_match")
-            print("Data saved to SQLite tables.")
+            with self._timed_stage("save tables"):
+                print("Saving processed data to SQLite tables...")
+                self._save_to_sql(nice_df, "nice_list", ['FULL_FILE_PATH'])
+                self._save_to_sql(naughty_df, "naughty_list", ['FULL_FILE_PATH'])
+                self._save_to_sql(pd.DataFrame(no_match_data, columns=['ORIGINAL_FILE_PATH', 'CLEANED_BUMP']), "no_match", ['ORIGINAL_FILE_PATH', 'CLEANED_BUMP'])
+                print("Data saved to SQLite tables.")
 
-            print("Saving additional processed files...")
-            self._save_to_sql(nice_df.drop(columns=['ORIGINAL_FILE_PATH', 'Status']), "lineup_prep_out")
-            print("Additional files saved.")
+                print("Saving additional processed files...")
+                self._save_to_sql(nice_df.drop(columns=['ORIGINAL_FILE_PATH', 'Status']), "lineup_prep_out", ['FULL_FILE_PATH'])
+                print("Additional files saved.")
 
         except Exception as e:
             self.error_manager.send_error_level(
@@ -845,4 +978,28 @@ class MediaProcessor:
             )
             raise
 
+        print("Stage timings: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.stage_timings.items()))
         print("Lineup Preparation Completed Successfully.")
+
+
+# Parse-only MediaProcessors by (keywords, colors), built once per process
+_parsers = {}
+
+
+def analyze_bump_name(base_name, full_path, shows, keywords, colors, shows_set=None):
+    """
+    Parse one bump filename against the known shows and return its BumpAnalysis.
+
+    Module-level so worker processes can run it; it needs no database or error manager.
+    """
+    key = (tuple(keywords), tuple(colors))
+    parser = _parsers.get(key)
+    if parser is None:
+        parser = _parsers[key] = MediaProcessor.parser(keywords, colors)
+    return parser._analyze_bump(base_name, full_path, shows, shows_set if shows_set is not None else set(shows))
+
+
+def analyze_bump_chunk(media_files, shows, keywords, colors):
+    """analyze_bump_name over a list of (base_name, full_path) pairs, in order."""
+    shows_set = set(shows)
+    return [analyze_bump_name(base_name, full_path, shows, keywords, colors, shows_set) for base_name, full_path in media_files]
@@ -1,10 +1,16 @@
 import pandas as pd
 import random
+from bisect import bisect_right
 from API.utils.DatabaseManager import get_db_manager
+from API.utils.DatabaseSchema import write_table
 import re
 import config
 from .utils import show_name_mapper
 
+SCHEDULE_COLUMNS = ["FULL_FILE_PATH", "Code", "BLOCK_ID"]
+# BLOCK_ID of bump rows, matching what pd.concat used to fill in
+_NO_BLOCK = float("nan")
+
 
 class ShowScheduler:
     """
@@ -44,6 +50,13 @@ class ShowScheduler:
         self.decoder = {}
         self.show_episode_blocks = None
 
+        # Episode block index, built by index_episode_blocks()
+        self.show_block_ids = {}        # show -> block IDs in table order
+        self._show_blocks_sorted = {}   # show -> whether its block IDs ascend
+        self._block_positions = {}      # block ID -> row positions in commercial_injector_df
+        self._block_schedule_rows = {}  # block ID -> schedule rows of the block
+        self._block_cursor = {}         # show -> position of the block last handed out
+
         # Configuration toggles
         self.reuse_episode_blocks = reuse_episode_blocks
         self.shows_with_no_more_blocks = set()
@@ -169,6 +182,31 @@ class ShowScheduler:
             self._normalize_show_names()
             self.show_episode_blocks = self._group_shows()
 
+        self.index_episode_blocks()
+
+    def index_episode_blocks(self):
+        """
+        Index commercial_injector_df once so block lookups don't rescan it.
+
+        Builds show -> ordered block IDs and block ID -> rows. Call again whenever
+        commercial_injector_df is replaced.
+        """
+        df = self.commercial_injector_df
+        show_blocks = {}  # show -> insertion-ordered dict used as an ordered set
+        self._block_schedule_rows = {}
+        self._block_cursor = {}
+        for path, block_id, show in zip(df["FULL_FILE_PATH"], df["BLOCK_ID"], df["show_name"]):
+            if pd.isna(block_id):
+                continue
+            self._block_schedule_rows.setdefault(block_id, []).append((path, "", block_id))
+            show_blocks.setdefault(show, {})[block_id] = None
+        self.show_block_ids = {show: list(block_ids) for show, block_ids in show_blocks.items()}
+        self._show_blocks_sorted = {
+            show: all(a < b for a, b in zip(block_ids, block_ids[1:]))
+            for show, block_ids in self.show_block_ids.items()
+        }
+        self._block_positions = df.groupby("BLOCK_ID", sort=False).indices
+
     def _load_codes(self):
         """
         Load the 'codes' table from the DB to decode show codes in
@@ -286,9 +324,19 @@ class ShowScheduler:
         """
         Main method to generate the schedule using the decoded_df, reordering
         blocks, applying optional NS2/NS3 logic, and reusing blocks as necessary.
+
+        Rows are collected as (FULL_FILE_PATH, Code, BLOCK_ID) tuples in a list and
+        the DataFrame is built once at the end, so the cost is linear in the
+        length of the lineup.
         """
         print("Generating schedule...")
-        final_df = pd.DataFrame(columns=["FULL_FILE_PATH", "Code", "BLOCK_ID"])
+        schedule = []
+
+        # Plain lists so neighbouring rows can be looked up without DataFrame indexing
+        paths = self.decoded_df["FULL_FILE_PATH"].tolist()
+        codes = [code or "" for code in self.decoded_df["Code"].tolist()]
+        raw_codes = self.decoded_df["Code"].tolist()
+        show_lists = self.decoded_df["shows"].tolist()
 
         # For tracking certain row states
         last_show_name = None
@@ -296,57 +344,49 @@ class ShowScheduler:
         last_bump_for_show = {}
         skip_first_show = False
 
-        for idx, row in self.decoded_df.iterrows():
-            shows = row["shows"]
-            code_value = row["Code"] or ""
+        for idx, shows in enumerate(show_lists):
+            code_value = codes[idx]
 
             # Detect if we have an NS2->NS3 chain from the previous row
-            skip_first_show = self._detect_ns2_ns3_chain(idx, shows)
+            skip_first_show = self._detect_ns2_ns3_chain(idx, shows, codes, show_lists)
 
             # Check if any show is exhausted, skip if so
-            if self._skip_exhausted_shows(shows, final_df, last_bump_for_show):
+            if self._skip_exhausted_shows(shows, schedule, last_bump_for_show):
                 continue
 
             if "-NS3" in code_value:
                 # Handle an NS3 row
-                final_df, last_show_name = self._handle_ns3_row(
-                    final_df, row, idx, shows, skip_first_show, last_bump_for_show, delete_intro
+                last_show_name = self._handle_ns3_row(
+                    schedule, (paths[idx], raw_codes[idx], _NO_BLOCK), idx, shows, codes, show_lists,
+                    skip_first_show, last_bump_for_show, delete_intro
                 )
                 skip_first_show = False  # Reset after usage
             elif "-NS2" in code_value:
                 # Handle an NS2 row
-                final_df, last_show_name, delete_intro = self._handle_ns2_row(
-                    final_df, row, shows, last_show_name
+                last_show_name, delete_intro = self._handle_ns2_row(
+                    schedule, (paths[idx], raw_codes[idx], _NO_BLOCK), shows, last_show_name
                 )
-            else:
-                # Potentially handle other code or do default append
-                pass
-
-            # Attempt to handle "interweaving" if next row is different
-            final_df = self._attempt_interweave(idx, final_df, last_show_name, shows)
 
         print("Schedule generation complete.")
-        return final_df
+        return pd.DataFrame(schedule, columns=SCHEDULE_COLUMNS)
 
-    def _detect_ns2_ns3_chain(self, idx, current_shows):
+    def _detect_ns2_ns3_chain(self, idx, current_shows, codes, show_lists):
         """
         Check if the current row is an NS3 row following an NS2 row,
         involving the same show. If so, skip the first show from the
         NS3 row's show list.
         """
         if self.apply_ns3_logic and idx > 0:
-            current_code = self.decoded_df.iloc[idx]["Code"] or ""
-            prev_code = self.decoded_df.iloc[idx - 1]["Code"] or ""
-            if ("-NS3" in current_code) and ("-NS2" in prev_code):
-                prev_ns2_show = self.decoded_df.iloc[idx - 1]["shows"][0]
+            if ("-NS3" in codes[idx]) and ("-NS2" in codes[idx - 1]):
+                prev_ns2_show = show_lists[idx - 1][0]
                 current_ns3_show = current_shows[0]
                 return prev_ns2_show == current_ns3_show
         return False
 
-    def _skip_exhausted_shows(self, shows, final_df, last_bump_for_show):
+    def _skip_exhausted_shows(self, shows, schedule, last_bump_for_show):
         """
         If any show in 'shows' is exhausted, skip them.
-        Also remove the last bump for that show from final_df if found.
+        Also remove the last bump for that show from the schedule if found.
         """
         if any(s in self.shows_with_no_more_blocks for s in shows):
             print(f"Skipping bump for show(s) {shows} as episode blocks have run out.")
@@ -355,21 +395,23 @@ class ShowScheduler:
                     last_bump_idx = last_bump_for_show.get(s)
                     if last_bump_idx is not None:
                         print(f"Removing bump for show {s} that just ran out.")
-                        final_df.drop(index=last_bump_idx, inplace=True, errors="ignore")
-                        final_df.reset_index(drop=True, inplace=True)
+                        # Positions are recorded when the block is inserted and are not
+                        # shifted by later removals
+                        if 0 <= last_bump_idx < len(schedule):
+                            del schedule[last_bump_idx]
             return True
         return False
 
-    def _handle_ns3_row(self, final_df, row, idx, shows, skip_first_show, last_bump_for_show, delete_intro):
+    def _handle_ns3_row(self, schedule, ns3_row, idx, shows, codes, show_lists, skip_first_show,
+                        last_bump_for_show, delete_intro):
         """
         Handle an NS3 row, potentially skipping the first show if skip_first_show is True.
         If the next row is also an NS3 with the same tail show, drop the last show
         in the current list. Then insert episodes for the remaining shows in order.
+
+        :return: The last show placed, or None.
         """
-        final_df = pd.concat(
-            [final_df, pd.DataFrame([row[["FULL_FILE_PATH", "Code"]].to_dict()])],
-            ignore_index=True
-        )
+        schedule.append(ns3_row)
 
         # Possibly delete intro for the first inserted show
         if not skip_first_show:
@@ -377,9 +419,9 @@ class ShowScheduler:
 
         # If the next row also has -NS3 and shares a show, skip the last show in this row
         if (
-            idx < len(self.decoded_df) - 1
-            and "-NS3" in (self.decoded_df.iloc[idx + 1]["Code"] or "")
-            and (self.decoded_df.iloc[idx + 1]["shows"][0] == shows[-1])
+            idx < len(codes) - 1
+            and "-NS3" in codes[idx + 1]
+            and (show_lists[idx + 1][0] == shows[-1])
         ):
             shows_to_place = shows[:-1]
         else:
@@ -391,18 +433,17 @@ class ShowScheduler:
 
         # Insert episode blocks
         for show in shows_to_place:
-            final_df, delete_intro = self._insert_episode_block(
-                final_df, show, delete_intro, last_bump_for_show
-            )
+            delete_intro = self._insert_episode_block(schedule, show, delete_intro, last_bump_for_show)
 
-        last_show_name = shows_to_place[-1] if shows_to_place else None
-        return final_df, last_show_name
+        return shows_to_place[-1] if shows_to_place else None
 
-    def _handle_ns2_row(self, final_df, row, shows, last_show_name):
+    def _handle_ns2_row(self, schedule, ns2_row, shows, last_show_name):
         """
-        Handle an NS2 row. If the final schedule's last show differs from
+        Handle an NS2 row. If the schedule's last show differs from
         show_name_2, we first insert show_name_2's block. Then we append the NS2 row
         and insert show_name_1's block (with a possible intro deletion).
+
+        :return: (last_show_name, delete_intro)
         """
         show_name_1, show_name_2 = shows
         delete_intro = False
@@ -411,79 +452,47 @@ class ShowScheduler:
         if last_show_name != show_name_2:
             next_block = self.get_next_episode_block(show_name_2)
             if next_block is not None:
-                block_df = self.commercial_injector_df[
-                    self.commercial_injector_df["BLOCK_ID"] == next_block["BLOCK_ID"]
-                ]
-                final_df = pd.concat(
-                    [final_df, block_df[["FULL_FILE_PATH", "BLOCK_ID"]].assign(Code="")],
-                    ignore_index=True
-                )
+                schedule.extend(self._block_rows(next_block))
                 last_show_name = show_name_2
 
         # Append the NS2 row
-        final_df = pd.concat(
-            [final_df, pd.DataFrame([row[["FULL_FILE_PATH", "Code"]].to_dict()])],
-            ignore_index=True
-        )
+        schedule.append(ns2_row)
 
         # Next block for show_name_1, with possible intro deletion
         delete_intro = True
         next_block = self.get_next_episode_block(show_name_1)
         if next_block is not None:
-            block_df = self.commercial_injector_df[
-                self.commercial_injector_df["BLOCK_ID"] == next_block["BLOCK_ID"]
-            ]
+            block_rows = self._block_rows(next_block)
             if delete_intro:
-                block_df = block_df.iloc[1:]
+                block_rows = block_rows[1:]
                 delete_intro = False
-            final_df = pd.concat(
-                [final_df, block_df[["FULL_FILE_PATH", "BLOCK_ID"]].assign(Code="")],
-                ignore_index=True
-            )
+            schedule.extend(block_rows)
             last_show_name = show_name_1
 
-        return final_df, last_show_name, delete_intro
-
-    def _attempt_interweave(self, idx, final_df, last_show_name, shows):
-        """
-        Attempt to handle "interweaving" if the next row's first show differs
-        from the last_show_name. This logic appends a blank row to final_df in some cases,
-        preserving the original intent of spacing or boundary between transitions.
-        """
-        if idx < len(self.decoded_df) - 1:
-            next_row = self.decoded_df.iloc[idx + 1]
-            next_code = next_row["Code"] or ""
-            next_shows = next_row["shows"]
-            # Insert a break if the upcoming show is different and there's no direct handoff
-            if (
-                next_shows[0] != last_show_name
-                and not (
-                    ("-NS3" in next_code and next_shows[0] == shows[-1])
-                    or ("-NS2" in next_code and last_show_name == next_shows[-1])
-                )
-            ):
-                final_df = pd.concat([final_df], ignore_index=True)
-        return final_df
+        return last_show_name, delete_intro
 
-    def _insert_episode_block(self, final_df, show, delete_intro, last_bump_for_show):
+    def _insert_episode_block(self, schedule, show, delete_intro, last_bump_for_show):
         """
-        Insert the next episode block for 'show' into final_df.
+        Append the next episode block for 'show' to the schedule.
         If delete_intro is True, remove the first row of the block (the intro).
+
+        :return: The updated delete_intro flag.
         """
         next_block = self.get_next_episode_block(show)
         if next_block is not None:
-            block_df = self.commercial_injector_df[
-                self.commercial_injector_df["BLOCK_ID"] == next_block["BLOCK_ID"]
-            ]
-            if delete_intro and not block_df.empty:
-                block_df = block_df.iloc[1:]
+            block_rows = self._block_rows(next_block)
+            if delete_intro and block_rows:
+                block_rows = block_rows[1:]
                 delete_intro = False
-            final_df = pd.concat(
-                [final_df, block_df[["FULL_FILE_PATH", "BLOCK_ID"]].assign(Code="")],
-                ignore_index=True
-            )
-            last_bump_for_show[show] = final_df.index[-1]
-        return final_df, delete_intro
+            schedule.extend(block_rows)
+            last_bump_for_show[show] = len(schedule) - 1
+        return delete_intro
+
+    def _block_rows(self, block_id):
+        """
+        Return the schedule rows (FULL_FILE_PATH, Code, BLOCK_ID) of one episode block.
+        """
+        return self._block_schedule_rows.get(block_id, [])
 
     #####################################################
     #         GETTING & INSERTING EPISODE BLOCKS        #
@@ -491,34 +500,51 @@ class ShowScheduler:
 
     def get_next_episode_block(self, show):
         """
-        Return the next episode block for the specified show, taking
-        into account the last used episode block if continuing. If
+        Return the BLOCK_ID of the next episode block for the specified show,
+        taking into account the last used episode block if continuing. If
         reuse_episode_blocks is True and we've exhausted new blocks,
         start over from the beginning.
+
+        The next block is the first one in table order whose BLOCK_ID sorts after
+        the last used one. A per-show cursor makes this O(1) while the show keeps
+        advancing through its blocks.
         """
-        show_df = self.commercial_injector_df[self.commercial_injector_df["show_name"] == show]
-        if show_df.empty:
+        block_ids = self.show_block_ids.get(show)
+        if not block_ids:
             print(f"Warning: No episode blocks found for show {show}.")
             return None
 
         if show in self.last_used_episode_block:
-            last_block_id = self.last_used_episode_block[show]
-            next_blocks = show_df[show_df["BLOCK_ID"] > last_block_id]
-            if next_blocks.empty:
+            position = self._position_after(show, block_ids, self.last_used_episode_block[show])
+            if position is None:
                 if self.reuse_episode_blocks:
                     print(f"No more new episode blocks for show {show}. Reusing from the beginning.")
-                    next_block = show_df.iloc[0]
+                    position = 0
                 else:
                     print(f"No more new episode blocks for show {show}. Skipping further scheduling.")
                     self.shows_with_no_more_blocks.add(show)
                     return None
-            else:
-                next_block = next_blocks.iloc[0]
         else:
-            next_block = show_df.iloc[0]
+            position = 0
 
-        self.last_used_episode_block[show] = next_block["BLOCK_ID"]
-        return next_block
+        self._block_cursor[show] = position
+        self.last_used_episode_block[show] = block_ids[position]
+        return block_ids[position]
+
+    def _position_after(self, show, block_ids, last_block_id):
+        """
+        Return the position of the first block in block_ids whose ID sorts after
+        last_block_id, or None if there is none.
+        """
+        if self._show_blocks_sorted.get(show):
+            cursor = self._block_cursor.get(show)
+            if cursor is not None and block_ids[cursor] == last_block_id:
+                position = cursor + 1
+            else:
+                # last_block_id was loaded from the DB or set by hand
+                position = bisect_right(block_ids, last_block_id)
+            return position if position < len(block_ids) else None
+        return next((i for i, block_id in enumerate(block_ids) if block_id > last_block_id), None)
 
     def set_reuse_episode_blocks(self, reuse):
         """
@@ -668,9 +694,7 @@ class ShowScheduler:
             selected_show = random.choice(unused_shows_df["show_name"].unique())
             next_block = self.get_next_episode_block(selected_show)
             if next_block is not None:
-                selected_block_df = self.commercial_injector_df[
-                    self.commercial_injector_df["BLOCK_ID"] == next_block["BLOCK_ID"]
-                ]
+                selected_block_df = self.commercial_injector_df.iloc[self._block_positions[next_block]]
                 final_df = pd.concat(
                     [final_df.iloc[:space], selected_block_df, final_df.iloc[space:]],
                     ignore_index=True
@@ -694,7 +718,7 @@ class ShowScheduler:
         """
         print(f"Saving schedule to {save_table}")
         with self.db_manager.transaction() as conn:
-            final_df.to_sql(save_table, conn, index=False, if_exists="replace")
+            write_table(final_df, save_table, conn)
 
     def save_last_used_episode_block(self):
         """
@@ -1,163 +1,420 @@
+import numpy as np
 import pandas as pd
 import random
+from collections import Counter
 import config
-from API.utils import get_db_manager
+from API.utils import get_db_manager, write_table
 from API.utils.ErrorManager import get_error_manager
 
 
+# How a bump joins shows: the show it follows and the show it leads into, by PLACEMENT_2.
+# These mirror the lookups get_next_row makes.
+def bump_endpoints(placement, show_1, show_2, show_3):
+    """Return (entry show, exit show) for a bump; either is None when it can't be chained."""
+    if placement == 'next':
+        entry, exit_ = show_1, show_3
+    elif placement in ('next from', 'from'):
+        entry, exit_ = show_2, show_1
+    else:
+        entry, exit_ = None, show_1
+    return (None if pd.isna(entry) else entry), (None if pd.isna(exit_) else exit_)
+
+
+def column_values(df, column):
+    """A column as a list in table order, with None for missing values (or a missing column)."""
+    if column not in df.columns:
+        return [None] * len(df)
+    return [None if pd.isna(value) else value for value in df[column].tolist()]
+
+
+def table_endpoints(df):
+    """bump_endpoints() for every row of a multibumps table, as two lists in table order."""
+    columns = [column_values(df, column) for column in ('PLACEMENT_2', 'SHOW_NAME_1', 'SHOW_NAME_2', 'SHOW_NAME_3')]
+    endpoints = [bump_endpoints(*values) for values in zip(*columns)]
+    return [entry for entry, _ in endpoints], [exit_ for _, exit_ in endpoints]
+
+
+def count_chain_breaks(order, entries, exits):
+    """Number of neighbouring bumps in order where the first doesn't lead into the second."""
+    return sum(
+        1 for a, b in zip(order, order[1:])
+        if exits[a] is None or exits[a] != entries[b]
+    )
+
+
+class BumpChainSolver:
+    """
+    Orders bumps into as few chains as possible.
+
+    Each bump is an edge in a directed graph of shows, from the show it follows to the
+    show it leads into, and a chain is a trail through that graph. The smallest number
+    of trails that covers every edge of a weakly connected component is the sum of its
+    positive (out - in) degree differences, or 1 if it is balanced. The solver reaches
+    it by linking every unbalanced show to a virtual node until all degrees match,
+    walking one Eulerian circuit with Hierholzer's algorithm and cutting the circuit
+    wherever it passes through the virtual node.
+
+    Adjacency lists are shuffled with a seeded random.Random, so equal seeds give
+    equal orderings and different seeds break ties differently. Runs in O(bumps).
+    """
+
+    _VIRTUAL = object()
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def solve(self, entries, exits):
+        """
+        Order bumps given the entry and exit show of each one.
+
+        Returns:
+            list: Row positions, chain after chain
+        """
+        adjacency = {}
+        balance = {}
+        parent = {}
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        def add_edge(source, target, edge_id):
+            adjacency.setdefault(source, []).append((target, edge_id))
+            adjacency.setdefault(target, [])
+
+        loose = []
+        for position, (entry, exit_) in enumerate(zip(entries, exits)):
+            if entry is None or exit_ is None:
+                # Can't be chained, so it becomes a chain of its own
+                loose.append([position])
+                continue
+            add_edge(entry, exit_, position)
+            balance[entry] = balance.get(entry, 0) + 1
+            balance[exit_] = balance.get(exit_, 0) - 1
+            for node in (entry, exit_):
+                parent.setdefault(node, node)
+            root_a, root_b = find(entry), find(exit_)
+            if root_a != root_b:
+                parent[root_a] = root_b
+
+        # Link the virtual node to every component: surplus starts and ends for
+        # unbalanced shows, one way in and out for components that are already balanced
+        virtual = self._VIRTUAL
+        unbalanced_roots = set()
+        members = {}
+        for node, surplus in balance.items():
+            root = find(node)
+            members.setdefault(root, []).append(node)
+            if surplus > 0:
+                unbalanced_roots.add(root)
+                for _ in range(surplus):
+                    add_edge(virtual, node, None)
+            elif surplus < 0:
+                unbalanced_roots.add(root)
+                for _ in range(-surplus):
+                    add_edge(node, virtual, None)
+        for root, nodes in members.items():
+            if root not in unbalanced_roots:
+                node = self.rng.choice(nodes)
+                add_edge(virtual, node, None)
+                add_edge(node, virtual, None)
+
+        for targets in adjacency.values():
+            self.rng.shuffle(targets)
+
+        chains = [chain for chain in self._split_circuit(self._circuit(adjacency, virtual)) if chain]
+        chains.extend(loose)
+        self.rng.shuffle(chains)
+        return [position for chain in chains for position in chain]
+
+    @staticmethod
+    def _circuit(adjacency, start):
+        """Hierholzer's algorithm: edge IDs of an Eulerian circuit from start, in walking order."""
+        if start not in adjacency:
+            return []
+        stack = [(start, None)]
+        edges = []
+        while stack:
+            node, edge_id = stack[-1]
+            targets = adjacency[node]
+            if targets:
+                stack.append(targets.pop())
+            else:
+                stack.pop()
+                edges.append(edge_id)
+        edges.reverse()
+        return edges[1:]  # The first entry is the start marker, not an edge
+
+    @staticmethod
+    def _split_circuit(edges):
+        """Cut the circuit at every virtual edge (None), yielding the real edge IDs in between."""
+        chain = []
+        for edge_id in edges:
+            if edge_id is None:
+                yield chain
+                chain = []
+            else:
+                chain.append(edge_id)
+        yield chain
+
+
+# Show ID of a missing show name
+NO_SHOW = -1
+
+
+class RecentShows:
+    """Ring buffer of the IDs of the last few shows a bump led into."""
+
+    EMPTY = -2  # Matches no show, not even NO_SHOW
+
+    def __init__(self, size=5):
+        self.ids = np.full(size, self.EMPTY, dtype=np.int64)
+        self._next = 0
+
+    def add(self, show_id):
+        # NO_SHOW takes a slot too, like the None the old list recorded, and matches rows missing that show
+        self.ids[self._next] = show_id
+        self._next = (self._next + 1) % len(self.ids)
+
+
+class UnusedBumps:
+    """
+    The rows of a multibumps table that haven't been placed yet, by row position.
+
+    Rows are indexed by PLACEMENT_2 together with SHOW_NAME_1 or SHOW_NAME_2, and by
+    SHOW_NAME_1 alone, so every lookup get_next_row makes is a dict access instead of
+    a scan of the table. Buckets keep table order, so candidates come out in the order
+    filtering the table would have returned them. SHOW_NAME_1 and SHOW_NAME_2 are also
+    kept as NumPy arrays of show IDs for weighted_selection.
+    """
+
+    def __init__(self, df, show_id):
+        """
+        :param df: The multibumps table.
+        :param show_id: Callable mapping a show name (or None) to an integer ID.
+        """
+        self.placement = column_values(df, 'PLACEMENT_2')
+        self.show_1 = column_values(df, 'SHOW_NAME_1')
+        self.show_2 = column_values(df, 'SHOW_NAME_2')
+        self.show_3 = column_values(df, 'SHOW_NAME_3')
+        self.show_1_ids = np.array([show_id(show) for show in self.show_1], dtype=np.int64)
+        self.show_2_ids = np.array([show_id(show) for show in self.show_2], dtype=np.int64)
+
+        self._positions = list(range(len(df)))  # unused positions, for O(1) random picks
+        self._slots = list(range(len(df)))      # position -> index in _positions
+        self._by_show_1 = {}                    # SHOW_NAME_1 -> positions
+        self._by_placement = {}                 # (PLACEMENT_2, column, show) -> positions
+        for position in self._positions:
+            for key, index in self._keys(position):
+                index.setdefault(key, {})[position] = None
+
+    def _keys(self, position):
+        """Yield (key, index) pairs for the buckets a row belongs to. Missing values never match."""
+        show_1, show_2, placement = self.show_1[position], self.show_2[position], self.placement[position]
+        if show_1 is not None:
+            yield show_1, self._by_show_1
+            yield (placement, 'SHOW_NAME_1', show_1), self._by_placement
+        if show_2 is not None:
+            yield (placement, 'SHOW_NAME_2', show_2), self._by_placement
+
+    def __len__(self):
+        return len(self._positions)
+
+    def with_show_1(self, placement, show):
+        return self._by_placement.get((placement, 'SHOW_NAME_1', show), {}).keys()
+
+    def with_show_2(self, placement, show):
+        return self._by_placement.get((placement, 'SHOW_NAME_2', show), {}).keys()
+
+    def has_show_1(self, show):
+        return bool(self._by_show_1.get(show))
+
+    def exit_show(self, position):
+        """The show a bump leads into."""
+        return self.show_3[position] if self.placement[position] == 'next' else self.show_1[position]
+
+    def random_position(self, rng):
+        return self._positions[rng.integers(len(self._positions))]
+
+    def remove(self, position):
+        """Mark a row as used."""
+        # Swap the last position into the freed slot
+        slot = self._slots[position]
+        last = self._positions.pop()
+        if last != position:
+            self._positions[slot] = last
+            self._slots[last] = slot
+        for key, index in self._keys(position):
+            bucket = index[key]
+            del bucket[position]
+            if not bucket:
+                del index[key]
+
+
 class Multilineup:
-    def __init__(self):
+    SOLVERS = ('greedy', 'graph')
+
+    def __init__(self, solver=None, seed=None):
+        """
+        :param solver: 'greedy' picks each next bump from the current show, weighting
+                       away from recent shows; 'graph' orders the whole table with
+                       BumpChainSolver. Defaults to config.MULTILINEUP_SOLVER.
+        :param seed: Seed for the greedy solver's weighted picks and the graph
+                     solver's tie-breaks. Defaults to config.MULTILINEUP_SEED; None
+                     gives a different order each run.
+        """
         self.db_manager = get_db_manager()
         self.error_manager = get_error_manager()
         self.next_show_name = None
-        self.used_rows = set()
-        self.recent_shows = []
+        self.recent_shows = RecentShows(5)
+        self._show_ids = {}
+        self.solver = solver or getattr(config, 'MULTILINEUP_SOLVER', 'greedy')
+        if self.solver not in self.SOLVERS:
+            raise ValueError(f"Unknown multibump solver '{self.solver}', expected one of {self.SOLVERS}")
+        self.seed = seed if seed is not None else getattr(config, 'MULTILINEUP_SEED', None)
+        self.rng = np.random.default_rng(self.seed)
+        # Table name -> chain breaks in its saved ordering
+        self.chain_breaks = {}
         
-    def weighted_selection(self, df):
-        weights = []
-        for _, row in df.iterrows():
-            if row["SHOW_NAME_1"] in self.recent_shows or row["SHOW_NAME_2"] in self.recent_shows:
-                weights.append(0.5)  # Lower weight if show is in recent_shows
-            else:
-                weights.append(1)
-
-        # Normalize weights
-        total_weight = sum(weights)
-        normalized_weights = [w / total_weight for w in weights]
+    def show_id(self, show):
+        """Integer ID for a show name, stable across tables so recent shows carry over."""
+        if show is None:
+            return NO_SHOW
+        return self._show_ids.setdefault(show, len(self._show_ids))
 
-        return df.sample(n=1, weights=normalized_weights)
+    def weighted_selection(self, unused, candidates):
+        """
+        Pick one of the candidate row positions at random, at half weight when
+        the bump features a show in recent_shows.
+        """
+        candidates = np.fromiter(candidates, dtype=np.int64)
+        recent = self.recent_shows.ids
+        is_recent = np.isin(unused.show_1_ids[candidates], recent) | np.isin(unused.show_2_ids[candidates], recent)
+        weights = np.where(is_recent, 0.5, 1.0)
+        return int(candidates[self.rng.choice(len(candidates), p=weights / weights.sum())])
 
-    def unused_bumps(self, table_name):
+    def load_bumps(self, table_name):
         with self.db_manager.transaction() as conn:
-            df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-
-        unused_df = df.drop(list(self.used_rows), errors='ignore')
-        return unused_df
-    
-    def get_next_row(self, table_name):
-        df = self.unused_bumps(table_name)
-        next_row = None
+            return pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
+
+    def get_next_row(self, unused):
+        """
+        Pick the bump that should follow the current one from the UnusedBumps pool.
+
+        Returns:
+            int: Row position of the chosen bump in the multibumps table
+        """
         last_resort_row = None
         if self.next_show_name:
             # Get all possible next rows
-            possible_next_rows = df[(df['PLACEMENT_2'] == 'next') & (df['SHOW_NAME_1'] == self.next_show_name)]
-            if not possible_next_rows.empty:
-                # Get the count of SHOW_NAME_3 for each possible next row
-                show_name_3_counts = possible_next_rows['SHOW_NAME_3'].value_counts()
-                if not show_name_3_counts.empty:
-                    # Sort SHOW_NAME_3 by count
-                    sorted_show_name_3 = show_name_3_counts.sort_values().index.tolist()
-                    for show_name_3 in sorted_show_name_3:
-                        # Check if there is at least one bump with SHOW_NAME_1 in the remaining bumps
-                        if df[df['SHOW_NAME_1'] == show_name_3].shape[0] > 0:
-                            next_row = possible_next_rows[possible_next_rows['SHOW_NAME_3'] == show_name_3]
-                            if not next_row.empty:
-                                next_row = self.weighted_selection(next_row)
-                                break
-                        elif last_resort_row is None:
-                            # Store the first available bump as a last resort
-                            last_resort_row = pd.DataFrame(possible_next_rows[possible_next_rows['SHOW_NAME_3'] == show_name_3].iloc[0]).transpose()
-            if next_row is None:
-                possible_next_rows = df[(df['PLACEMENT_2'] == 'next from') & (df['SHOW_NAME_2'] == self.next_show_name)]
-                if not possible_next_rows.empty:
-                    next_row = self.weighted_selection(possible_next_rows)
-            if next_row is None:
-                possible_next_rows = df[(df['PLACEMENT_2'] == 'from') & (df['SHOW_NAME_2'] == self.next_show_name)]
-                if not possible_next_rows.empty:
-                    next_row = self.weighted_selection(possible_next_rows)
-        if next_row is None or next_row.empty:
-            if last_resort_row is not None:
-                # Use the last resort row if no better bump was found
-                next_row = last_resort_row
+            possible_next_rows = list(unused.with_show_1('next', self.next_show_name))
+            # Count SHOW_NAME_3 over the possible next rows and go through them from the
+            # rarest, aiming to use up rare continuations first
+            show_name_3_counts = Counter(
+                unused.show_3[position] for position in possible_next_rows if unused.show_3[position] is not None
+            )
+            for show_name_3, _ in sorted(show_name_3_counts.items(), key=lambda item: item[1]):
+                matching_rows = [position for position in possible_next_rows if unused.show_3[position] == show_name_3]
+                # Check if there is at least one bump with SHOW_NAME_1 in the remaining bumps
+                if unused.has_show_1(show_name_3):
+                    return self.weighted_selection(unused, matching_rows)
+                if last_resort_row is None:
+                    # Store the first available bump as a last resort
+                    last_resort_row = matching_rows[0]
+            for placement in ('next from', 'from'):
+                possible_next_rows = unused.with_show_2(placement, self.next_show_name)
+                if possible_next_rows:
+                    return self.weighted_selection(unused, possible_next_rows)
+        if last_resort_row is not None:
+            # Use the last resort row if no better bump was found
+            return last_resort_row
+        return unused.random_position(self.rng)
 
-            else:
-                next_row = self.weighted_selection(df.sample(n=1))
-        index = next_row.index[0]
-        if next_row['PLACEMENT_2'].values[0] == 'next':
-            self.next_show_name = next_row['SHOW_NAME_3'].values[0]
-        else:
-            self.next_show_name = next_row['SHOW_NAME_1'].values[0]
-        self.used_rows.add(index)
-        return next_row, index
+    def use_row(self, unused, position, order):
+        """Append a chosen row to the ordering and move on to the show it leads into."""
+        unused.remove(position)
+        order.append(position)
+        self.next_show_name = unused.exit_show(position)
+        self.recent_shows.add(self.show_id(self.next_show_name))
 
-    def write_to_table(self, next_row, table_name):
+    def write_to_table(self, ordered_df, table_name):
         try:
             with self.db_manager.transaction() as conn:
-                next_row.to_sql(table_name, conn, if_exists='append')
+                # The original row labels are kept in an "index" column, as before
+                write_table(ordered_df.reset_index(), table_name, conn)
         except Exception as e:
             self.error_manager.send_error_level(
                 source="Multilineup",
                 operation="write_to_table",
-                message=f"Failed to save reordered bump to {table_name}",
+                message=f"Failed to save reordered bumps to {table_name}",
                 details=str(e),
-                suggestion="There was an error while trying to save the bump to the database. Please check that the database still exists and is accessible."
+                suggestion="There was an error while trying to save the bumps to the database. Please check that the database still exists and is accessible."
             )
             raise
 
-        if next_row['PLACEMENT_2'].values[0] == 'next':
-            self.next_show_name = next_row['SHOW_NAME_3'].values[0]
-        else:
-            self.next_show_name = next_row['SHOW_NAME_1'].values[0]
-
-        self.recent_shows.append(self.next_show_name)
-        if len(self.recent_shows) > 5:  # Limit the recent shows to last 5
-            self.recent_shows.pop(0)
-
     def find_optimal_first_bump(self, df):
-        show_name_1_counts = df['SHOW_NAME_1'].value_counts()
-        show_name_3_counts = df['SHOW_NAME_3'].value_counts()
-        optimal_first_bump = None
-
-        # Situation 1: SHOW_NAME_1 is no other bump's SHOW_NAME_3 and SHOW_NAME_3 is another bump's SHOW_NAME_1
-        for _, row in df.iterrows():
-            if pd.isna(row['SHOW_NAME_3']):  # Skip rows where SHOW_NAME_3 is None
-                continue
-            if show_name_3_counts.get(row['SHOW_NAME_1'], 0) == 0 and show_name_1_counts.get(row['SHOW_NAME_3'], 0) > 0:
-                optimal_first_bump = df.loc[[row.name]]  # Get a DataFrame containing only this row
-                break
-
-        # Situation 2: SHOW_NAME_1 is one more than bumps with that SHOW_NAME_3 and SHOW_NAME_3 is another bump's SHOW_NAME_1
-        if optimal_first_bump is None:
-            for _, row in df.iterrows():
-                if pd.isna(row['SHOW_NAME_3']):  # Skip rows where SHOW_NAME_3 is None
-                    continue
-                if show_name_3_counts.get(row['SHOW_NAME_1'], 0) + 1 == show_name_1_counts.get(row['SHOW_NAME_1'], 0) and show_name_1_counts.get(row['SHOW_NAME_3'], 0) > 0:
-                    optimal_first_bump = df.loc[[row.name]]  # Get a DataFrame containing only this row
-                    break
-
-        # Situation 3: No such bump as in situation 1 or new situation exists, but a bump where SHOW_NAME_1 is multiple other bump's SHOW_NAME_3
-        if optimal_first_bump is None:
-            for _, row in df.iterrows():
-                if pd.isna(row['SHOW_NAME_3']):  # Skip rows where SHOW_NAME_3 is None
-                    continue
-                if show_name_3_counts.get(row['SHOW_NAME_1'], 0) > 1:
-                    optimal_first_bump = df.loc[[row.name]]  # Get a DataFrame containing only this row
-                    break
+        show_name_1_counts = df['SHOW_NAME_1'].value_counts().to_dict()
+        show_name_3_counts = df['SHOW_NAME_3'].value_counts().to_dict()
+        # Rows with a SHOW_NAME_3, as (label, SHOW_NAME_1, SHOW_NAME_3) in table order
+        rows = [
+            (label, show_1, show_3)
+            for label, show_1, show_3 in zip(df.index, df['SHOW_NAME_1'], df['SHOW_NAME_3'])
+            if not pd.isna(show_3)
+        ]
+        situations = (
+            # Situation 1: SHOW_NAME_1 is no other bump's SHOW_NAME_3 and SHOW_NAME_3 is another bump's SHOW_NAME_1
+            lambda show_1, show_3: show_name_3_counts.get(show_1, 0) == 0 and show_name_1_counts.get(show_3, 0) > 0,
+            # Situation 2: SHOW_NAME_1 is one more than bumps with that SHOW_NAME_3 and SHOW_NAME_3 is another bump's SHOW_NAME_1
+            lambda show_1, show_3: (show_name_3_counts.get(show_1, 0) + 1 == show_name_1_counts.get(show_1, 0)
+                                    and show_name_1_counts.get(show_3, 0) > 0),
+            # Situation 3: a bump where SHOW_NAME_1 is multiple other bump's SHOW_NAME_3
+            lambda show_1, show_3: show_name_3_counts.get(show_1, 0) > 1,
+        )
+        for situation in situations:
+            for label, show_1, show_3 in rows:
+                if situation(show_1, show_3):
+                    return df.loc[[label]]  # Get a DataFrame containing only this row
 
         # If neither situation 1, situation 2 nor situation 3 is met, return the first bump
-        if optimal_first_bump is None:
-            if df.empty:
-                print("Warning: Empty dataframe passed to find_optimal_first_bump")
-                return pd.DataFrame()
-            optimal_first_bump = df.iloc[[0]]
-
-        return optimal_first_bump
+        if df.empty:
+            print("Warning: Empty dataframe passed to find_optimal_first_bump")
+            return pd.DataFrame()
+        return df.iloc[[0]]
 
     def reorder_table(self, table_name):
-        self.used_rows = set()  # Resetting used rows for the new table
+        """
+        Chain the bumps of a multibumps table so each one leads into the next, and
+        save the ordering to <table_name>_reordered.
+
+        The table is read once; picks are made against an UnusedBumps pool (or the
+        whole table is handed to BumpChainSolver) and the ordering is written in a
+        single insert at the end.
+        """
         reordered_table_name = table_name + '_reordered'
-        print(f"Starting reordering for {table_name}")
-        unused_df = self.unused_bumps(table_name)
-        first_bump = self.find_optimal_first_bump(unused_df)
+        print(f"Starting reordering for {table_name} ({self.solver} solver)")
+        df = self.load_bumps(table_name)
+        entries, exits = table_endpoints(df)
+        if self.solver == 'graph':
+            positions = BumpChainSolver(self.seed).solve(entries, exits)
+        else:
+            positions = self._greedy_order(df)
+        breaks = count_chain_breaks(positions, entries, exits)
+        self.chain_breaks[table_name] = breaks
+        self.write_to_table(df.iloc[positions], reordered_table_name)
+        print(f"Finished reordering for {table_name}: {len(positions)} bumps, {breaks} chain breaks")
+
+    def _greedy_order(self, df):
+        """Order the table one pick at a time with get_next_row; returns row positions."""
+        unused = UnusedBumps(df, self.show_id)
+        order = []
+        first_bump = self.find_optimal_first_bump(df)
         if first_bump is not None and not first_bump.empty:
-            self.write_to_table(first_bump, reordered_table_name)
-            self.used_rows.add(first_bump.index[0]) 
-            unused_df = self.unused_bumps(table_name)  # Refresh unused rows
-        while not unused_df.empty:
-            next_row, index = self.get_next_row(table_name)
-            self.write_to_table(next_row, reordered_table_name)
-            unused_df = self.unused_bumps(table_name)  # Refresh unused rows
-        print(f"Finished reordering for {table_name}")
+            self.use_row(unused, df.index.get_loc(first_bump.index[0]), order)
+        while unused:
+            self.use_row(unused, self.get_next_row(unused), order)
+        return order
 
     def reorder_all_tables(self):
         for i in range(10):
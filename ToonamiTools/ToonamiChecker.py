@@ -6,7 +6,7 @@ import requests
 from unidecode import unidecode
 from bs4 import BeautifulSoup
 from .utils import show_name_mapper
-from API.utils import get_db_manager
+from API.utils import get_db_manager, get_library_index
 from API.utils.ErrorManager import get_error_manager
 import socket
 
@@ -235,20 +235,17 @@ class ToonamiChecker:
         print(f"Starting to walk through directory: {folder_path}")
         
         try:
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    if file.endswith(('.mkv', '.mp4', '.avi', '.flv')):
-                        file_count += 1
-                        if matched_title := re.findall(
-                            r'^(.*?)(?: - S\d{1,2}E\d{1,2})', file, re.IGNORECASE
-                        ):
-                            show_title = matched_title[0].strip()
-                            episode = file
-                            rel_path = os.path.relpath(root, folder_path)  # calculate the relative path
-                            if show_title in episode_files:
-                                episode_files[show_title].append(os.path.join(rel_path, episode))
-                            else:
-                                episode_files[show_title] = [os.path.join(rel_path, episode)]
+            # The library index parses the show name from "Show - SxxExx" when it scans a folder
+            for entry in get_library_index().files(folder_path):
+                if entry.filename.endswith(('.mkv', '.mp4', '.avi', '.flv')):
+                    file_count += 1
+                    if entry.show_name is not None:
+                        show_title = entry.show_name
+                        rel_path = os.path.relpath(entry.dir_path, folder_path)  # calculate the relative path
+                        if show_title in episode_files:
+                            episode_files[show_title].append(os.path.join(rel_path, entry.filename))
+                        else:
+                            episode_files[show_title] = [os.path.join(rel_path, entry.filename)]
         except Exception as e:
             self.error_manager.send_error_level(
                 source="ToonamiChecker",
@@ -328,12 +325,6 @@ class ToonamiChecker:
         print(f"Writing episode data to SQLite database: {db_path}")
         db_manager = get_db_manager()
 
-        # Check if table exists
-        result = db_manager.fetchone(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='Toonami_Episodes'"
-        )
-        table_exists = bool(result)
-
         # Apply show name mapping to episode data BEFORE saving
         mapped_episodes = []
         for (show_title, episode), full_path in toonami_episodes.items():
@@ -343,15 +334,7 @@ class ToonamiChecker:
         
         df = pd.DataFrame(mapped_episodes, columns=['Title', 'Episode', 'Full_File_Path'])
 
-        with db_manager.transaction() as conn:
-            if table_exists:
-                existing_df = pd.read_sql('SELECT * FROM Toonami_Episodes', conn)
-                combined_df = pd.concat([existing_df, df], ignore_index=True)
-                duplicates = combined_df.duplicated(subset=['Title', 'Episode', 'Full_File_Path'], keep='last')
-                combined_df = combined_df[~duplicates]
-                combined_df.to_sql('Toonami_Episodes', conn, if_exists='replace', index=False)
-            else:
-                df.to_sql('Toonami_Episodes', conn, if_exists='replace', index=False)
+        db_manager.upsert_dataframe('Toonami_Episodes', df, ['Title', 'Episode', 'Full_File_Path'])
 
         print(f'Successfully wrote rows to {db_path}')
 
@@ -360,12 +343,6 @@ class ToonamiChecker:
         unique_show_names = {k[0] for k in toonami_episodes.keys()}
         db_manager = get_db_manager()
 
-        # Check if table exists
-        result = db_manager.fetchone(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='Toonami_Shows'"
-        )
-        table_exists = bool(result)
-
         # Apply show name mapping BEFORE saving to database
         mapped_show_names = []
         for show_name in unique_show_names:
@@ -375,18 +352,7 @@ class ToonamiChecker:
         
         df = pd.DataFrame(mapped_show_names, columns=['Title'])
 
-        with db_manager.transaction() as conn:
-            if table_exists:
-                existing_df = pd.read_sql('SELECT * FROM Toonami_Shows', conn)
-                combined_df = pd.concat([existing_df, df], ignore_index=True)
-                # Step 4: Identify duplicates based on 'Title'
-                duplicates = combined_df.duplicated(subset=['Title'], keep='last')
-                # Remove entire rows where duplicates are found
-                combined_df = combined_df[~duplicates]
-
-                combined_df.to_sql('Toonami_Shows', conn, if_exists='replace', index=False)
-            else:
-                df.to_sql('Toonami_Shows', conn, if_exists='replace', index=False)
+        db_manager.upsert_dataframe('Toonami_Shows', df, ['Title'])
 
         print(f'Successfully wrote rows to {db_path}')
 
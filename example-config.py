@@ -37,6 +37,60 @@ TIMESTAMP_THRESHOLD = 120
 BATCH_SIZE = 5
 SILENCE_DURATION = 0.3
 DECIBEL_THRESHOLD = -60
+# Number of videos processed at once during black frame detection (1 = one at a time)
+DETECTION_WORKERS = 1
+# Overlap silence scanning with downscaling/analysis instead of pre-scanning every file first
+DETECTION_PIPELINE = False
+# How many scanned/extracted files may wait between pipeline stages
+PIPELINE_QUEUE_SIZE = 2
+# "segments" downscales each silent period to a temporary mp4; "stream" decodes them all in memory with one ffmpeg call
+DECODE_MODE = "segments"
+# Frames scored per vectorized black frame check (1 = check frames one at a time)
+ANALYSIS_BATCH_SIZE = 256
+# How OpenCV skips the frames between samples: "grab" (default), "read" (decode everything) or "seek"
+VIDEO_SAMPLE_MODE = "grab"
+# Decoder threads per OpenCV capture (0 = let OpenCV decide); lower this when DETECTION_WORKERS is high
+DECODER_THREADS = 0
+# "opencv" downscales silent segments and checks frames in Python; "ffmpeg" checks luma inside ffmpeg in one pass
+DETECTION_BACKEND = "opencv"
+# Media probe (ffprobe) cache: in-memory entries, parallel probes, and whether results are kept in the database
+PROBE_CACHE_SIZE = 4096
+PROBE_WORKERS = 8
+PROBE_CACHE_PERSIST = True
+# Videos probed for chapters at the same time (defaults to PROBE_WORKERS)
+CHAPTER_WORKERS = 8
+# Chapter timestamp files written per batch during chapter extraction
+CHAPTER_WRITE_BATCH = 100
+# Keep a snapshot of media folders in the database and only re-list folders that changed
+LIBRARY_INDEX = True
+# Videos cut at the same time (stream-copy cutting is mostly disk-bound), seconds before an FFmpeg cut is killed (0 = no limit), and extra attempts per failed cut
+CUT_JOBS = 1
+CUT_TIMEOUT = 0
+CUT_RETRIES = 0
+# Audio when cutting: "auto" stream-copies AAC/MP3/AC3/EAC3/ALAC sources and re-encodes the rest, "aac" always re-encodes
+CUT_AUDIO_MODE = "auto"
+# Move cut points to the keyframe a stream-copy cut really splits on (keyframe lists are cached in the database)
+KEYFRAME_SNAP = True
+# SQLite tuning: journal mode, sync level, lock wait before "database is locked", retries after that, memory map and page cache sizes, cached statements per connection, read-only connections for UI queries, and when a query counts as slow in get_metrics()
+DB_JOURNAL_MODE = "WAL"
+DB_SYNCHRONOUS = "NORMAL"
+DB_BUSY_TIMEOUT_MS = 5000
+DB_LOCK_RETRIES = 1
+DB_MMAP_SIZE = 268435456
+DB_CACHE_SIZE_KB = 65536
+DB_STATEMENT_CACHE = 256
+DB_READ_POOL_SIZE = 4
+DB_SLOW_QUERY_MS = 250
+# Multibump ordering: "greedy" picks one bump at a time, "graph" chains the whole table with as few breaks as possible; set a seed for repeatable orderings
+MULTILINEUP_SOLVER = "greedy"
+MULTILINEUP_SEED = None
+# Bump filename analysis in LineupPrep: worker processes (1 = serial) and files per chunk handed to a worker
+LINEUP_PREP_WORKERS = 1
+LINEUP_PREP_CHUNK_SIZE = 2000
+# Remember detection results in the database so re-runs (or threshold changes) skip decoding
+DETECTION_CACHE = True
+# Also match cached results by a partial content hash, so moved/renamed files are recognised
+DETECTION_CACHE_HASH = False
 API_KEY = "PUT YOUR OPEN AI KEY HERE"
 
 AUTO_RUN_DEFAULT_CONFIG = {
@@ -1,4 +1,5 @@
 import argparse
+import multiprocessing
 from GUI import TOM, CommercialBreaker, Absolution
 from CLI import clydes, CommercialBreakerCLI
 
@@ -30,4 +31,6 @@ def main():
         CommercialBreakerCLI()
 
 if __name__ == "__main__":
+    # Worker processes of a frozen (PyInstaller) build re-run this executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
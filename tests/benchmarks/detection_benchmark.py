@@ -0,0 +1,190 @@
+"""
+Commercial detection benchmark.
+
+Generates synthetic episodes locally with ffmpeg's lavfi sources (a test pattern with
+a tone, interrupted by known black + silent gaps), then times each detection stage
+against them and reports throughput, memory and accuracy as JSON.
+
+Usage:
+    python -m tests.benchmarks.detection_benchmark
+    python -m tests.benchmarks.detection_benchmark --resolutions 640x360 1920x1080 --durations 600 1440 --output bench.json
+
+Requires ffmpeg on PATH (or at config.ffmpeg_path). Not collected by pytest.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import config
+from ComBreak.SilentBlackFrameDetector import (
+    BlackFrameAnalyzer, FFMpegSilence, SilenceDetector, TimestampReducer, VideoPreprocessor
+)
+from ComBreak.utils import get_executable_path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+    import psutil
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its finished children, in MiB."""
+    if resource is not None:
+        self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return round(max(self_kb, children_kb) / scale, 1)
+    return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+
+
+def gap_times(duration, gap_count, gap_length):
+    """Evenly spaced gap start times, clear of START_BUFFER and TIMESTAMP_THRESHOLD."""
+    usable = duration - config.START_BUFFER
+    spacing = usable / (gap_count + 1)
+    if spacing <= config.TIMESTAMP_THRESHOLD + gap_length:
+        raise ValueError(
+            f"{duration}s is too short for {gap_count} gaps: gaps must be more than "
+            f"TIMESTAMP_THRESHOLD ({config.TIMESTAMP_THRESHOLD}s) apart after START_BUFFER ({config.START_BUFFER}s)"
+        )
+    return [round(config.START_BUFFER + spacing * (i + 1), 3) for i in range(gap_count)]
+
+
+def generate_fixture(path, width, height, duration, fps, gaps, gap_length):
+    """Render a test pattern + tone with black, silent gaps at the given start times."""
+    enable = "+".join(f"between(t,{start},{start + gap_length})" for start in gaps)
+    cmd = [
+        get_executable_path("ffmpeg", config.ffmpeg_path), "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={fps}:duration={duration}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={duration}",
+        "-vf", f"drawbox=x=0:y=0:w=iw:h=ih:color=black:t=fill:enable='{enable}'",
+        "-af", f"volume=volume=0:enable='{enable}'",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", str(path)
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, round(time.perf_counter() - start, 4)
+
+
+def score(detected, gaps, gap_length, tolerance):
+    """Match detected cut points to ground-truth gaps."""
+    matched = set()
+    true_positives = 0
+    for t in detected:
+        for i, start in enumerate(gaps):
+            if i not in matched and start - tolerance <= t <= start + gap_length + tolerance:
+                matched.add(i)
+                true_positives += 1
+                break
+    return {
+        "expected": len(gaps),
+        "detected": len(detected),
+        "true_positives": true_positives,
+        "precision": round(true_positives / len(detected), 4) if detected else 0.0,
+        "recall": round(true_positives / len(gaps), 4) if gaps else 1.0,
+    }
+
+
+def run_case(work_dir, width, height, duration, fps, gap_count, gap_length, tolerance):
+    gaps = gap_times(duration, gap_count, gap_length)
+    video = Path(work_dir) / f"synthetic_{width}x{height}_{duration}s.mp4"
+    _, generate_time = timed(generate_fixture, video, width, height, duration, fps, gaps, gap_length)
+
+    stages = {}
+    silences, stages["silence_detect"] = timed(FFMpegSilence.detect, str(video))
+    silence_periods = SilenceDetector()._merge(silences)
+
+    segment_files, stages["preprocess_segments"] = timed(
+        VideoPreprocessor().preprocess_segments,
+        str(video), work_dir, silence_periods, 0, 1, None, None
+    )
+    (raw_ts, analyzed_frames), stages["analyze_segments"] = timed(
+        BlackFrameAnalyzer().analyze_segments,
+        segment_files, None, lambda count=1: None, 0, 0
+    )
+    final_ts, stages["reduce"] = timed(TimestampReducer.reduce, raw_ts)
+
+    for segment in segment_files:
+        Path(segment["path"]).unlink(missing_ok=True)
+
+    wall_time = round(sum(stages.values()), 4)
+    return {
+        "resolution": f"{width}x{height}",
+        "duration_s": duration,
+        "fps": fps,
+        "ground_truth_gaps": gaps,
+        "fixture_generation_s": generate_time,
+        "stages_s": stages,
+        "wall_time_s": wall_time,
+        "video_frames": duration * fps,
+        "analyzed_frames": analyzed_frames,
+        "analysis_frames_per_s": round(analyzed_frames / stages["analyze_segments"], 1) if stages["analyze_segments"] else None,
+        "source_frames_per_s": round(duration * fps / wall_time, 1) if wall_time else None,
+        "silence_periods": len(silence_periods),
+        "detected_timestamps": final_ts,
+        "accuracy": score(final_ts, gaps, gap_length, tolerance),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def parse_resolution(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the commercial detection pipeline on synthetic videos.")
+    parser.add_argument("--resolutions", nargs="+", default=["640x360", "1280x720"], help="WIDTHxHEIGHT values")
+    parser.add_argument("--durations", nargs="+", type=int, default=[600], help="Video lengths in seconds")
+    parser.add_argument("--fps", type=int, default=24, help="Frame rate of the generated videos")
+    parser.add_argument("--gaps", type=int, default=3, help="Black + silent gaps per video")
+    parser.add_argument("--gap-length", type=float, default=1.0, help="Length of each gap in seconds")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Seconds a detection may miss a gap by")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "FRAME_RATE": config.FRAME_RATE,
+            "DOWNSCALE_HEIGHT": config.DOWNSCALE_HEIGHT,
+            "BLACK_FRAME_THRESHOLD": config.BLACK_FRAME_THRESHOLD,
+            "SILENCE_DURATION": config.SILENCE_DURATION,
+            "DECIBEL_THRESHOLD": config.DECIBEL_THRESHOLD,
+            "ANALYSIS_BATCH_SIZE": getattr(config, "ANALYSIS_BATCH_SIZE", 256),
+            "VIDEO_SAMPLE_MODE": getattr(config, "VIDEO_SAMPLE_MODE", "grab"),
+        },
+        "cases": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="combreak_bench_") as work_dir:
+        for resolution in args.resolutions:
+            width, height = parse_resolution(resolution)
+            for duration in args.durations:
+                print(f"Benchmarking {resolution} {duration}s...", file=sys.stderr)
+                report["cases"].append(run_case(
+                    work_dir, width, height, duration, args.fps, args.gaps, args.gap_length, args.tolerance
+                ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
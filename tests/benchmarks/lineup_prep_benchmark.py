@@ -0,0 +1,182 @@
+"""
+LineupPrep bump name analysis benchmark.
+
+Builds synthetic bump filenames (single bumps, "from" and "later" multi-bumps, generic
+bumps and unrelated clips) over a pool of shows, times MediaProcessor._analyze_media_files
+on them for each LINEUP_PREP_WORKERS value and reports the speed and a fingerprint of
+the analyses as JSON.
+
+Every worker count must give the same fingerprint for the same names; a run where they
+differ exits with status 1. Record a baseline on one commit and pass it with --baseline
+on another to compare timings.
+
+Usage:
+    python -m tests.benchmarks.lineup_prep_benchmark
+    python -m tests.benchmarks.lineup_prep_benchmark --names 20000 --workers 1 2 4 --output after.json
+    python -m tests.benchmarks.lineup_prep_benchmark --baseline before.json
+
+Does not touch Toonami.db; the processor gets a throwaway database. Not collected by pytest.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import config
+
+VERSIONS = ["Toonami 1 0", "Toonami 2 0", "Toonami 3 0"]
+
+
+def build_shows(show_count):
+    return [f"show {i:03d}" for i in range(show_count)]
+
+
+def build_names(name_count, shows, seed):
+    """(base_name, full_path) pairs; about one name in ten references a show not in shows."""
+    rng = random.Random(seed)
+    unknown = [f"missing show {i}" for i in range(max(1, len(shows) // 10))]
+    generic = list(config.generic_bumps)
+    files = []
+    for index in range(name_count):
+        version = rng.choice(VERSIONS)
+        picked = rng.sample(shows + unknown, 3)
+        color = rng.choice(["", "", " " + rng.choice(config.colors)])
+        kind = rng.random()
+        if kind < 0.3:
+            name = f"{version} {picked[0]} {rng.choice(['Back', 'To Ads', 'Generic', 'Intro'])}{color}"
+        elif kind < 0.6:
+            name = f"{version} Next {picked[0]} From {picked[1]}{color}"
+        elif kind < 0.85:
+            name = f"{version} Next {picked[0]} Later {picked[1]} Later {picked[2]}{color}"
+        elif kind < 0.95 and generic:
+            name = f"{version} {rng.choice(generic)}"
+        else:
+            name = f"random clip {index:06d}"
+        base_name = name.replace(" ", "_") + ".mp4"
+        files.append((base_name, f"/bumps/{index:06d}/{base_name}"))
+    return files
+
+
+def fingerprint(analyses):
+    """SHA-256 of the analyses, with missing values normalized to None."""
+    def normalized(value):
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        if isinstance(value, (tuple, list, set, frozenset)):
+            items = [normalized(item) for item in value]
+            return sorted(items, key=str) if isinstance(value, (set, frozenset)) else items
+        return value
+
+    payload = json.dumps([normalized(tuple(analysis)) for analysis in analyses], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def run_case(processor, files, shows, workers, chunk_size):
+    config.LINEUP_PREP_WORKERS = workers
+    config.LINEUP_PREP_CHUNK_SIZE = chunk_size
+
+    start = time.perf_counter()
+    analyses = processor._analyze_media_files(files, shows)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "names": len(files),
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "seconds": round(elapsed, 4),
+        "names_per_second": round(len(files) / elapsed, 1) if elapsed else None,
+        "matched": sum(analysis.row is not None for analysis in analyses),
+        "fingerprint": fingerprint(analyses),
+    }
+
+
+def case_key(case):
+    return (case["names"], case["workers"], case["chunk_size"])
+
+
+def compare(report, baseline):
+    """Attach baseline timings to matching cases; return the cases whose analyses differ."""
+    baseline_cases = {case_key(case): case for case in baseline.get("cases", [])}
+    mismatches = []
+    for case in report["cases"]:
+        before = baseline_cases.get(case_key(case))
+        if before is None:
+            continue
+        case["baseline_seconds"] = before["seconds"]
+        if case["seconds"]:
+            case["speedup"] = round(before["seconds"] / case["seconds"], 2)
+        if before["fingerprint"] != case["fingerprint"]:
+            mismatches.append(case)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark LineupPrep bump name analysis on synthetic filenames.")
+    parser.add_argument("--names", nargs="+", type=int, default=[20000], help="Numbers of bump filenames to analyze")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4], help="LINEUP_PREP_WORKERS values to time")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="LINEUP_PREP_CHUNK_SIZE")
+    parser.add_argument("--shows", type=int, default=60, help="Number of shows in the library")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic filenames")
+    parser.add_argument("--baseline", help="JSON report from an earlier run to compare analyses and timings with")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "cases": [],
+    }
+
+    shows = build_shows(args.shows)
+    with tempfile.TemporaryDirectory(prefix="combreak_lineup_bench_") as work_dir:
+        # MediaProcessor opens the database on construction; keep it away from Toonami.db
+        config.DATABASE_PATH = str(Path(work_dir) / "bench.db")
+        from ToonamiTools.LineupPrep import MediaProcessor
+
+        processor = MediaProcessor(work_dir)
+        for name_count in args.names:
+            files = build_names(name_count, shows, args.seed)
+            for workers in args.workers:
+                print(f"Analyzing {name_count} bump names with {workers} worker(s)...", file=sys.stderr)
+                report["cases"].append(run_case(processor, files, shows, workers, args.chunk_size))
+
+        from API.utils.DatabaseManager import get_db_manager
+        get_db_manager().close_all_connections()
+
+    # Worker count must not change the result
+    inconsistent = sorted({
+        case["names"] for case in report["cases"]
+        if case["fingerprint"] != next(c for c in report["cases"] if c["names"] == case["names"])["fingerprint"]
+    })
+    report["worker_mismatches"] = inconsistent
+
+    mismatches = []
+    if args.baseline:
+        mismatches = compare(report, json.loads(Path(args.baseline).read_text(encoding="utf-8")))
+        report["analysis_mismatches"] = [case_key(case) for case in mismatches]
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    if inconsistent:
+        print(f"Worker counts gave different analyses for {inconsistent} names", file=sys.stderr)
+        sys.exit(1)
+    if mismatches:
+        print(f"{len(mismatches)} case(s) produced different analyses than the baseline", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+ShowScheduler benchmark.
+
+Builds synthetic lineups (NS2 and NS3 bumps over a pool of shows with known episode
+blocks), times ShowScheduler.generate_schedule on them and reports the size, speed and
+a fingerprint of each generated schedule as JSON.
+
+The fingerprint is what makes this a regression check: record a baseline on one commit
+and compare on another. Cases with the same lineup size, mode and seed must produce the
+same schedule.
+
+Usage:
+    python -m tests.benchmarks.scheduler_benchmark
+    python -m tests.benchmarks.scheduler_benchmark --rows 1000 10000 50000 --output after.json
+    python -m tests.benchmarks.scheduler_benchmark --baseline before.json
+
+Does not touch Toonami.db; the scheduler gets a throwaway database. Not collected by pytest.
+"""
+import argparse
+import hashlib
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import config
+
+MODES = {
+    # mode name -> ShowScheduler reuse_episode_blocks
+    "reuse": True,
+    "no-reuse": False,
+}
+
+
+def build_library(show_count, blocks_per_show, parts_per_block):
+    """commercial_injector-style rows: each block is an intro followed by its parts."""
+    rows = []
+    for show_index in range(show_count):
+        show = f"show {show_index:03d}"
+        prefix = show.replace(" ", "_")
+        for block in range(1, blocks_per_show + 1):
+            block_id = f"{prefix}_S01E{block:02d}"
+            for part in range(parts_per_block + 1):
+                name = "intro" if part == 0 else f"part {part}"
+                rows.append({
+                    "FULL_FILE_PATH": f"/anime/{show}/{block_id} - {name}.mp4",
+                    "BLOCK_ID": block_id,
+                    "show_name": show,
+                })
+    return pd.DataFrame(rows)
+
+
+def build_lineup(row_count, show_count, seed):
+    """
+    decoded_df-style rows with a mix of NS2 and NS3 bumps.
+
+    About a third of the NS3 rows continue the show of the NS2 row before them, and
+    NS3 rows often start with the last show of the previous NS3, so the chain and
+    hand-off branches of the scheduler are exercised.
+    """
+    rng = random.Random(seed)
+    shows = [f"show {i:03d}" for i in range(show_count)]
+    rows = []
+    previous = None
+    for index in range(row_count):
+        kind = "NS3" if rng.random() < 0.5 else "NS2"
+        picked = rng.sample(shows, 3 if kind == "NS3" else 2)
+        if kind == "NS3" and previous is not None and rng.random() < 0.35:
+            # Continue the previous row's first (NS2) or last (NS3) show
+            anchor = previous["shows"][0] if "-NS2" in previous["Code"] else previous["shows"][-1]
+            picked = [anchor] + [show for show in picked if show != anchor][:2]
+        codes = "-".join(f"S{position}:{shows.index(show)}" for position, show in enumerate(picked, 1))
+        row = {
+            "FULL_FILE_PATH": f"/bumps/bump {index:06d}.mp4",
+            "Code": f"Toonami-{codes}-{kind}",
+            "shows": picked,
+        }
+        rows.append(row)
+        previous = row
+    return pd.DataFrame(rows)
+
+
+def fingerprint(schedule_df):
+    """SHA-256 of the schedule's columns and rows, with missing values normalized to None."""
+    values = [
+        [None if isinstance(value, float) and math.isnan(value) else value for value in row]
+        for row in schedule_df.astype(object).values.tolist()
+    ]
+    payload = json.dumps([list(schedule_df.columns), values], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def run_case(scheduler_cls, row_count, mode, seed, show_count, blocks_per_show, parts_per_block):
+    library = build_library(show_count, blocks_per_show, parts_per_block)
+    lineup = build_lineup(row_count, show_count, seed)
+
+    scheduler = scheduler_cls(reuse_episode_blocks=MODES[mode], apply_ns3_logic=True)
+    scheduler.last_used_episode_block = {}
+    scheduler.commercial_injector_df = library
+    scheduler.decoded_df = lineup
+    scheduler.index_episode_blocks()
+
+    start = time.perf_counter()
+    schedule = scheduler.generate_schedule()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "lineup_rows": row_count,
+        "mode": mode,
+        "seed": seed,
+        "shows": show_count,
+        "blocks_per_show": blocks_per_show,
+        "schedule_rows": len(schedule),
+        "seconds": round(elapsed, 4),
+        "lineup_rows_per_second": round(row_count / elapsed, 1) if elapsed else None,
+        "fingerprint": fingerprint(schedule),
+    }
+
+
+def case_key(case):
+    return (case["lineup_rows"], case["mode"], case["seed"], case["shows"], case["blocks_per_show"])
+
+
+def compare(report, baseline):
+    """Attach baseline timings to matching cases; return the cases whose schedules differ."""
+    baseline_cases = {case_key(case): case for case in baseline.get("cases", [])}
+    mismatches = []
+    for case in report["cases"]:
+        before = baseline_cases.get(case_key(case))
+        if before is None:
+            continue
+        case["baseline_seconds"] = before["seconds"]
+        if case["seconds"]:
+            case["speedup"] = round(before["seconds"] / case["seconds"], 2)
+        if before["fingerprint"] != case["fingerprint"]:
+            mismatches.append(case)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ShowScheduler.generate_schedule on synthetic lineups.")
+    parser.add_argument("--rows", nargs="+", type=int, default=[1000, 10000], help="Lineup lengths to schedule")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=sorted(MODES), help="Block reuse modes")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic lineups")
+    parser.add_argument("--shows", type=int, default=40, help="Number of shows in the library")
+    parser.add_argument("--blocks-per-show", type=int, default=26, help="Episode blocks per show")
+    parser.add_argument("--parts-per-block", type=int, default=3, help="Parts per episode block, besides the intro")
+    parser.add_argument("--baseline", help="JSON report from an earlier run to compare schedules and timings with")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "cases": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="combreak_sched_bench_") as work_dir:
+        # ShowScheduler opens the database on construction; keep it away from Toonami.db
+        config.DATABASE_PATH = str(Path(work_dir) / "bench.db")
+        from ToonamiTools.Merger import ShowScheduler
+
+        for row_count in args.rows:
+            for mode in args.modes:
+                print(f"Scheduling {row_count} lineup rows ({mode})...", file=sys.stderr)
+                report["cases"].append(run_case(
+                    ShowScheduler, row_count, mode, args.seed,
+                    args.shows, args.blocks_per_show, args.parts_per_block
+                ))
+
+        from API.utils.DatabaseManager import get_db_manager
+        get_db_manager().close_all_connections()
+
+    mismatches = []
+    if args.baseline:
+        mismatches = compare(report, json.loads(Path(args.baseline).read_text(encoding="utf-8")))
+        report["schedule_mismatches"] = [case_key(case) for case in mismatches]
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    if mismatches:
+        print(f"{len(mismatches)} case(s) produced a different schedule than the baseline", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -125,3 +125,16 @@ def fixture_dirs(tmp_path_factory):
     print(f"{'='*60}")
 
     return anime_dir, bumps_dir, working_dir
+
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    """A DatabaseManager on a throwaway database; the shared instance is restored afterwards."""
+    import config
+    from API.utils.DatabaseManager import DatabaseManager
+
+    monkeypatch.setattr(config, "DATABASE_PATH", str(tmp_path / "test.db"), raising=False)
+    monkeypatch.setattr(DatabaseManager, "_instance", None)
+    manager = DatabaseManager()
+    yield manager
+    manager.close_all_connections()
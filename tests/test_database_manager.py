@@ -0,0 +1,53 @@
+import logging
+
+
+def table_rows(db_manager, table_name):
+    return [tuple(row) for row in db_manager.fetchall(f"SELECT * FROM {table_name} ORDER BY k")]
+
+
+class TestUpsertMany:
+    def test_creates_table_and_inserts(self, db_manager):
+        written = db_manager.upsert_many("bumps", ["k", "v"], [("a", 1), ("b", 2)], ["k"])
+        assert written == 2
+        assert table_rows(db_manager, "bumps") == [("a", 1), ("b", 2)]
+
+    def test_conflicting_key_updates_the_existing_row(self, db_manager):
+        db_manager.upsert_many("bumps", ["k", "v"], [("a", 1), ("b", 2)], ["k"])
+        db_manager.upsert_many("bumps", ["k", "v"], [("a", 10), ("c", 3)], ["k"])
+        assert table_rows(db_manager, "bumps") == [("a", 10), ("b", 2), ("c", 3)]
+
+    def test_key_only_rows_are_not_duplicated(self, db_manager):
+        db_manager.upsert_many("bumps", ["k"], [("a",), ("b",)], ["k"])
+        db_manager.upsert_many("bumps", ["k"], [("a",)], ["k"])
+        assert table_rows(db_manager, "bumps") == [("a",), ("b",)]
+
+    def test_missing_columns_are_added(self, db_manager):
+        db_manager.upsert_many("bumps", ["k"], [("a",)], ["k"])
+        db_manager.upsert_many("bumps", ["k", "v"], [("a", 5)], ["k"], {"v": "INTEGER"})
+        assert table_rows(db_manager, "bumps") == [("a", 5)]
+
+    def test_existing_duplicates_keep_newest_row_and_are_logged(self, db_manager, caplog):
+        # A table written before upserts existed, with a repeated key and no unique index
+        db_manager.execute("CREATE TABLE legacy (k TEXT, v INTEGER)")
+        for row in [("a", 1), ("b", 2), ("a", 3)]:
+            db_manager.execute("INSERT INTO legacy (k, v) VALUES (?, ?)", row)
+
+        with caplog.at_level(logging.WARNING, logger="API.utils.DatabaseManager"):
+            db_manager.upsert_many("legacy", ["k", "v"], [("c", 4)], ["k"])
+        assert table_rows(db_manager, "legacy") == [("a", 3), ("b", 2), ("c", 4)]
+        assert "Removed 1 duplicate row(s) from legacy" in caplog.text
+
+        # The index now exists, so later upserts don't clean up or log again
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger="API.utils.DatabaseManager"):
+            db_manager.upsert_many("legacy", ["k", "v"], [("a", 7)], ["k"])
+        assert table_rows(db_manager, "legacy") == [("a", 7), ("b", 2), ("c", 4)]
+        assert "duplicate" not in caplog.text
+
+    def test_table_without_duplicates_is_not_logged(self, db_manager, caplog):
+        db_manager.execute("CREATE TABLE legacy (k TEXT, v INTEGER)")
+        db_manager.execute("INSERT INTO legacy (k, v) VALUES (?, ?)", ("a", 1))
+        with caplog.at_level(logging.WARNING, logger="API.utils.DatabaseManager"):
+            db_manager.upsert_many("legacy", ["k", "v"], [("b", 2)], ["k"])
+        assert table_rows(db_manager, "legacy") == [("a", 1), ("b", 2)]
+        assert "duplicate" not in caplog.text
@@ -0,0 +1,81 @@
+import subprocess
+
+import pytest
+
+import config
+from ComBreak.MediaProbe import get_media_probe
+from ComBreak.SilentBlackFrameDetector import (
+    BlackFrameAnalyzer, FFMpegFilterDetector, FFMpegSilence, SilenceDetector, TimestampReducer, VideoPreprocessor
+)
+from ComBreak.utils import get_executable_path
+from tests.benchmarks.detection_benchmark import gap_times, generate_fixture
+
+FPS = 24
+DURATION = 30
+GAP_LENGTH = 2
+
+
+def require_ffmpeg():
+    """Path to ffmpeg, skipping the test when ffmpeg or ffprobe is missing."""
+    try:
+        get_executable_path("ffprobe", config.ffprobe_path)
+        return get_executable_path("ffmpeg", config.ffmpeg_path)
+    except FileNotFoundError:
+        pytest.skip("ffmpeg and ffprobe are required")
+
+
+@pytest.fixture
+def black_silent_clip(tmp_path, monkeypatch):
+    """A short test pattern + tone with three 2 s black, silent gaps; returns (path, gap starts)."""
+    require_ffmpeg()
+
+    # Small buffers so three gaps fit in a 30 s clip
+    monkeypatch.setattr(config, "START_BUFFER", 2)
+    monkeypatch.setattr(config, "TIMESTAMP_THRESHOLD", 4)
+    # Keep probes of the throwaway clip out of the database
+    monkeypatch.setattr(get_media_probe(), "persist", False)
+
+    gaps = gap_times(DURATION, 3, GAP_LENGTH)
+    video = tmp_path / "gaps.mp4"
+    generate_fixture(video, 320, 180, DURATION, FPS, gaps, GAP_LENGTH)
+    return video, gaps
+
+
+def opencv_timestamps(video, work_dir):
+    silence_periods = SilenceDetector()._merge(FFMpegSilence.detect(str(video)))
+    segment_files = VideoPreprocessor().preprocess_segments(str(video), str(work_dir), silence_periods, 0, 1, None, None)
+    raw_ts, _ = BlackFrameAnalyzer().analyze_segments(segment_files, None, lambda count=1: None, 0, 0)
+    return TimestampReducer.reduce(raw_ts)
+
+
+def test_filter_backend_matches_opencv_backend(black_silent_clip, tmp_path):
+    video, gaps = black_silent_clip
+
+    expected = opencv_timestamps(video, tmp_path)
+    silence_periods, raw_ts, sampled_frames = FFMpegFilterDetector().detect(str(video))
+    detected = TimestampReducer.reduce(raw_ts)
+
+    assert len(silence_periods) == len(gaps)
+    assert len(expected) == len(detected) == len(gaps)
+    # Both sample every FRAME_RATE-th frame, the OpenCV path from each segment's start and
+    # the filter from the start of the file, so they can land one sample interval apart
+    sample_interval = config.FRAME_RATE / FPS
+    for opencv_t, filter_t, gap in zip(expected, detected, gaps):
+        assert gap - 1 / FPS <= filter_t <= gap + GAP_LENGTH
+        assert abs(opencv_t - filter_t) <= sample_interval + 1 / FPS
+
+    assert sampled_frames == DURATION * FPS // config.FRAME_RATE
+
+
+def test_filter_backend_skips_video_without_audio(tmp_path, monkeypatch):
+    ffmpeg = require_ffmpeg()
+    monkeypatch.setattr(get_media_probe(), "persist", False)
+
+    video = tmp_path / "video_only.mp4"
+    subprocess.run([
+        ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"color=black:size=160x90:rate={FPS}:duration=3",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", str(video)
+    ], check=True)
+
+    assert FFMpegFilterDetector().detect(str(video)) == ([], [], 0)
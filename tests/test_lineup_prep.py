@@ -0,0 +1,85 @@
+import pytest
+
+import config
+from ToonamiTools.LineupPrep import MediaProcessor
+
+
+@pytest.fixture
+def processor():
+    return MediaProcessor("bumps")
+
+
+def full_pattern_groups(processor, bump, shows):
+    """Groups from the full show alternation alone, as matched before the structure-first fast path."""
+    transformed_bump, count, _ = processor._match_structure(bump)
+    match = processor._compiled_regex(count, shows).match(transformed_bump)
+    return match.groupdict() if match else None
+
+
+def lowered(groups, *names):
+    return tuple(groups[name].lower() if groups[name] else groups[name] for name in names)
+
+
+class TestExtractDataFromPattern:
+    def test_trailing_ad_version_follows_show_order(self, processor):
+        # "bleach" is listed first, so the full pattern stops there and reads "2" as the ad version
+        shows = ["bleach", "bleach 2", "naruto"]
+        groups = processor._extract_data_from_pattern("Toonami 2 0 Naruto From Bleach 2", shows)
+        assert lowered(groups, "SHOW_NAME_1", "SHOW_NAME_2", "AD_VERSION") == ("naruto", "bleach", "2")
+
+    def test_trailing_show_number_kept_when_listed_first(self, processor):
+        shows = ["bleach 2", "bleach", "naruto"]
+        groups = processor._extract_data_from_pattern("Toonami 2 0 Naruto From Bleach 2", shows)
+        assert lowered(groups, "SHOW_NAME_2", "AD_VERSION") == ("bleach 2", None)
+
+    def test_trailing_color_follows_show_order(self, processor):
+        shows = ["zeta force", "zeta force red", "naruto"]
+        groups = processor._extract_data_from_pattern("Toonami 2 0 Naruto From Zeta Force Red", shows)
+        assert lowered(groups, "SHOW_NAME_2", "COLOR") == ("zeta force", "red")
+
+    def test_keyword_inside_show_name_follows_show_order(self, processor):
+        shows = ["star", "star next", "zeta force"]
+        groups = processor._extract_data_from_pattern("Toonami 2 0 Star Next From Zeta Force", shows)
+        assert groups == full_pattern_groups(processor, "Toonami 2 0 Star Next From Zeta Force", shows)
+        assert lowered(groups, "SHOW_NAME_1", "PLACEMENT_2") == ("star", "next from")
+
+    @pytest.mark.parametrize("bump", [
+        "Toonami 2 0 Naruto From Bleach",
+        "Toonami 2 0 Naruto From Bleach 2",
+        "Toonami 2 0 Naruto From Bleach 2 Red",
+        "Toonami 3 0 Bleach 2 Back 3",
+        "Toonami 2 0 Naruto Next Bleach 2 Later Zeta Force Red",
+        "Toonami 2 0 Zeta Force Red Next Bleach Later Naruto 12 Blue",
+        "Toonami 2 0 Star Next From Bleach 2",
+        "Toonami Star Next Zeta Force",
+    ])
+    @pytest.mark.parametrize("shows", [
+        ["bleach", "bleach 2", "naruto", "zeta force", "zeta force red", "star", "star next"],
+        ["bleach 2", "bleach", "zeta force red", "zeta force", "star next", "star", "naruto"],
+    ])
+    def test_matches_full_pattern(self, processor, bump, shows):
+        assert processor._extract_data_from_pattern(bump, shows) == full_pattern_groups(processor, bump, shows)
+
+
+class TestAnalyzeMediaFiles:
+    SHOWS = ["bleach", "naruto", "one piece", "zeta force"]
+    NAMES = [
+        "Toonami_2_0_Naruto_Back.mp4",
+        "Toonami_2_0_Next_Naruto_From_Bleach_Red.mp4",
+        "Toonami_3_0_Next_Bleach_Later_One_Piece_Later_Zeta_Force.mp4",
+        "Toonami_2_0_Next_Trigun_From_Bleach.mp4",
+        "random_clip.mp4",
+    ]
+
+    def analyses(self, processor, monkeypatch, workers, chunk_size):
+        monkeypatch.setattr(config, "LINEUP_PREP_WORKERS", workers, raising=False)
+        monkeypatch.setattr(config, "LINEUP_PREP_CHUNK_SIZE", chunk_size, raising=False)
+        media_files = [(name, f"/bumps/{i}/{name}") for i, name in enumerate(self.NAMES * 3)]
+        return processor._analyze_media_files(media_files, self.SHOWS)
+
+    def test_worker_processes_match_serial(self, processor, monkeypatch):
+        serial = self.analyses(processor, monkeypatch, 1, 2000)
+        pooled = self.analyses(processor, monkeypatch, 2, 4)
+        # NaN placeholders in the rows compare unequal, so compare their text
+        assert repr(pooled) == repr(serial)
+        assert [analysis.base_name for analysis in pooled] == self.NAMES * 3
@@ -0,0 +1,232 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+from ToonamiTools.MultiLineup import NO_SHOW, BumpChainSolver, Multilineup, UnusedBumps, count_chain_breaks
+
+COLUMNS = ['PLACEMENT_2', 'SHOW_NAME_1', 'SHOW_NAME_2', 'SHOW_NAME_3', 'Code']
+
+
+def minimum_chains(entries, exits):
+    """Fewest trails covering every edge: per weakly connected component, the positive degree surplus or 1."""
+    parent = {}
+
+    def find(node):
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    balance = {}
+    for entry, exit_ in zip(entries, exits):
+        for node in (entry, exit_):
+            parent.setdefault(node, node)
+        parent[find(entry)] = find(exit_)
+        balance[entry] = balance.get(entry, 0) + 1
+        balance[exit_] = balance.get(exit_, 0) - 1
+
+    surplus = {}
+    for node, degree in balance.items():
+        surplus.setdefault(find(node), 0)
+        surplus[find(node)] += max(degree, 0)
+    return sum(value or 1 for value in surplus.values())
+
+
+class TestBumpChainSolver:
+    """Orderings must use every bump exactly once and break the chain as rarely as possible."""
+
+    def solve(self, entries, exits, seed=7):
+        order = BumpChainSolver(seed).solve(entries, exits)
+        assert sorted(order) == list(range(len(entries))), "every bump must be emitted exactly once"
+        return order
+
+    def test_chainable_set_forms_one_chain(self):
+        # naruto -> bleach -> one piece -> naruto -> bleach -> soul eater
+        entries = ['naruto', 'bleach', 'one piece', 'naruto', 'bleach']
+        exits = ['bleach', 'one piece', 'naruto', 'bleach', 'soul eater']
+        order = self.solve(entries, exits)
+        assert count_chain_breaks(order, entries, exits) == 0
+
+    def test_balanced_cycle_forms_one_chain(self):
+        entries = ['naruto', 'bleach', 'one piece']
+        exits = ['bleach', 'one piece', 'naruto']
+        order = self.solve(entries, exits)
+        assert count_chain_breaks(order, entries, exits) == 0
+
+    def test_disconnected_components_use_the_virtual_node(self):
+        # Two separate show graphs, one balanced and one a path; neither can lead into the other
+        entries = ['naruto', 'bleach', 'cowboy bebop', 'trigun']
+        exits = ['bleach', 'naruto', 'trigun', 'outlaw star']
+        order = self.solve(entries, exits)
+        assert count_chain_breaks(order, entries, exits) == 1
+
+    def test_unbalanced_show_splits_into_minimum_chains(self):
+        # naruto leads out three times but is entered once, so two chains are needed
+        entries = ['naruto', 'naruto', 'naruto', 'bleach']
+        exits = ['bleach', 'one piece', 'soul eater', 'naruto']
+        order = self.solve(entries, exits)
+        assert count_chain_breaks(order, entries, exits) == minimum_chains(entries, exits) - 1 == 1
+
+    def test_unchainable_bumps_are_kept(self):
+        entries = ['naruto', None, 'bleach', 'one piece']
+        exits = ['bleach', 'naruto', None, 'naruto']
+        order = self.solve(entries, exits)
+        assert len(order) == 4
+
+    def test_empty_table(self):
+        assert BumpChainSolver(1).solve([], []) == []
+
+    def test_same_seed_gives_same_order(self):
+        rng = random.Random(3)
+        shows = [f"show {i}" for i in range(8)]
+        entries = [rng.choice(shows) for _ in range(60)]
+        exits = [rng.choice(shows) for _ in range(60)]
+        assert BumpChainSolver(11).solve(entries, exits) == BumpChainSolver(11).solve(entries, exits)
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_random_tables_are_optimal(self, seed):
+        rng = random.Random(seed)
+        shows = [f"show {i}" for i in range(rng.randint(2, 12))]
+        count = rng.randint(1, 80)
+        entries = [rng.choice(shows) for _ in range(count)]
+        exits = [rng.choice(shows) for _ in range(count)]
+        order = self.solve(entries, exits, seed)
+        assert count_chain_breaks(order, entries, exits) == minimum_chains(entries, exits) - 1
+
+
+def bumps_table(rows):
+    """A multibumps table from (PLACEMENT_2, SHOW_NAME_1, SHOW_NAME_2, SHOW_NAME_3) tuples."""
+    return pd.DataFrame(
+        [(*row, f"code {i}") for i, row in enumerate(rows)],
+        columns=COLUMNS
+    )
+
+
+def save_table(db_manager, table_name, df):
+    with db_manager.transaction() as conn:
+        df.to_sql(table_name, conn, index=False, if_exists='replace')
+
+
+def reordered(db_manager, table_name, rows, **kwargs):
+    """Reorder a table built from rows with the greedy solver; returns (saved DataFrame, Multilineup)."""
+    save_table(db_manager, table_name, bumps_table(rows))
+    lineup = Multilineup(solver='greedy', **kwargs)
+    lineup.reorder_table(table_name)
+    with db_manager.transaction() as conn:
+        saved = pd.read_sql_query(f"SELECT * FROM {table_name}_reordered", conn)
+    return saved, lineup
+
+
+class TestGreedyReorder:
+    def test_every_row_written_once_with_index(self, db_manager):
+        rng = random.Random(5)
+        shows = [f"show {i}" for i in range(6)]
+        rows = []
+        for _ in range(40):
+            placement = rng.choice(['next', 'next from', 'from'])
+            show_1, show_2, show_3 = rng.sample(shows, 3)
+            rows.append((placement, show_1, show_2 if placement != 'next' else None, show_3 if placement == 'next' else None))
+        original = bumps_table(rows)
+
+        saved, _ = reordered(db_manager, "multibumps_v1_data", rows, seed=9)
+
+        assert list(saved.columns) == ['index'] + COLUMNS
+        assert sorted(saved['index']) == list(range(len(rows)))
+        # Each saved row is the original row its index points at
+        for _, row in saved.iterrows():
+            expected = original.iloc[row['index']]
+            assert row['Code'] == expected['Code']
+            assert row['SHOW_NAME_1'] == expected['SHOW_NAME_1']
+
+    def test_next_bumps_chain_through_show_name_3(self, db_manager):
+        rows = [
+            ('next', 'naruto', None, 'bleach'),
+            ('next', 'bleach', None, 'one piece'),
+            ('next', 'one piece', None, 'soul eater'),
+        ]
+        saved, lineup = reordered(db_manager, "multibumps_v1_data", rows, seed=1)
+        assert list(saved['index']) == [0, 1, 2]
+        assert lineup.chain_breaks["multibumps_v1_data"] == 0
+
+    def test_from_bumps_chain_through_show_name_2(self, db_manager):
+        rows = [
+            ('next', 'naruto', None, 'bleach'),
+            ('from', 'soul eater', 'one piece', None),
+            ('next from', 'one piece', 'bleach', None),
+        ]
+        saved, lineup = reordered(db_manager, "multibumps_v1_data", rows, seed=1)
+        # naruto -> bleach, then 'next from' bleach -> one piece, then 'from' one piece -> soul eater
+        assert list(saved['index']) == [0, 2, 1]
+        assert lineup.chain_breaks["multibumps_v1_data"] == 0
+
+    def test_last_resort_then_random_fallback(self, db_manager):
+        rows = [
+            ('next', 'naruto', None, 'bleach'),
+            # Leads into a show no remaining bump starts with, so it is only a last resort
+            ('next', 'bleach', None, 'trigun'),
+            # Nothing leads into this one; it is reached by the random fallback
+            ('from', 'cowboy bebop', 'outlaw star', None),
+        ]
+        saved, lineup = reordered(db_manager, "multibumps_v1_data", rows, seed=1)
+        assert list(saved['index']) == [0, 1, 2]
+        assert lineup.chain_breaks["multibumps_v1_data"] == 1
+
+    def test_fixed_seed_gives_same_order(self, db_manager, monkeypatch):
+        monkeypatch.setattr(config, 'MULTILINEUP_SEED', 1234, raising=False)
+        rng = random.Random(2)
+        shows = [f"show {i}" for i in range(5)]
+        rows = [('next', rng.choice(shows), None, rng.choice(shows)) for _ in range(30)]
+        rows += [('from', *rng.sample(shows, 2), None) for _ in range(30)]
+
+        first, _ = reordered(db_manager, "multibumps_v1_data", rows)
+        second, _ = reordered(db_manager, "multibumps_v2_data", rows)
+        assert list(first['index']) == list(second['index'])
+
+
+class CapturingRng:
+    """Stands in for the Generator in weighted_selection and records the weights it was given."""
+
+    def choice(self, count, p):
+        self.weights = list(p)
+        return 0
+
+
+class TestWeightedSelection:
+    @pytest.fixture
+    def lineup(self, db_manager):
+        lineup = Multilineup(solver='greedy', seed=0)
+        lineup.rng = CapturingRng()
+        return lineup
+
+    @pytest.fixture
+    def unused(self, lineup):
+        return UnusedBumps(bumps_table([
+            ('from', 'naruto', None, None),
+            ('from', 'bleach', 'one piece', None),
+            ('from', 'trigun', 'soul eater', None),
+        ]), lineup.show_id)
+
+    def picked_weights(self, lineup, unused):
+        """Relative weights weighted_selection gave rows 0, 1 and 2, scaled so an unpenalized row is 1."""
+        lineup.weighted_selection(unused, [0, 1, 2])
+        return np.asarray(lineup.rng.weights) / max(lineup.rng.weights)
+
+    def test_no_recent_shows_weighs_equally(self, lineup, unused):
+        assert np.allclose(self.picked_weights(lineup, unused), [1, 1, 1])
+
+    def test_recent_show_halves_weight(self, lineup, unused):
+        lineup.recent_shows.add(lineup.show_id('one piece'))
+        assert np.allclose(self.picked_weights(lineup, unused), [1, 0.5, 1])
+
+    def test_no_show_matches_rows_missing_a_show(self, lineup, unused):
+        lineup.recent_shows.add(NO_SHOW)
+        assert np.allclose(self.picked_weights(lineup, unused), [0.5, 1, 1])
+
+    def test_no_show_takes_a_slot_in_the_window(self, lineup, unused):
+        lineup.recent_shows.add(lineup.show_id('one piece'))
+        for _ in range(5):
+            lineup.recent_shows.add(NO_SHOW)
+        # 'one piece' has been pushed out of the five-show window
+        assert np.allclose(self.picked_weights(lineup, unused), [0.5, 1, 1])